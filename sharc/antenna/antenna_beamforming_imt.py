@@ -106,9 +106,9 @@ class AntennaBeamformingImt(Antenna):
             theta_etilt (float): elevation electrical tilt angle [degrees]
         """
         phi, theta = self.to_local_coord(phi_etilt, theta_etilt)
-        self.beams_list.append(
-            (np.ndarray.item(phi), np.ndarray.item(theta - 90)),
-        )
+        phi = np.ndarray.item(phi)
+        theta = np.ndarray.item(theta)
+        self.beams_list.append((phi, theta - 90))
         self.w_vec_list.append(self._weight_vector(phi, theta - 90))
 
         if self.normalize:
@@ -167,45 +167,39 @@ class AntennaBeamformingImt(Antenna):
                 )
                 sys.exit(1)
 
-        correction_factor_idx = None
+        lo_phi_vec, lo_theta_vec = self.to_local_coord(phi_vec, theta_vec)
+
+        n_direct = len(lo_theta_vec)
+
         if "beams_l" in kwargs.keys():
-            beams_l = np.asarray(kwargs["beams_l"], dtype=int)
-            correction_factor = self.co_correction_factor_list
-            correction_factor_idx = beams_l
+            beams_l = np.ravel(np.asarray(kwargs["beams_l"], dtype=int))
+            if beams_l.size == 1:
+                beams_l = np.repeat(beams_l, n_direct)
+            else:
+                beams_l = beams_l[:n_direct]
+            if co_channel:
+                correction_factor = np.asarray(
+                    self.co_correction_factor_list,
+                )[beams_l]
         else:
-            beams_l = -1 * np.ones_like(phi_vec)
+            beams_l = -1 * np.ones_like(lo_phi_vec, dtype=int)
             if co_channel:
                 if self.normalize:
-                    lin_f = phi_vec / self.resolution
-                    col_f = theta_vec / self.resolution
+                    lin_f = np.ravel(phi_vec) / self.resolution
+                    col_f = np.ravel(theta_vec) / self.resolution
                     lin = lin_f.astype(int)
                     col = col_f.astype(int)
                     correction_factor = self.co_correction_factor[lin, col]
                 else:
-                    correction_factor = np.zeros_like(phi_vec)
-                correction_factor_idx = [
-                    i for i in range(len(correction_factor))
-                ]
-
-        lo_phi_vec, lo_theta_vec = self.to_local_coord(phi_vec, theta_vec)
-
-        n_direct = len(lo_theta_vec)
-
-        gains = np.zeros(n_direct)
+                    correction_factor = np.zeros_like(lo_phi_vec)
 
         if co_channel:
-            for g in range(n_direct):
-                gains[g] = self._beam_gain(
-                    lo_phi_vec[g], lo_theta_vec[g],
-                    beams_l[g], station_type=station_type)\
-                    + correction_factor[correction_factor_idx[g]]
+            gains = self._beam_gains(
+                lo_phi_vec, lo_theta_vec, beams_l, station_type=station_type,
+            ) + correction_factor
         else:
-            for g in range(n_direct):
-                gains[g] = self.element.element_pattern(
-                    lo_phi_vec[g],
-                    lo_theta_vec[g],
-                )\
-                    + self.adj_correction_factor
+            gains = self.element.element_pattern(lo_phi_vec, lo_theta_vec) \
+                + self.adj_correction_factor
 
         gains = np.maximum(gains, self.minimum_array_gain)
 
@@ -218,6 +212,25 @@ class AntennaBeamformingImt(Antenna):
         self.w_vec_list = []
         self.co_correction_factor_list = []
 
+    def set_orientation(self, azimuth: float, elevation: float):
+        """
+        Sets a new physical orientation and removes all beams, so that the
+        antenna can be reused in another snapshot instead of being built
+        again. The rotation matrix is only recalculated if the orientation
+        changes.
+
+        Parameters
+        ----------
+            azimuth (float): antenna's physical azimuth inclination
+            elevation (float): antenna's physical elevation inclination
+                referenced in the x axis
+        """
+        if azimuth != self.azimuth or elevation != self.elevation:
+            self.azimuth = azimuth
+            self.elevation = elevation
+            self._calculate_rotation_matrix()
+        self.reset_beams()
+
     def _super_position_vector(self, phi: float, theta: float) -> np.array:
         """
         Calculates super position vector.
@@ -225,16 +238,17 @@ class AntennaBeamformingImt(Antenna):
 
         Parameters
         ----------
-            theta (float): elevation angle [degrees]
-            phi (float): azimuth angle [degrees]
+            theta (float or np.array): elevation angle [degrees]
+            phi (float or np.array): azimuth angle [degrees]
 
         Returns
         -------
-            v_vec (np.array): superposition vector
+            v_vec (np.array): superposition vector. If arrays of angles are
+                given, one (n_rows x n_cols) vector is stacked per direction
         """
         #print("phi", phi)
-        r_phi = np.deg2rad(phi)
-        r_theta = np.deg2rad(theta)
+        r_phi = np.deg2rad(np.asarray(phi))[..., np.newaxis, np.newaxis]
+        r_theta = np.deg2rad(np.asarray(theta))[..., np.newaxis, np.newaxis]
         #print("Theta deg revisar: ", theta)
         n = np.arange(self.n_rows) + 1
         m = np.arange(self.n_cols) + 1
@@ -253,16 +267,17 @@ class AntennaBeamformingImt(Antenna):
 
         Parameters
         ----------
-            phi_tilt (float): electrical horizontal steering [degrees]
-            theta_tilt (float): electrical down-tilt steering [degrees]
+            phi_tilt (float or np.array): electrical horizontal steering [degrees]
+            theta_tilt (float or np.array): electrical down-tilt steering [degrees]
 
         Returns
         -------
-            w_vec (np.array): weighting vector
+            w_vec (np.array): weighting vector. If arrays of angles are
+                given, one (n_rows x n_cols) vector is stacked per direction
         """
         #print("degrados phi_tilt", phi_tilt)
-        r_phi = np.deg2rad(phi_tilt)
-        r_theta = np.deg2rad(theta_tilt)
+        r_phi = np.deg2rad(np.asarray(phi_tilt))[..., np.newaxis, np.newaxis]
+        r_theta = np.deg2rad(np.asarray(theta_tilt))[..., np.newaxis, np.newaxis]
         #print("r_phi: ", r_phi)
         #print("Theta - 90 deg",theta_tilt)
         n = np.arange(self.n_rows) + 1
@@ -284,12 +299,12 @@ class AntennaBeamformingImt(Antenna):
 
         Parameters
         ----------
-        theta : float
+        theta : float or np.array
         Angle in degrees for which the subarray gain is calculated.
 
         Returns
         -------
-        array_sub : float
+        array_sub : float or np.array
         Subarray gain [dBi].
         """
     # Declarar parámetros fijos
@@ -299,7 +314,7 @@ class AntennaBeamformingImt(Antenna):
     
         # Convertir ángulos a radianes
         r_theta_3 = np.deg2rad(theta_sub_tilt)
-        r_theta = np.deg2rad(theta)
+        r_theta = np.deg2rad(np.asarray(theta))[..., np.newaxis]
         #print("theta:", theta, "r_theta:", r_theta)
         #print("theta_sub_tilt:", theta_sub_tilt, "r_theta_3:", r_theta_3)
 
@@ -308,23 +323,23 @@ class AntennaBeamformingImt(Antenna):
         #print("n_s:", n_s)
 
         # Calcular w_sub
-        exp_arg_s = (n_s[:, np.newaxis] - 1) * dv_sub * np.sin(r_theta_3)
+        exp_arg_s = (n_s - 1) * dv_sub * np.sin(r_theta_3)
         w_sub = (1 / np.sqrt(n_s_rows)) * np.exp(2 * np.pi * 1.0j * exp_arg_s)
         #print("w_sub:", w_sub)
 
         # Calcular v_sub
-        v_sub = np.exp(2 * np.pi * 1.0j * (n_s[:, np.newaxis] - 1) * dv_sub * np.cos(r_theta))
+        v_sub = np.exp(2 * np.pi * 1.0j * (n_s - 1) * dv_sub * np.cos(r_theta))
         #print("v_sub:", v_sub)
 
         # Multiplicación y suma
         multi_p = np.multiply(v_sub, w_sub)
         #print("multi_p:", multi_p)
 
-        sumi_p = np.sum(multi_p)
+        sumi_p = np.sum(multi_p, axis=-1)
         #print("sumi_p:", sumi_p)
 
         # Calcular ganancia del subarreglo
-        array_sub = 10 * np.log10(abs(sumi_p) ** 2)
+        array_sub = 10 * np.log10(np.abs(sumi_p) ** 2)
         #print("array_sub:", array_sub)
 
         return array_sub
@@ -385,6 +400,53 @@ class AntennaBeamformingImt(Antenna):
         #print("ganancia Total del arreglo", gain)
         return gain
 
+    def _beam_gains(self, phi: np.array, theta: np.array, beams: np.array,
+                    station_type=None) -> np.array:
+        """
+        Calculates the beam gains for many directions at once. Produces the
+        same values as calling _beam_gain for each direction, but builds a
+        (directions x n_rows x n_cols) superposition tensor and weights it
+        against the stacked beam weight vectors in a single operation.
+        Angles are in the local coordinate system.
+
+        Parameters
+        ----------
+            phi (np.array): azimuth angles [degrees]
+            theta (np.array): elevation angles [degrees]
+            beams (np.array of int): beam index for each direction. Index -1
+                corresponds to the beam of maximum gain in the given direction
+
+        Returns
+        -------
+            gains (np.array): beam gains [dBi]
+        """
+        phi = np.ravel(phi)
+        theta = np.ravel(theta)
+        beams = np.ravel(beams)
+
+        element_g = self.element.element_pattern(phi, theta)
+        v_vec = self._super_position_vector(phi, theta)
+
+        if station_type == StationType.IMT_BS:
+            sub_array_g = self._calculate_subarray_gain(theta)
+        else:
+            sub_array_g = 0
+
+        w_vec = np.empty_like(v_vec)
+        max_gain = beams == -1
+        if np.any(max_gain):
+            w_vec[max_gain] = self._weight_vector(
+                phi[max_gain], theta[max_gain] - 90,
+            )
+        if not np.all(max_gain):
+            w_vec[~max_gain] = np.stack(self.w_vec_list)[beams[~max_gain]]
+
+        array_g = 10 * np.log10(
+            np.abs(np.sum(np.multiply(v_vec, w_vec), axis=(-2, -1)))**2,
+        )
+
+        return sub_array_g + element_g + array_g
+
     def to_local_coord(self, phi: float, theta: float) -> tuple:
         """Returns phi and theta to antennas local coordintate system
 
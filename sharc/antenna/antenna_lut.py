@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Lookup tables of the system antenna patterns that depend only on the
+off-axis angle.
+"""
+
+import numpy as np
+
+from sharc.antenna.antenna import Antenna
+from sharc.antenna.antenna_f1891 import AntennaF1891
+from sharc.antenna.antenna_f699 import AntennaF699
+from sharc.antenna.antenna_fss_ss import AntennaFssSs
+from sharc.antenna.antenna_modified_s465 import AntennaModifiedS465
+from sharc.antenna.antenna_rs1813 import AntennaRS1813
+from sharc.antenna.antenna_rs1861_9a import AntennaRS1861_9A
+from sharc.antenna.antenna_rs1861_9b import AntennaRS1861_9B
+from sharc.antenna.antenna_s465 import AntennaS465
+from sharc.antenna.antenna_s580 import AntennaS580
+from sharc.antenna.antenna_s672 import AntennaS672
+from sharc.antenna.antenna_sa509 import AntennaSA509
+
+
+class AntennaLut(Antenna):
+    """
+    Serves the gain of an antenna pattern by linear interpolation of a table
+    of the exact pattern, sampled once in [0, 180] degrees. A station
+    looking at thousands of stations then costs a few vectorized operations
+    instead of evaluating the piecewise closed forms of the pattern.
+
+    The table is sampled every resolution degrees, so the interval of each
+    angle is found by a division instead of a search. The interpolation
+    error of each interval is estimated against the exact pattern at 7
+    points, and the few intervals where it exceeds the tolerance (those with
+    discontinuities or sharp kinks of the pattern) are calculated with the
+    exact pattern. The slope of those intervals is NaN, so the angles that
+    fall in them are found with a single test of the interpolated gains.
+    Tables are built once per process for each set of antenna parameters, so
+    antennas created in every snapshot share them.
+
+    Attributes
+    ----------
+        antenna (Antenna): exact antenna pattern
+        resolution (float): angle between samples of the table [deg]
+        gains (np.array): gain at each sample of the table [dBi]
+        exact (np.array): whether each interval of the table is calculated
+            with the exact pattern
+        max_error (float): maximum interpolation error [dB] measured at the
+            7 points of each interpolated interval. It is an estimate, not a
+            bound: the error between those points is not measured
+    """
+
+    # Patterns that depend only on the absolute off-axis angle
+    supported = (
+        AntennaF1891,
+        AntennaF699,
+        AntennaFssSs,
+        AntennaModifiedS465,
+        AntennaRS1813,
+        AntennaRS1861_9A,
+        AntennaRS1861_9B,
+        AntennaS465,
+        AntennaS580,
+        AntennaS672,
+        AntennaSA509,
+    )
+
+    # Maximum interpolation error [dB]
+    tolerance = 0.01
+
+    # (gains, deltas, intercepts, exact, max_error) of the tables built by
+    # this process
+    _tables = dict()
+
+    def __init__(self, antenna: Antenna, resolution: float):
+        super().__init__()
+        if resolution <= 0:
+            raise ValueError(
+                f"AntennaLut: invalid resolution {resolution}. "
+                "Must be a positive number of degrees",
+            )
+        self.antenna = antenna
+        self.resolution = float(resolution)
+
+        key = (
+            type(antenna).__name__,
+            repr(sorted(vars(antenna).items())),
+            self.resolution,
+        )
+        if key not in AntennaLut._tables:
+            AntennaLut._tables[key] = self._build_table()
+        self.gains, self._deltas, self._intercepts, self.exact, \
+            self.max_error = AntennaLut._tables[key]
+        self._inv_resolution = 1 / self.resolution
+        self._has_exact = bool(np.any(self.exact))
+
+    @staticmethod
+    def get_antenna(antenna: Antenna, resolution: float) -> Antenna:
+        """
+        Returns the lookup table of an antenna, or the antenna itself if its
+        pattern is not supported or resolution is 0.
+        """
+        if resolution and isinstance(antenna, AntennaLut.supported):
+            return AntennaLut(antenna, resolution)
+        return antenna
+
+    def calculate_gain(self, *args, **kwargs) -> np.array:
+        phi = np.absolute(kwargs["off_axis_angle_vec"])
+
+        # interval of each angle. Angles of 180 degrees or more use the last
+        # sample of the table
+        x = phi * self._inv_resolution
+        idx = x.astype(np.intp)
+
+        gain = self._deltas.take(idx, mode="clip")
+        gain *= x
+        gain += self._intercepts.take(idx, mode="clip")
+
+        # the gain is NaN in the intervals calculated with the exact pattern
+        if self._has_exact:
+            exact = np.flatnonzero(np.isnan(gain))
+            if len(exact):
+                np.put(gain, exact, self._exact_gain(phi.take(exact)))
+
+        return gain
+
+    def __getattr__(self, name):
+        # other attributes (e.g. peak_gain, effective_area) are the ones of
+        # the exact pattern
+        if name == "antenna":
+            raise AttributeError(name)
+        return getattr(self.antenna, name)
+
+    def _exact_gain(self, phi: np.array) -> np.array:
+        return self.antenna.calculate_gain(off_axis_angle_vec=phi)
+
+    def _build_table(self) -> tuple:
+        """
+        Samples the exact pattern and measures the error of each interval.
+        """
+        num_intervals = int(np.ceil(180 / self.resolution))
+        gains = self._exact_gain(np.arange(num_intervals + 1) * self.resolution)
+        deltas = np.diff(gains)
+
+        fractions = np.arange(1, 8) / 8
+        points = (np.arange(num_intervals)[:, np.newaxis] + fractions) * \
+            self.resolution
+        interpolated = gains[:-1, np.newaxis] + deltas[:, np.newaxis] * fractions
+        error = np.max(
+            np.abs(
+                self._exact_gain(points.ravel()).reshape(points.shape) -
+                interpolated,
+            ),
+            axis=1,
+        )
+        exact = error > self.tolerance
+        max_error = float(np.max(error[~exact])) if np.any(~exact) else 0.0
+
+        # the last sample is used for angles of 180 degrees or more
+        deltas = np.append(np.where(exact, np.nan, deltas), 0)
+        exact = np.append(exact, False)
+        # gain = intercept + delta * angle / resolution in each interval
+        intercepts = gains - deltas * np.arange(len(gains))
+
+        return gains, deltas, intercepts, exact, max_error
+
+
+if __name__ == '__main__':
+    from sharc.parameters.parameters_fss_es import ParametersFssEs
+
+    param = ParametersFssEs()
+    param.frequency = 27000
+    param.antenna_gain = 50
+    param.diameter = 0.45
+    antenna = AntennaS465(param)
+    lut = AntennaLut(antenna, 0.1)
+
+    phi = np.random.uniform(0, 180, 100000)
+    error = np.abs(
+        lut.calculate_gain(off_axis_angle_vec=phi) -
+        antenna.calculate_gain(off_axis_angle_vec=phi),
+    )
+    print(f"{len(lut.gains)} samples, {np.count_nonzero(lut.exact)} exact "
+          f"intervals, maximum error {lut.max_error:.2e} dB, error at random "
+          f"angles {np.max(error):.2e} dB")
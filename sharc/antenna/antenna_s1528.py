@@ -10,7 +10,7 @@ from sharc.parameters.antenna.parameters_antenna_s1528 import ParametersAntennaS
 from sharc.parameters.constants import SPEED_OF_LIGHT
 import math
 import numpy as np
-from scipy.special import jn, jn_zeros
+from scipy.special import j1, jn_zeros
 
 
 class AntennaS1528Taylor(Antenna):
@@ -23,6 +23,7 @@ class AntennaS1528Taylor(Antenna):
     """
 
     def __init__(self, param: ParametersAntennaS1528):
+        super().__init__()
         # Gmax
         self.peak_gain = param.antenna_gain
         self.frequency_mhz = param.frequency
@@ -47,28 +48,37 @@ class AntennaS1528Taylor(Antenna):
                 f"AntennaS1528Taylor: Invalid value for roll_off factor {self.roll_off}")
         self.roll_off = int(self.roll_off)
 
+        # Pattern constants, which do not depend on the direction
+        A = (1 / np.pi) * np.arccosh(10 ** (self.slr / 20))
+        j1_roots = jn_zeros(1, self.n_side_lobes) / np.pi
+        sigma = j1_roots[-1] / np.sqrt(A ** 2 + (self.n_side_lobes - 1 / 2) ** 2)
+        mu = jn_zeros(1, self.n_side_lobes - 1) / np.pi
+        # Each side lobe contributes the factor
+        # (1 - u^2 / zeros_sq[i]) / (1 - (u / poles[i])^2)
+        self.zeros_sq = [
+            np.pi ** 2 * sigma ** 2 * (A ** 2 + (i + 1 - 0.5) ** 2)
+            for i in range(len(mu))
+        ]
+        self.poles = [np.pi * ui for ui in mu]
+
     def calculate_gain(self, *args, **kwargs) -> np.array:
         phi = np.abs(np.radians(kwargs.get('phi', 0)))
         theta = np.abs(np.radians(kwargs.get('theta', 0)))
 
-        # Intermediary variables
-        A = (1 / np.pi) * np.arccosh(10 ** (self.slr / 20))
-        j1_roots = jn_zeros(1, self.n_side_lobes) / np.pi
-        sigma = j1_roots[-1] / np.sqrt(A ** 2 + (self.n_side_lobes - 1 / 2) ** 2)
         u = (np.pi / self.lamb) * np.sqrt((self.l_r * np.sin(theta) * np.cos(phi)) ** 2 +
                                           (self.l_t * np.sin(theta) * np.sin(phi)) ** 2)
 
-        mu = jn_zeros(1, self.n_side_lobes - 1) / np.pi
-        v = np.ones(u.shape + (self.n_side_lobes - 1,))
-
-        for i, ui in enumerate(mu):
-            v[..., i] = (1 - u ** 2 / (np.pi ** 2 * sigma ** 2 *
-                                       (A ** 2 + (i + 1 - 0.5) ** 2))) / (1 - (u / (np.pi * ui)) ** 2)
-
-        # Take care of divide-by-zero
+        # Product of the side lobe factors, accumulated in place so that the
+        # memory used does not grow with the number of side lobes
+        u_sq = u ** 2
+        v = np.ones(u.shape)
         with np.errstate(divide='ignore', invalid='ignore'):
+            for zero_sq, pole in zip(self.zeros_sq, self.poles):
+                v *= (1 - u_sq / zero_sq) / (1 - (u / pole) ** 2)
+
+            # Take care of divide-by-zero
             gain = self.peak_gain + 20 * \
-                np.log10(np.abs((2 * jn(1, u) / u) * np.prod(v, axis=-1)))
+                np.log10(np.abs((2 * j1(u) / u) * v))
 
         # Replace undefined values with -inf (or other desired value)
         gain = np.nan_to_num(gain, nan=-np.inf)
@@ -5,13 +5,39 @@ Created on Fri Mar  2 14:28:25 2018
 @author: Calil
 """
 
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sys import stdout
+
 import numpy as np
 from scipy.integrate import dblquad
-from sys import stdout
 
 from sharc.antenna.antenna_beamforming_imt import AntennaBeamformingImt
 from sharc.support.named_tuples import AntennaPar
 
+# Normalizer of the worker process. It is copied to the worker only once,
+# when the worker is started, and reused for all the rows it calculates.
+_normalizer = None
+
+
+def _init_worker(normalizer, par: AntennaPar):
+    """
+    Builds the antenna of the normalizer of a worker process.
+    """
+    global _normalizer
+
+    _normalizer = normalizer
+    _normalizer.antenna = AntennaBeamformingImt(par, 0, 0)
+
+
+def _calculate_row(phi_idx: int) -> tuple:
+    """
+    Calculates a row of the correction factor matrix in the worker process.
+    """
+    return (phi_idx,) + _normalizer.calculate_correction_row(phi_idx)
+
 
 class BeamformingNormalizer(object):
     """
@@ -38,19 +64,43 @@ class BeamformingNormalizer(object):
             resolution
         antenna (AntennaBeamformingImt): antenna to which calculate
             normalization
+        method (str): integration method, "DBLQUAD" for adaptive
+            integration up to the given tolerance or "GAUSS_LEGENDRE" for a
+            fixed Gauss-Legendre grid over the vectorized array pattern
+        num_points (tuple): number of Gauss-Legendre nodes in phi and theta
     """
 
-    def __init__(self, res_deg: float, tol: float):
+    methods = ["DBLQUAD", "GAUSS_LEGENDRE"]
+
+    def __init__(
+        self,
+        res_deg: float,
+        tol: float,
+        method="DBLQUAD",
+        num_points=(360, 180),
+    ):
         """
         Class constructor
 
         Parameters:
             res_deg (float): correction factor matrix resolution in degrees
-            tol (float): absolute tolerance for integration
+            tol (float): absolute tolerance for integration (DBLQUAD only)
+            method (str): integration method, DBLQUAD or GAUSS_LEGENDRE
+            num_points (tuple): number of Gauss-Legendre nodes in phi and
+                theta (GAUSS_LEGENDRE only). The integration error is
+                estimated by comparing against a grid with half the nodes
         """
+        if method not in self.methods:
+            raise ValueError(
+                f"BeamformingNormalizer: invalid integration method {method}. "
+                f"Must be one of {self.methods}",
+            )
+
         # Initialize attributes
         self.resolution_deg = res_deg
         self.tolerance = tol
+        self.method = method
+        self.num_points = tuple(num_points)
 
         self.phi_min_deg = -180
         self.phi_max_deg = 180
@@ -71,25 +121,42 @@ class BeamformingNormalizer(object):
             self.theta_max_deg, res_deg,
         )
         self.antenna = None
+        self._quadrature = None
 
     def generate_correction_matrix(
         self,
         par: AntennaPar,
         file_name: str,
         testing=False,
+        workers=1,
+        checkpoint_dir=None,
     ):
         """
         Generates the correction factor matrix and saves it in a file
 
+        The rows of the matrix (one per phi value) are independent, so they
+        can be spread over a pool of worker processes. If a checkpoint
+        directory is given, each finished row is saved there as soon as it is
+        calculated, and rows already saved by a previous (killed) run with the
+        same antenna and integration settings are loaded instead of
+        recalculated. The checkpoint files are removed once the correction
+        matrix file is saved.
+
         Parameters:
             par (AntennaPar): set of antenna parameters to which calculate the
                 correction factor
             file_name (str): name of file to which save the correction matrix
+            testing (bool): if True, progress is not printed
+            workers (int): number of worker processes. If 1, rows are
+                calculated in this process
+            checkpoint_dir (str): directory where finished rows are saved. If
+                None, no checkpoints are saved
         """
         # Create antenna object
         azi = 0  # Antenna azimuth: 0 degrees for simplicity
         ele = 0  # Antenna elevation: 0 degrees as well
         self.antenna = AntennaBeamformingImt(par, azi, ele)
+        self._quadrature = None
 
         # For co-channel beamforming
         # Correction factor numpy array
@@ -100,17 +167,59 @@ class BeamformingNormalizer(object):
             (len(self.phi_vals_deg), len(self.theta_vals_deg)), dtype=tuple,
         )
 
-        # Loop throug all the possible beams
-        for phi_idx, phi in enumerate(self.phi_vals_deg):
+        def store_row(phi_idx, cf_row, err_row):
+            correction_factor_co[phi_idx] = cf_row
+            for theta_idx, err in enumerate(err_row):
+                error_co[phi_idx, theta_idx] = tuple(err)
+
+        # Load the rows saved by a previous run
+        signature = self._checkpoint_signature(par)
+        pending = []
+        for phi_idx in range(len(self.phi_vals_deg)):
+            row = self._load_row(checkpoint_dir, signature, phi_idx)
+            if row is None:
+                pending.append(phi_idx)
+            else:
+                store_row(phi_idx, *row)
+        if not testing and len(pending) < len(self.phi_vals_deg):
+            print(
+                f"Resuming: {len(self.phi_vals_deg) - len(pending)} of "
+                f"{len(self.phi_vals_deg)} rows loaded from {checkpoint_dir}",
+            )
+
+        def finish_row(done, phi_idx, cf_row, err_row):
+            store_row(phi_idx, cf_row, err_row)
+            self._save_row(checkpoint_dir, signature, phi_idx, cf_row, err_row)
             if not testing:
-                print('\n' + str(100 * phi_idx / len(self.phi_vals_deg)) + '%')
-            for theta_idx, theta in enumerate(self.theta_vals_deg):
-                s = '\tphi = ' + str(phi) + ', theta = ' + str(theta)
-                if not testing:
-                    print(s)
+                print(
+                    '\tphi = ' + str(self.phi_vals_deg[phi_idx]) + ' done (' +
+                    str(100 * done / len(pending)) + '%)',
+                )
                 stdout.flush()
-                correction_factor_co[phi_idx, theta_idx], error_co[phi_idx, theta_idx] = \
-                    self.calculate_correction_factor(phi, theta, True)
+
+        # Loop throug all the possible beams
+        if workers > 1 and len(pending) > 1:
+            # the antenna is rebuilt in each worker
+            antenna, self.antenna = self.antenna, None
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(self, par),
+                ) as executor:
+                    futures = [
+                        executor.submit(_calculate_row, phi_idx)
+                        for phi_idx in pending
+                    ]
+                    for done, future in enumerate(as_completed(futures), 1):
+                        finish_row(done, *future.result())
+            finally:
+                self.antenna = antenna
+        else:
+            for done, phi_idx in enumerate(pending, 1):
+                finish_row(
+                    done, phi_idx, *self.calculate_correction_row(phi_idx),
+                )
 
         correction_factor_adj, error_adj = self.calculate_correction_factor(
             0, 0, False,
@@ -125,6 +234,32 @@ class BeamformingNormalizer(object):
             par,
             file_name,
         )
+        self._remove_checkpoints(checkpoint_dir)
+
+    def calculate_correction_row(self, phi_idx: int) -> tuple:
+        """
+        Calculates the correction factors of all the beams pointed at the
+        given phi value.
+
+        Parameters:
+            phi_idx (int): index of the phi value in phi_vals_deg
+
+        Returns:
+            correction_factor (np.array): correction factor of each theta
+                value [dB]
+            error (np.array): (number of theta values x 2) array with the
+                lower and upper error bounds of each correction factor [dB]
+        """
+        phi = self.phi_vals_deg[phi_idx]
+        correction_factor = np.zeros(len(self.theta_vals_deg))
+        error = np.zeros((len(self.theta_vals_deg), 2))
+        for theta_idx, theta in enumerate(self.theta_vals_deg):
+            correction_factor[theta_idx], error[theta_idx] = \
+                self.calculate_correction_factor(phi, theta, True)
+        # beams are only needed while their correction factor is calculated
+        self.antenna.reset_beams()
+
+        return correction_factor, error
 
     def calculate_correction_factor(self, phi_beam: float, theta_beam: float, c_chan: bool):
         """
@@ -145,19 +280,23 @@ class BeamformingNormalizer(object):
             self.antenna.add_beam(phi_beam, theta_beam)
             beam = int(len(self.antenna.beams_list) - 1)
 
-            def int_f(t, p):
-                return np.power(10, self.antenna._beam_gain(np.rad2deg(p), np.rad2deg(t), beam) / 10) * np.sin(t)
+        if self.method == "GAUSS_LEGENDRE":
+            integral_val, err = self._integrate_gauss_legendre(c_chan)
         else:
-            def int_f(t, p):
-                return np.power(10, self.antenna.element.element_pattern(np.rad2deg(p), np.rad2deg(t)) / 10) * np.sin(t)
-
-        integral_val, err = dblquad(
-            int_f, self.phi_min_rad, self.phi_max_rad,
-            lambda p: self.theta_min_rad,
-            lambda p: self.theta_max_rad,
-            epsabs=self.tolerance,
-            epsrel=0.0,
-        )
+            if c_chan:
+                def int_f(t, p):
+                    return np.power(10, self.antenna._beam_gain(np.rad2deg(p), np.rad2deg(t), beam) / 10) * np.sin(t)
+            else:
+                def int_f(t, p):
+                    return np.power(10, self.antenna.element.element_pattern(np.rad2deg(p), np.rad2deg(t)) / 10) * np.sin(t)
+
+            integral_val, err = dblquad(
+                int_f, self.phi_min_rad, self.phi_max_rad,
+                lambda p: self.theta_min_rad,
+                lambda p: self.theta_max_rad,
+                epsabs=self.tolerance,
+                epsrel=0.0,
+            )
 
         correction_factor = -10 * np.log10(integral_val / (4 * np.pi))
 
@@ -166,6 +305,163 @@ class BeamformingNormalizer(object):
 
         return correction_factor, (low_bound, hig_bound)
 
+    def _integrate_gauss_legendre(self, c_chan: bool) -> tuple:
+        """
+        Integrates the pattern of the last beam added to the antenna (or of
+        the antenna element) over the sphere with a fixed Gauss-Legendre
+        grid. The error is estimated as the difference to the integral over
+        a grid with half the nodes.
+
+        Parameters:
+            c_chan (bool): if True, the array pattern is integrated. Otherwise,
+                the element pattern is integrated
+
+        Returns:
+            integral_val (float): value of the integral (linear)
+            err (float): estimated absolute error of the integral (linear)
+        """
+        if self._quadrature is None or self._quadrature[0] is not self.antenna:
+            grids = [
+                self._gauss_legendre_grid(self.num_points),
+                self._gauss_legendre_grid(
+                    [max(n // 2, 1) for n in self.num_points],
+                ),
+            ]
+            self._quadrature = (self.antenna, grids)
+
+        values = []
+        for weights, v_vec in self._quadrature[1]:
+            if c_chan:
+                w_vec = self.antenna.w_vec_list[-1].ravel()
+                weights = weights * np.abs(v_vec @ w_vec)**2
+            values.append(np.sum(weights))
+
+        return values[0], abs(values[0] - values[1])
+
+    def _gauss_legendre_grid(self, num_points) -> tuple:
+        """
+        Calculates the parts of the integrand over a Gauss-Legendre grid that
+        do not depend on the beam, so that the pattern of each beam is a
+        single matrix-vector product.
+
+        Parameters:
+            num_points (tuple): number of nodes in phi and theta
+
+        Returns:
+            weights (np.array): quadrature weights multiplied by the linear
+                element gain and the sine of theta at each node
+            v_vec (np.array): (nodes x n_rows * n_cols) superposition vectors
+        """
+        phi_nodes, phi_weights = self._gauss_legendre_nodes(
+            num_points[0], self.phi_min_rad, self.phi_max_rad,
+        )
+        theta_nodes, theta_weights = self._gauss_legendre_nodes(
+            num_points[1], self.theta_min_rad, self.theta_max_rad,
+        )
+        phi, theta = np.meshgrid(phi_nodes, theta_nodes, indexing="ij")
+        phi = np.rad2deg(phi.ravel())
+        theta_rad = theta.ravel()
+        theta = np.rad2deg(theta_rad)
+
+        element_g = self.antenna.element.element_pattern(phi, theta)
+        weights = np.outer(phi_weights, theta_weights).ravel() * \
+            np.power(10, element_g / 10) * np.sin(theta_rad)
+        v_vec = self.antenna._super_position_vector(phi, theta)
+
+        return weights, v_vec.reshape(len(weights), -1)
+
+    @staticmethod
+    def _gauss_legendre_nodes(num_points: int, low: float, high: float) -> tuple:
+        """
+        Returns the Gauss-Legendre nodes and weights for the interval
+        [low, high].
+        """
+        nodes, weights = np.polynomial.legendre.leggauss(num_points)
+        half_width = (high - low) / 2
+        return low + half_width * (nodes + 1), half_width * weights
+
+    def _checkpoint_signature(self, par: AntennaPar) -> str:
+        """
+        Identifies the antenna and integration settings of the checkpoints,
+        so that rows calculated with other settings are never resumed.
+        """
+        settings = (
+            tuple(par), self.resolution_deg, self.tolerance, self.method,
+            self.num_points, tuple(self.phi_vals_deg),
+            tuple(self.theta_vals_deg),
+        )
+        return hashlib.sha1(repr(settings).encode()).hexdigest()
+
+    @staticmethod
+    def _row_file(checkpoint_dir: str, phi_idx: int) -> str:
+        return os.path.join(checkpoint_dir, f"row_{phi_idx:05d}.npz")
+
+    def _load_row(self, checkpoint_dir: str, signature: str, phi_idx: int):
+        """
+        Loads a row saved by _save_row. Returns None if there is no
+        checkpoint or if it was saved with other settings.
+        """
+        if checkpoint_dir is None:
+            return None
+        try:
+            with np.load(self._row_file(checkpoint_dir, phi_idx)) as data:
+                if str(data["signature"]) != signature:
+                    return None
+                return data["correction_factor"], data["error"]
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _save_row(
+        self, checkpoint_dir: str, signature: str, phi_idx: int,
+        correction_factor: np.array, error: np.array,
+    ):
+        """
+        Saves a finished row to the checkpoint directory. The file is written
+        under a unique temporary name and renamed, so a killed run never
+        leaves a partial checkpoint behind and several runs generating the
+        same matrix do not write to the same file. Checkpoints are only an
+        optimization, so a row that cannot be saved (e.g. because another run
+        finished and removed the directory) is not an error.
+        """
+        if checkpoint_dir is None:
+            return
+        row_file = self._row_file(checkpoint_dir, phi_idx)
+        tmp_file = None
+        try:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+            fd, tmp_file = tempfile.mkstemp(dir=checkpoint_dir, suffix=".npz")
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    signature=signature,
+                    correction_factor=correction_factor,
+                    error=error,
+                )
+            os.replace(tmp_file, row_file)
+        except OSError:
+            if tmp_file is not None and os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+    def _remove_checkpoints(self, checkpoint_dir: str):
+        """
+        Removes the checkpoint files (and the directory, if left empty).
+        Other runs generating the same matrix may still be writing to or
+        removing the directory, so files that are already gone and a
+        directory that is not empty are not errors.
+        """
+        if checkpoint_dir is None:
+            return
+        for phi_idx in range(len(self.phi_vals_deg)):
+            try:
+                os.remove(self._row_file(checkpoint_dir, phi_idx))
+            except OSError:
+                pass
+        try:
+            if not os.listdir(checkpoint_dir):
+                os.rmdir(checkpoint_dir)
+        except OSError:
+            pass
+
     def _save_files(self, cf_co, err_co, cf_adj, err_adj, par, file_name):
         """
         Saves input correction factor and error values to npz file.
@@ -220,7 +516,6 @@ if __name__ == '__main__':
     Plots correction factor for horizontal and vertical planes.
     """
     import matplotlib.pyplot as plt
-    import os
 
     # Create normalizer object
     resolution = 5
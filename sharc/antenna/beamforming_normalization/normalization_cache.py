@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed cache of beamforming normalization data.
+
+Normalization files are converted once to plain .npy arrays in the SHARC
+cache directory, in a subdirectory named after the hash of their contents.
+The correction factor matrix is then memory-mapped read-only, so all the
+antennas of a process share one mapping and all the processes that use the
+same normalization (snapshot workers, parallel campaigns) share the same
+pages of the operating system page cache instead of holding their own copies.
+
+If the normalization file does not exist, the normalization is generated on
+demand for the antenna parameters and stored under the hash of the parameters
+that define the antenna pattern. Entries are created under a file lock, so
+when many processes need the same missing normalization (e.g. the workers of
+a snapshot pool) only one of them generates it and the others wait for it.
+"""
+
+import contextlib
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # not available on Windows, where entries are created without a lock
+    fcntl = None
+
+from sharc.support.named_tuples import AntennaPar
+from sharc.support.sharc_utils import get_cache_dir
+
+# Version of the cache layout. Increment it when the stored data changes.
+version = 1
+
+# Settings of the normalizations generated on demand
+default_resolution = 5
+default_num_points = (360, 180)
+
+# AntennaPar fields that define the pattern being normalized
+_pattern_fields = [
+    "element_pattern",
+    "element_max_g",
+    "element_phi_3db",
+    "element_theta_3db",
+    "element_am",
+    "element_sla_v",
+    "n_rows",
+    "n_columns",
+    "element_horiz_spacing",
+    "element_vert_spacing",
+    "multiplication_factor",
+]
+
+_info_file_name = "info.json"
+_array_names = ["correction_factor_co_channel", "error_co_channel"]
+
+# Normalization data already loaded by this process, by cache key
+_entries = dict()
+# Cache key of each normalization file, by (path, modification time, size)
+_file_keys = dict()
+
+
+def get_normalization_data(
+    par: AntennaPar,
+    normalization_file: str,
+    resolution=None,
+    workers=None,
+) -> dict:
+    """
+    Returns the normalization data of an antenna, in the dict format read by
+    AntennaBeamformingImt. The correction factor matrices are read-only
+    memory-mapped arrays.
+
+    Parameters
+    ----------
+        par (AntennaPar): antenna parameters
+        normalization_file (str): .npz file saved by BeamformingNormalizer.
+            If it does not exist, the normalization is generated for par
+        resolution (float): resolution [deg] of generated normalizations.
+            Defaults to default_resolution
+        workers (int): number of processes used to generate normalizations.
+            Defaults to the number of CPUs, or to 1 in a worker process of a
+            process pool, which would otherwise start a pool per worker
+
+    Returns
+    -------
+        data (dict): normalization data
+    """
+    if normalization_file is not None and os.path.exists(normalization_file):
+        key = _file_key(normalization_file)
+        if key not in _entries:
+            _entries[key] = _load_entry(key, lambda: _read_file(normalization_file))
+        return _entries[key]
+
+    if resolution is None:
+        resolution = default_resolution
+    key = _pattern_key(par, resolution)
+    if key not in _entries:
+        _entries[key] = _load_entry(
+            key,
+            lambda: _generate(par, resolution, workers, normalization_file, key),
+        )
+    return _entries[key]
+
+
+def _file_key(normalization_file: str) -> str:
+    """
+    Returns the hash of the contents of a normalization file. The hash is
+    calculated only once while the file is not modified.
+    """
+    stat = os.stat(normalization_file)
+    file_id = (
+        os.path.abspath(normalization_file), stat.st_mtime_ns, stat.st_size,
+    )
+    if file_id not in _file_keys:
+        with open(normalization_file, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        _file_keys[file_id] = f"file_{version}_{digest}"
+    return _file_keys[file_id]
+
+
+def _pattern_key(par: AntennaPar, resolution: float) -> str:
+    """
+    Returns the hash of the antenna parameters that define the pattern and of
+    the settings of the generated normalization.
+    """
+    settings = (
+        version,
+        tuple((name, getattr(par, name)) for name in _pattern_fields),
+        float(resolution),
+        default_num_points,
+    )
+    digest = hashlib.sha1(repr(settings).encode()).hexdigest()
+    return f"antenna_{version}_{digest}"
+
+
+def _load_entry(key: str, read) -> dict:
+    """
+    Loads a cache entry, creating it first with the data returned by read if
+    it does not exist. If the cache directory cannot be written, the data is
+    used from memory.
+    """
+    try:
+        entry_dir = os.path.join(get_cache_dir("normalization"), key)
+    except OSError:
+        return read()
+
+    data = _map_entry(entry_dir)
+    if data is not None:
+        return data
+
+    with _entry_lock(entry_dir):
+        # another process may have created the entry while this one waited
+        data = _map_entry(entry_dir)
+        if data is not None:
+            return data
+
+        data = read()
+        try:
+            _save_entry(entry_dir, data)
+        except OSError:
+            # the cache is an optimization only
+            return data
+    mapped = _map_entry(entry_dir)
+    return data if mapped is None else mapped
+
+
+@contextlib.contextmanager
+def _entry_lock(entry_dir: str):
+    """
+    Holds an exclusive lock on a cache entry while it is created. The lock
+    file is left in the cache directory, since removing it could let two
+    processes hold locks on different files.
+    """
+    if fcntl is None:
+        yield
+        return
+    try:
+        lock_file = open(entry_dir + ".lock", "a")
+    except OSError:
+        yield
+        return
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _map_entry(entry_dir: str):
+    """
+    Memory-maps the arrays of a cache entry. Returns None if the entry does
+    not exist or is invalid.
+    """
+    try:
+        with open(os.path.join(entry_dir, _info_file_name)) as f:
+            data = json.load(f)
+        for name in _array_names:
+            data[name] = np.load(
+                os.path.join(entry_dir, name + ".npy"), mmap_mode="r",
+            )
+    except (OSError, ValueError, KeyError):
+        return None
+    return data
+
+
+def _save_entry(entry_dir: str, data: dict):
+    """
+    Saves a cache entry. The entry is written to a temporary directory which
+    is then renamed, so that concurrent processes never see a partial entry.
+    If another process saved the entry in the meantime, its entry is kept.
+    """
+    tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(entry_dir), suffix=".tmp")
+    try:
+        info = {
+            name: value for name, value in data.items()
+            if name not in _array_names
+        }
+        with open(os.path.join(tmp_dir, _info_file_name), "w") as f:
+            json.dump(info, f)
+        for name in _array_names:
+            np.save(os.path.join(tmp_dir, name + ".npy"), data[name])
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            if not os.path.isdir(entry_dir):
+                raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _read_file(normalization_file: str) -> dict:
+    """
+    Reads a normalization file saved by BeamformingNormalizer. The error
+    bounds, saved as arrays of tuples, are converted to plain float arrays
+    with the lower and upper bounds in the last dimension.
+    """
+    with np.load(normalization_file, allow_pickle=True) as data:
+        correction_factor_co = np.asarray(
+            data["correction_factor_co_channel"], dtype=float,
+        )
+        error_co = np.asarray(
+            data["error_co_channel"].tolist(), dtype=float,
+        ).reshape(correction_factor_co.shape + (2,))
+        return {
+            "resolution": data["resolution"].item(),
+            "phi_range": data["phi_range"].tolist(),
+            "theta_range": data["theta_range"].tolist(),
+            "correction_factor_co_channel": correction_factor_co,
+            "error_co_channel": error_co,
+            "correction_factor_adj_channel":
+                float(data["correction_factor_adj_channel"]),
+            "error_adj_channel": np.asarray(
+                data["error_adj_channel"], dtype=float,
+            ).tolist(),
+        }
+
+
+def _generate(
+    par: AntennaPar, resolution: float, workers: int, normalization_file: str,
+    key: str,
+) -> dict:
+    """
+    Generates the normalization of an antenna with BeamformingNormalizer.
+    Finished rows are checkpointed in the cache directory, so an interrupted
+    generation is resumed by the next simulation that needs it.
+    """
+    try:
+        checkpoint_dir = os.path.join(get_cache_dir("normalization"), key + ".rows")
+    except OSError:
+        checkpoint_dir = None
+
+    # imported here because the normalizer depends on the antenna classes
+    from sharc.antenna.beamforming_normalization.beamforming_normalizer import BeamformingNormalizer
+
+    sys.stderr.write(
+        f"Normalization file {normalization_file} not found. Generating "
+        f"the normalization of the {par.n_rows}x{par.n_columns} "
+        f"{par.element_pattern} array with {resolution} degrees resolution\n",
+    )
+    par = par._replace(normalization=False, normalization_data=None)
+    normalizer = BeamformingNormalizer(
+        resolution, 0, "GAUSS_LEGENDRE", default_num_points,
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, "normalization.npz")
+        normalizer.generate_correction_matrix(
+            par,
+            file_name,
+            testing=True,
+            workers=workers if workers is not None else _default_workers(),
+            checkpoint_dir=checkpoint_dir,
+        )
+        return _read_file(file_name)
+
+
+def _default_workers() -> int:
+    """
+    Returns the number of processes used to generate normalizations: one per
+    CPU, or only this one if it is already a worker of a process pool.
+    """
+    if multiprocessing.parent_process() is not None:
+        return 1
+    return os.cpu_count() or 1
@@ -22,6 +22,17 @@ Variables:
         calculated.
     tolerance (float): absolute tolerance of the correction factor integral, in
         linear scale.
+    method (str): integration method. "DBLQUAD" integrates each correction
+        factor adaptively up to the given tolerance. "GAUSS_LEGENDRE"
+        integrates over a fixed grid of num_points nodes, which is orders of
+        magnitude faster, and reports the error estimated against a grid with
+        half the nodes.
+    num_points (tuple): number of Gauss-Legendre nodes in phi and theta.
+    workers (int): number of processes over which the rows of the correction
+        factor matrix are spread.
+    checkpoint_dir (str): directory where finished rows are saved. If the
+        script is killed, running it again with the same parameters resumes
+        from the saved rows.
     norm (BeamformingNormalizer): object that calculates the normalization.
     param_list (list): list of antenna parameters to which calculate the
         correction factors. New parameters are added as:
@@ -121,13 +132,19 @@ if __name__ == "__main__":
     # General parameters
     resolution = 5
     tolerance = 1e-2
+    method = "DBLQUAD"
+    num_points = (360, 180)
+    workers = os.cpu_count()
 
     # Create object
-    norm = BeamformingNormalizer(resolution, tolerance)
+    norm = BeamformingNormalizer(resolution, tolerance, method, num_points)
     ###########################################################################
     # Normalize and save
     for par, file in zip(param_list, file_names):
         s = 'Generating ' + file
         print(s)
 
-        norm.generate_correction_matrix(par, file)
+        checkpoint_dir = os.path.splitext(file)[0] + "_rows"
+        norm.generate_correction_matrix(
+            par, file, workers=workers, checkpoint_dir=checkpoint_dir,
+        )
@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+"""
+Runs the simulations of many parameter files over one pool of long-lived
+worker processes.
+"""
+
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import json
+import os
+import time
+import traceback
+
+from sharc.model import Model
+from sharc.parameters.parameters import Parameters
+from sharc.snapshot_pool import build_simulation, run_snapshots
+from sharc.support.observable import Observable
+
+# Simulations of the worker process, by parameter file. Chunks of the oldest
+# unfinished group of parameter files are scheduled first, so each worker
+# only needs the simulations of the few groups that are running at a time.
+_simulations = OrderedDict()
+_max_groups = 2
+
+
+def _get_simulation(param_file: str, general_overrides: dict, group_size: int):
+    """
+    Returns the simulation of a parameter file in the worker process,
+    building it if the worker does not have it yet.
+    """
+    simulation = _simulations.pop(param_file, None)
+    if simulation is None:
+        while len(_simulations) >= _max_groups * group_size:
+            _simulations.popitem(last=False)
+        simulation = build_simulation(param_file, general_overrides)
+    _simulations[param_file] = simulation
+
+    return simulation
+
+
+def _run_campaign_snapshots(
+    param_files: list, general_overrides: dict, snapshots: list,
+) -> list:
+    """
+    Runs a chunk of snapshots of a group of parameter files in the worker
+    process. The parameter files of a group run each snapshot one after the
+    other, and those with the same topology parameters share the topology,
+    which is then calculated only once per snapshot.
+
+    Parameters
+    ----------
+    param_files : list
+        Simulation parameter files of the group
+    general_overrides : dict
+        General parameters that override the values in the parameter files
+    snapshots : list
+        List of (snapshot_number, seed) tuples
+
+    Returns
+    -------
+    list
+        One (samples, error) tuple per parameter file, where samples is the
+        list of (snapshot_number, samples, profile) tuples and error is the
+        traceback of the error raised by the simulation, or None
+    """
+    simulations = []
+    errors = []
+    for param_file in param_files:
+        try:
+            simulations.append(
+                _get_simulation(param_file, general_overrides, len(param_files)),
+            )
+            errors.append(None)
+        except Exception:
+            simulations.append(None)
+            errors.append(traceback.format_exc())
+
+    topologies = dict()
+    for simulation in simulations:
+        if simulation is None or len(simulations) == 1:
+            continue
+        key = repr(simulation.parameters.imt.topology)
+        if key not in topologies:
+            topologies[key] = simulation
+        elif simulation.topology is not topologies[key].topology:
+            simulation.share_topology(topologies[key])
+
+    samples = [[] for _ in param_files]
+    for snapshot in snapshots:
+        for i, simulation in enumerate(simulations):
+            if errors[i] is not None:
+                continue
+            try:
+                samples[i].extend(run_snapshots(simulation, [snapshot]))
+            except Exception:
+                errors[i] = traceback.format_exc()
+
+    return list(zip(samples, errors))
+
+
+class CampaignRun(object):
+    """
+    State of the simulation of one parameter file of a campaign.
+
+    Attributes
+    ----------
+        param_file (str): simulation parameter file
+        status (str): PENDING, RUNNING, FINISHED or FAILED
+        error (str): traceback of the error that made the run fail
+        num_snapshots (int): number of snapshots of the simulation
+        completed_snapshots (int): number of snapshots collected so far
+        elapsed_time (float): time from the start to the end of the run [s]
+    """
+
+    def __init__(self, param_file: str):
+        self.param_file = param_file
+        self.status = "PENDING"
+        self.error = None
+        self.num_snapshots = 0
+        self.completed_snapshots = 0
+        self.elapsed_time = 0.0
+
+        self.model = None
+        self.start_time = None
+        # finished chunks waiting for the previous ones, by first snapshot
+        self.chunks = dict()
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.param_file)
+
+    def to_dict(self) -> dict:
+        return {
+            "param_file": self.param_file,
+            "status": self.status,
+            "error": self.error,
+            "num_snapshots": self.num_snapshots,
+            "completed_snapshots": self.completed_snapshots,
+            "elapsed_time": self.elapsed_time,
+        }
+
+
+class _RunGroup(object):
+    """
+    Runs whose snapshots are sent to the workers together.
+    """
+
+    def __init__(self, runs: list):
+        self.runs = runs
+        # snapshots not yet sent to the workers
+        self.snapshots = deque()
+
+    def running(self) -> list:
+        return [run for run in self.runs if run.status == "RUNNING"]
+
+
+class CampaignScheduler(Observable):
+    """
+    Runs the simulations of many parameter files in a single pool of worker
+    processes, instead of starting a new interpreter for each file. Workers
+    keep their simulations between snapshots, so imports and parameter
+    parsing are paid once per worker and not once per snapshot or file.
+
+    Snapshots of all the files are balanced over the workers: the chunks of
+    the oldest unfinished file are sent first, and the next file is started
+    as soon as there are idle workers. Results are collected and written in
+    the main process in snapshot order, so each file produces the same
+    output files as if it were run alone.
+
+    If share_topology is True, files with the same topology parameters,
+    seed and number of snapshots (e.g. the variants of a parameter sweep) are
+    grouped. The files of a group run each snapshot together in the same
+    worker and calculate the topology of the snapshot only once.
+
+    A file whose simulation raises an error is marked as FAILED and the
+    campaign goes on with the other files.
+
+    Attributes
+    ----------
+        runs (list): CampaignRun of each parameter file
+        num_workers (int): number of worker processes
+        chunk_size (int): number of snapshots sent to a worker at a time
+        general_overrides (dict): general parameters that override the values
+            read from the parameter files
+        share_topology (bool): whether files with the same topology are run
+            together
+    """
+
+    def __init__(
+        self, param_files: list, num_workers=None, chunk_size=1,
+        general_overrides=None, share_topology=False,
+    ):
+        super().__init__()
+        self.runs = [CampaignRun(param_file) for param_file in param_files]
+        # one process per core: the main process only collects results
+        cpu_count = os.cpu_count() or 1
+        self.num_workers = max(1, min(num_workers or cpu_count, cpu_count))
+        self.chunk_size = chunk_size
+        self.general_overrides = dict(general_overrides or {})
+        self.share_topology = share_topology
+
+    def run(self) -> list:
+        """
+        Runs all the parameter files.
+
+        Returns
+        -------
+        list
+            CampaignRun of each parameter file, with its final status
+        """
+        waiting = deque(self._group_runs())
+        active = deque()
+        pending = dict()
+        max_pending = 2 * self.num_workers
+
+        executor = ProcessPoolExecutor(max_workers=self.num_workers)
+        try:
+            while True:
+                # keep every worker busy with up to two chunks
+                while len(pending) < max_pending:
+                    group = next((g for g in active if g.snapshots), None)
+                    if group is None:
+                        if not waiting:
+                            break
+                        group = waiting.popleft()
+                        if self._start_group(group):
+                            active.append(group)
+                        continue
+                    chunk = [
+                        group.snapshots.popleft()
+                        for _ in range(min(self.chunk_size, len(group.snapshots)))
+                    ]
+                    runs = group.running()
+                    future = executor.submit(
+                        _run_campaign_snapshots,
+                        [run.param_file for run in runs],
+                        self.general_overrides,
+                        chunk,
+                    )
+                    pending[future] = (group, runs, chunk[0][0])
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    group, runs, first_snapshot = pending.pop(future)
+                    try:
+                        outcomes = future.result()
+                    except Exception:
+                        error = traceback.format_exc()
+                        outcomes = [(None, error)] * len(runs)
+                    for run, (samples, error) in zip(runs, outcomes):
+                        if run.status != "RUNNING":
+                            continue
+                        if error is not None:
+                            self._fail(run, error)
+                            continue
+                        run.chunks[first_snapshot] = samples
+                        self._collect(run)
+                    if not group.running():
+                        group.snapshots.clear()
+                        if group in active:
+                            active.remove(group)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        self.notify_observers(source=__name__, message=self.summary())
+
+        return self.runs
+
+    def _group_runs(self) -> list:
+        """
+        Groups the runs that are sent to the workers together. Without
+        share_topology, each run is a group.
+        """
+        if not self.share_topology:
+            return [_RunGroup([run]) for run in self.runs]
+
+        groups = OrderedDict()
+        for run in self.runs:
+            key = run.param_file
+            try:
+                parameters = Parameters()
+                parameters.set_file_name(run.param_file)
+                parameters.read_params(use_cache=True)
+                key = (
+                    repr(parameters.imt.topology),
+                    parameters.general.seed,
+                    parameters.general.num_snapshots,
+                )
+            except Exception:
+                # the error is reported when the run is started
+                pass
+            groups.setdefault(key, []).append(run)
+
+        return [_RunGroup(runs) for runs in groups.values()]
+
+    def _start_group(self, group: _RunGroup) -> bool:
+        """
+        Starts the runs of a group and queues their snapshots. Returns False
+        if no run of the group is running.
+        """
+        for run in group.runs:
+            self._start(run)
+        runs = group.running()
+        if not runs:
+            return False
+
+        # runs of a group have the same seeds
+        group.snapshots.extend(
+            enumerate(runs[0].model.secondary_seeds, start=1),
+        )
+        return True
+
+    def _start(self, run: CampaignRun):
+        """
+        Initializes the simulation of a parameter file in the main process.
+        """
+        run.start_time = time.perf_counter()
+        run.status = "RUNNING"
+        self.notify_observers(
+            source=__name__, message="Starting " + run.param_file,
+        )
+        try:
+            run.model = Model()
+            run.model.param_file = run.param_file
+            for name, value in self.general_overrides.items():
+                run.model.general_overrides[name] = value
+            run.model.initialize()
+        except Exception:
+            self._fail(run, traceback.format_exc())
+            return
+
+        run.num_snapshots = run.model.parameters.general.num_snapshots
+        if not run.num_snapshots:
+            self._finish(run)
+
+    def _collect(self, run: CampaignRun):
+        """
+        Adds the finished chunks of a run to its results, in snapshot order,
+        and finalizes the run after its last snapshot.
+        """
+        while run.completed_snapshots + 1 in run.chunks:
+            chunk = run.chunks.pop(run.completed_snapshots + 1)
+            for snapshot_number, samples, profile in chunk:
+                run.model.add_snapshot_samples(snapshot_number, samples, profile)
+                run.completed_snapshots = snapshot_number
+                if not snapshot_number % 10:
+                    self.notify_observers(
+                        source=__name__,
+                        message=f"{run.name}: snapshot {snapshot_number} "
+                        f"of {run.num_snapshots}",
+                    )
+
+        if run.completed_snapshots == run.num_snapshots:
+            self._finish(run)
+
+    def _finish(self, run: CampaignRun):
+        try:
+            run.model.finalize()
+        except Exception:
+            self._fail(run, traceback.format_exc())
+            return
+        run.status = "FINISHED"
+        run.elapsed_time = time.perf_counter() - run.start_time
+        run.model = None
+        self.notify_observers(
+            source=__name__,
+            message=f"{run.name}: finished in {run.elapsed_time:.1f} s",
+        )
+
+    def _fail(self, run: CampaignRun, error: str):
+        run.status = "FAILED"
+        run.error = error
+        run.elapsed_time = time.perf_counter() - run.start_time
+        run.model = None
+        run.chunks.clear()
+        self.notify_observers(
+            source=__name__, message=f"{run.name}: FAILED\n{error}",
+        )
+
+    def summary(self) -> str:
+        """
+        Returns a table with the status of each parameter file.
+        """
+        lines = [f"{'status':<10}{'snapshots':>12}{'time [s]':>10}  file"]
+        for run in self.runs:
+            lines.append(
+                f"{run.status:<10}"
+                f"{f'{run.completed_snapshots}/{run.num_snapshots}':>12}"
+                f"{run.elapsed_time:>10.1f}  {run.param_file}",
+            )
+        return "\n".join(lines)
+
+    def write_status(self, file_name: str):
+        """
+        Writes the status of each parameter file in JSON format.
+        """
+        with open(file_name, "w") as f:
+            json.dump([run.to_dict() for run in self.runs], f, indent=2)
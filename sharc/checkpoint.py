@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Checkpoints of the simulation state, used to resume interrupted simulations.
+"""
+
+import glob
+import hashlib
+import os
+import pickle
+import tempfile
+
+from sharc.sample_summary import SampleSummary
+
+
+class Checkpoint(object):
+    """
+    State of a simulation right after its samples were written to file.
+
+    Snapshots only depend on their seeds, so a simulation is resumed by
+    running the snapshots after snapshot_number with the saved seeds. Samples
+    written to file after the checkpoint are discarded by truncating each
+    sample file to its saved size, so the final results are the same as the
+    results of an uninterrupted simulation.
+
+    Attributes
+    ----------
+        param_file_hash (str): hash of the parameter file of the simulation
+        snapshot_number (int): number of snapshots run
+        seeds (list): seed of each snapshot of the simulation
+        output_directory (str): output directory of the simulation
+        sample_file_sizes (dict): size [bytes] of each sample file
+        overwrite_sample_files (bool): whether the next write overwrites the
+            sample files (i.e. nothing was written yet)
+        summaries (dict): state of the streaming statistics of each sample
+            attribute, as returned by SampleSummary.to_dict
+        profile (dict): snapshot profile, as returned by StageProfiler.to_dict
+    """
+
+    file_name = "checkpoint.pickle"
+    version = 1
+
+    def __init__(
+        self,
+        param_file_hash: str,
+        snapshot_number: int,
+        seeds: list,
+        output_directory: str,
+        sample_file_sizes: dict,
+        overwrite_sample_files: bool,
+        summaries: dict,
+        profile: dict,
+    ):
+        self.version = Checkpoint.version
+        self.param_file_hash = param_file_hash
+        self.snapshot_number = snapshot_number
+        self.seeds = list(seeds)
+        self.output_directory = str(output_directory)
+        self.sample_file_sizes = dict(sample_file_sizes)
+        self.overwrite_sample_files = overwrite_sample_files
+        self.summaries = dict(summaries)
+        self.profile = profile
+
+    @staticmethod
+    def hash_param_file(param_file: str) -> str:
+        """
+        Returns the hash of the contents of a parameter file.
+        """
+        with open(param_file, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    @staticmethod
+    def from_simulation(
+        param_file: str, snapshot_number: int, seeds: list, simulation,
+    ) -> "Checkpoint":
+        """
+        Captures the state of a simulation whose samples were just written
+        to file.
+
+        Parameters
+        ----------
+        param_file : str
+            Parameter file of the simulation
+        snapshot_number : int
+            Number of snapshots run
+        seeds : list
+            Seed of each snapshot of the simulation
+        simulation : Simulation
+            Simulation that writes the results
+        """
+        results = simulation.results
+        sample_file_sizes = {
+            attr_name: os.path.getsize(file_path)
+            for attr_name, file_path in results.get_sample_files().items()
+            if os.path.exists(file_path)
+        }
+        profiler = simulation.profiler
+
+        return Checkpoint(
+            Checkpoint.hash_param_file(param_file),
+            snapshot_number,
+            seeds,
+            results.output_directory,
+            sample_file_sizes,
+            results.overwrite_sample_files,
+            {
+                attr_name: summary.to_dict()
+                for attr_name, summary in results.summaries.items()
+            },
+            profiler.to_dict() if profiler.enabled else None,
+        )
+
+    def restore(self, simulation):
+        """
+        Restores the results of a simulation initialized with the checkpoint
+        output directory to the state they had at the checkpoint.
+        """
+        results = simulation.results
+        for attr_name, file_path in results.get_sample_files().items():
+            if attr_name in self.sample_file_sizes:
+                results.store.truncate(
+                    file_path, self.sample_file_sizes[attr_name],
+                )
+            elif os.path.exists(file_path):
+                # written after the checkpoint
+                os.remove(file_path)
+        results.overwrite_sample_files = self.overwrite_sample_files
+        results.summaries = {
+            attr_name: SampleSummary.from_dict(state)
+            for attr_name, state in self.summaries.items()
+        }
+        if self.profile is not None and simulation.profiler.enabled:
+            simulation.profiler.merge(self.profile)
+
+    def save(self):
+        """
+        Saves the checkpoint to the output directory. The file is written to
+        a temporary file first, so that an interruption never leaves a
+        partial checkpoint behind: the previous checkpoint stays valid.
+        """
+        file_name = os.path.join(self.output_directory, self.file_name)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.output_directory, suffix=".tmp",
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, file_name)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+
+    @staticmethod
+    def remove(output_directory: str):
+        """
+        Removes the checkpoint of a finished simulation.
+        """
+        file_name = os.path.join(output_directory, Checkpoint.file_name)
+        if os.path.exists(file_name):
+            os.remove(file_name)
+
+    @staticmethod
+    def load(file_name: str):
+        """
+        Loads a checkpoint saved by save. Returns None if the file is not a
+        valid checkpoint.
+        """
+        try:
+            with open(file_name, "rb") as f:
+                checkpoint = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if not isinstance(checkpoint, Checkpoint) or \
+                getattr(checkpoint, "version", None) != Checkpoint.version:
+            return None
+        return checkpoint
+
+    @staticmethod
+    def find(param_file: str, output_parent: str):
+        """
+        Finds the most recent checkpoint of a parameter file, either in the
+        output directory parent itself (overwrite_output) or in one of its
+        output directories.
+
+        Parameters
+        ----------
+        param_file : str
+            Parameter file of the simulation
+        output_parent : str
+            Directory where the output directories are created
+
+        Returns
+        -------
+        Checkpoint
+            Most recent checkpoint saved for the same parameter file contents,
+            or None if there is none
+        """
+        param_file_hash = Checkpoint.hash_param_file(param_file)
+        file_names = glob.glob(
+            os.path.join(glob.escape(str(output_parent)), Checkpoint.file_name),
+        ) + glob.glob(
+            os.path.join(
+                glob.escape(str(output_parent)), "*", Checkpoint.file_name,
+            ),
+        )
+        for file_name in sorted(file_names, key=os.path.getmtime, reverse=True):
+            checkpoint = Checkpoint.load(file_name)
+            if checkpoint is not None and \
+                    checkpoint.param_file_hash == param_file_hash and \
+                    os.path.samefile(
+                        checkpoint.output_directory, os.path.dirname(file_name),
+                    ):
+                return checkpoint
+        return None
@@ -20,23 +20,44 @@ from sharc.model import Model
 def main(argv):
     print("Welcome to SHARC!\n")
 
-    param_file = ''
+    param_file = os.path.join(os.getcwd(), "input", "parameters.yaml")
+    num_workers = 1
+    profile_snapshots = False
+    profile_allocations = False
+    checkpoint_interval = None
+    resume = False
+    usage = "usage: main_cli.py -p <param_file> [--workers <N>] " \
+        "[--profile] [--profile-allocations] " \
+        "[--checkpoint-interval <N>] [--resume]"
 
     try:
-        opts, args = getopt.getopt(argv, "hp:")
+        opts, args = getopt.getopt(
+            argv, "hp:", [
+                "workers=", "profile", "profile-allocations",
+                "checkpoint-interval=", "resume",
+            ],
+        )
     except getopt.GetoptError:
-        print("usage: main_cli.py -p <param_file>")
+        print(usage)
         sys.exit(2)
 
-    if not opts:
-        param_file = os.path.join(os.getcwd(), "input", "parameters.yaml")
-    else:
-        for opt, arg in opts:
-            if opt == "-h":
-                print("usage: main_cli.py -p <param_file>")
-                sys.exit()
-            elif opt == "-p":
-                param_file = param_file = os.path.join(os.getcwd(), arg)
+    for opt, arg in opts:
+        if opt == "-h":
+            print(usage)
+            sys.exit()
+        elif opt == "-p":
+            param_file = os.path.join(os.getcwd(), arg)
+        elif opt == "--workers":
+            num_workers = int(arg)
+        elif opt == "--profile":
+            profile_snapshots = True
+        elif opt == "--profile-allocations":
+            profile_snapshots = True
+            profile_allocations = True
+        elif opt == "--checkpoint-interval":
+            checkpoint_interval = int(arg)
+        elif opt == "--resume":
+            resume = True
 
     Logging.setup_logging()
 
@@ -46,6 +67,12 @@ def main(argv):
 
     view_cli.set_controller(controller)
     controller.set_model(model)
+    model.set_num_workers(num_workers)
+    if profile_snapshots:
+        model.set_profiling(profile_snapshots, profile_allocations)
+    if checkpoint_interval is not None:
+        model.set_checkpoint_interval(checkpoint_interval)
+    model.set_resume(resume)
     model.add_observer(view_cli)
 
     view_cli.initialize(param_file)
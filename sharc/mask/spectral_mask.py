@@ -10,15 +10,71 @@ import numpy as np
 
 
 class SpectralMask(ABC):
+    """
+    Spectral emission mask of a transmitter.
+
+    Masks depend only on the transmit power, so the mask of each transmit
+    power is calculated once and reused, and so is the out-of-band power of
+    each (transmit power, victim center frequency, victim bandwidth), which
+    is the same for all the stations that share the mask.
+
+    Attributes:
+        mask_dbm (np.array): emission level of each mask section [dBm/MHz]
+        freq_lim (np.array): frequency values for which the spectral mask
+            changes emission value [MHz]
+        p_tx (float): in-band transmit power density [dBm/MHz]
+    """
+
+    # Maximum number of out-of-band powers kept in memory per mask
+    max_cached_powers = 1024
 
     def __init__(self) -> None:
         self.mask_dbm = None
         self.freq_lim = None
         self.p_tx = None
 
+        # (p_tx, mask_dbm) of each transmit power given to set_mask
+        self._masks = dict()
+        # out-of-band power of each (transmit power, center_f, band)
+        self._oob_power = dict()
+        self._mask_key = None
+
     @abstractmethod
+    def calculate_mask(self, p_tx: float) -> np.array:
+        """
+        Calculates the mask emission levels for a transmit power and sets
+        the in-band transmit power density (p_tx attribute).
+
+        Parameters:
+            p_tx (float): station transmit power
+
+        Returns:
+            mask_dbm (np.array): emission level of each mask section
+        """
+
     def set_mask(self, p_tx=0):
-        pass
+        """
+        Sets the spectral mask (mask_dbm and p_tx attributes) for a transmit
+        power.
+
+        Parameters:
+            p_tx (float): station transmit power. Default = 0
+        """
+        self.p_tx, self.mask_dbm = self._get_mask(p_tx)
+        self._mask_key = p_tx
+
+    def _get_mask(self, p_tx: float) -> tuple:
+        """
+        Returns the (p_tx, mask_dbm) of a transmit power, calculating them
+        only the first time.
+        """
+        if p_tx not in self._masks:
+            p_tx_current = self.p_tx
+            mask_dbm = np.array(self.calculate_mask(p_tx), dtype=float)
+            mask_dbm.setflags(write=False)
+            self._masks[p_tx] = (self.p_tx, mask_dbm)
+            self.p_tx = p_tx_current
+        return self._masks[p_tx]
 
     def power_calc(self, center_f: float, band: float):
         """
@@ -32,57 +88,67 @@ class SpectralMask(ABC):
             band (float): bandwidth of band in which out-of-band power is to
                 be calculated
         """
-        # Limit delta f: edges of band
-        df_min = center_f - band / 2
-        df_max = center_f + band / 2
-
-        # Power in mW
-        power_oob = 0  # Out-of-band power
-
-        # Included delta f values: values of spectral mask delta f break limist
-        # which are contained within the band
-        inc_df = np.where(
-            np.logical_and(
-                self.freq_lim > df_min,
-                self.freq_lim < df_max,
-            ),
-        )[0]
-
-        # If no break limits are within band: the band does not need to be
-        # divided into rectangles
-        if len(inc_df) == 0:
-
-            # Define what is the power emission level at that frequency
-            msk = self.mask_dbm[np.where(self.freq_lim >= df_max)]
-            # If df_max is below smallest break limit
-            if len(msk) == 0:
-                msk = np.array([self.mask_dbm[-1]])
-            # Turn it into scalar
-            pwr_lvl = msk[0]
-
-            if pwr_lvl != self.p_tx:
-                power_oob += band * np.power(10, (pwr_lvl / 10))
-        # If one or more break limitas are within band
-        else:
-
-            # Lower and upper power emission levels
-            pwr_lvl_1 = self.mask_dbm[inc_df[0]]
-            pwr_lvl_2 = self.mask_dbm[inc_df[-1] + 1]
-
-            # Upper and lower rectangles
-            if pwr_lvl_1 != self.p_tx:
-                power_oob += (self.freq_lim[inc_df[0]] - df_min) *\
-                    np.power(10, (pwr_lvl_1 / 10))
-            if pwr_lvl_2 != self.p_tx:
-                power_oob += (df_max - self.freq_lim[inc_df[-1]]) *\
-                    np.power(10, (pwr_lvl_2 / 10))
-
-            # Middle rectangles
-            for df in inc_df[0:-1]:
-                pwr_lvl = self.mask_dbm[df + 1]
-
-                if pwr_lvl != self.p_tx:
-                    power_oob += (self.freq_lim[df + 1] - self.freq_lim[df]) *\
-                        np.power(10, (pwr_lvl / 10))
-
-        return 10 * np.log10(power_oob)
+        key = (self._mask_key, center_f, band)
+        if key not in self._oob_power:
+            if len(self._oob_power) >= self.max_cached_powers:
+                self._oob_power.clear()
+            self._oob_power[key] = self._integrate(
+                self.p_tx, self.mask_dbm, center_f, band,
+            )
+        return self._oob_power[key]
+
+    def power_calc_many(self, center_f, band, p_tx=None) -> np.array:
+        """
+        Calculates the out-of-band power in many bands at once, e.g. for
+        adjacent channel sweeps.
+
+        Parameters:
+            center_f (np.array): center frequency of each band in which
+                out-of-band power is to be calculated
+            band (np.array): bandwidth of each band
+            p_tx (np.array): station transmit power of each band. If None, the
+                mask set by set_mask is used
+
+        Returns:
+            power_oob (np.array): out-of-band power in each band, with the
+                broadcast shape of the inputs
+        """
+        if p_tx is None:
+            return self._integrate(self.p_tx, self.mask_dbm, center_f, band)
+
+        center_f, band, p_tx = np.broadcast_arrays(
+            np.asarray(center_f, dtype=float),
+            np.asarray(band, dtype=float),
+            np.asarray(p_tx, dtype=float),
+        )
+        power_oob = np.empty(center_f.shape)
+        for value in np.unique(p_tx):
+            idx = p_tx == value
+            p_tx_density, mask_dbm = self._get_mask(value.item())
+            power_oob[idx] = self._integrate(
+                p_tx_density, mask_dbm, center_f[idx], band[idx],
+            )
+        return power_oob
+
+    def _integrate(self, p_tx: float, mask_dbm: np.array, center_f, band):
+        """
+        Adds up the power of the mask sections in the bands, excluding the
+        sections at the in-band transmit power density.
+        """
+        center_f = np.asarray(center_f, dtype=float)[..., np.newaxis]
+        band = np.asarray(band, dtype=float)[..., np.newaxis]
+
+        # Mask section limits: the outermost sections are unbounded
+        lower = np.concatenate(([-np.inf], self.freq_lim))
+        upper = np.concatenate((self.freq_lim, [np.inf]))
+
+        # Width of the intersection of each band with each section
+        width = np.clip(
+            np.minimum(upper, center_f + band / 2) -
+            np.maximum(lower, center_f - band / 2),
+            0, None,
+        )
+        # Power density in mW/MHz
+        density = np.where(mask_dbm != p_tx, np.power(10, mask_dbm / 10), 0)
+
+        return 10 * np.log10(width @ density)
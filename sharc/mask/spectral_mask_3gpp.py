@@ -34,6 +34,8 @@ class SpectralMask3Gpp(SpectralMask):
             Cat-A: -13 dBm/MHz
             Cat-B: -30 dBm/MHz
         """
+        super().__init__()
+
         if sta_type is not StationType.IMT_BS and sta_type is not StationType.IMT_UE:
             message = "ERROR\nInvalid station type: " + str(sta_type)
             sys.stderr.write(message)
@@ -78,15 +80,15 @@ class SpectralMask3Gpp(SpectralMask):
             delta_f_lim = np.array([0, 1, 5])
             if bandwidth == 5:
                 delta_f_lim = np.append(delta_f_lim, np.array([6, 10]))
-            if bandwidth == 10:
+            elif bandwidth == 10:
                 delta_f_lim = np.append(delta_f_lim, np.array([10, 15]))
-            if bandwidth == 15:
+            elif bandwidth == 15:
                 delta_f_lim = np.append(delta_f_lim, np.array([15, 20]))
             else:
                 delta_f_lim = np.append(delta_f_lim, np.array([20, 25]))
         return delta_f_lim
 
-    def set_mask(self, p_tx=0):
+    def calculate_mask(self, p_tx: float) -> np.array:
         emission_limits = self.get_emission_limits(
             self.sta_type,
             self.band_mhz,
@@ -95,7 +97,7 @@ class SpectralMask3Gpp(SpectralMask):
         self.p_tx = p_tx - 10 * np.log10(self.band_mhz)
         # emission_limits = np.flip(emission_limits, 0)
         emission_limits_flipped = emission_limits[::-1]
-        self.mask_dbm = np.concatenate((
+        return np.concatenate((
             emission_limits_flipped,
             np.array([self.p_tx]),
             emission_limits,
@@ -62,6 +62,8 @@ class SpectralMaskImt(SpectralMask):
             spurious_emissions (float): level of spurious emissions [dBm/MHz].
             scenario (str): INDOOR or OUTDOOR scenario
         """
+        super().__init__()
+
         # Spurious domain limits [dBm/MHz]
         self.spurious_emissions = spurious_emissions
 
@@ -91,17 +93,19 @@ class SpectralMaskImt(SpectralMask):
             (freq_mhz + band_mhz / 2) + self.delta_f_lim,
         ))
 
-    def set_mask(self, p_tx=0):
+    def calculate_mask(self, p_tx: float) -> np.array:
         """
-        Sets the spectral mask (mask_dbm attribute) based on station type,
-        operating frequency and transmit power.
+        Calculates the spectral mask based on station type, operating
+        frequency and transmit power.
 
         Parameters:
-            p_tx (float): station transmit power. Default = 0
+            p_tx (float): station transmit power
+
+        Returns:
+            mask_dbm (np.array): emission level of each mask section
         """
         if self.alternative_mask_used:
-            self.mask_dbm = self.get_alternative_mask_mask_dbm(p_tx)
-            return
+            return self.get_alternative_mask_mask_dbm(p_tx)
 
         self.p_tx = p_tx - 10 * np.log10(self.band_mhz)
 
@@ -156,7 +160,7 @@ class SpectralMaskImt(SpectralMask):
                     You may have set spurious emission to a value not in [-13,-30]",
                 )
 
-        self.mask_dbm = np.concatenate((
+        return np.concatenate((
             mask_dbm[::-1], np.array([self.p_tx]),
             mask_dbm,
         ))
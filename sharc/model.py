@@ -11,6 +11,9 @@ from sharc.support.enumerations import State
 from sharc.simulation_downlink import SimulationDownlink
 from sharc.simulation_uplink import SimulationUplink
 from sharc.parameters.parameters import Parameters
+from sharc.snapshot_pool import SnapshotPool
+from sharc.checkpoint import Checkpoint
+from sharc.results import Results
 
 import random
 
@@ -26,6 +29,11 @@ class Model(Observable):
         self.simulation = None
         self.parameters = None
         self.param_file = None
+        self.num_workers = 1
+        # general parameters that override the values in the parameter file
+        self.general_overrides = dict()
+        self.resume = False
+        self.last_checkpoint = 0
 
     def add_observer(self, observer: Observer):
         Observable.add_observer(self, observer)
@@ -37,6 +45,35 @@ class Model(Observable):
             message="Loading file:\n" + self.param_file,
         )
 
+    def set_num_workers(self, num_workers: int):
+        """
+        Sets the number of worker processes used to run the snapshots. If it
+        is greater than one, snapshots are run by parallel_snapshots.
+        """
+        self.num_workers = num_workers
+
+    def set_profiling(self, profile_snapshots: bool, profile_allocations=False):
+        """
+        Enables the stage profiler of the snapshots, overriding the
+        profile_snapshots and profile_allocations general parameters.
+        """
+        self.general_overrides["profile_snapshots"] = profile_snapshots
+        self.general_overrides["profile_allocations"] = profile_allocations
+
+    def set_checkpoint_interval(self, checkpoint_interval: int):
+        """
+        Sets the minimum number of snapshots between checkpoints, overriding
+        the checkpoint_interval general parameter.
+        """
+        self.general_overrides["checkpoint_interval"] = checkpoint_interval
+
+    def set_resume(self, resume: bool):
+        """
+        If resume is True, initialize continues the simulation from the last
+        checkpoint saved for the parameter file, if there is one.
+        """
+        self.resume = resume
+
     def initialize(self):
         """
         Initializes the simulation and performs all pre-simulation tasks, such
@@ -44,7 +81,9 @@ class Model(Observable):
         """
         self.parameters = Parameters()
         self.parameters.set_file_name(self.param_file)
-        self.parameters.read_params()
+        self.parameters.read_params(use_cache=True)
+        for name, value in self.general_overrides.items():
+            setattr(self.parameters.general, name, value)
 
         if self.parameters.general.imt_link == "DOWNLINK":
             self.simulation = SimulationDownlink(
@@ -56,6 +95,18 @@ class Model(Observable):
             )
         self.simulation.add_observer_list(self.observers)
 
+        checkpoint = None
+        if self.resume:
+            checkpoint = Checkpoint.find(
+                self.param_file,
+                Results.get_output_parent(self.parameters.general.output_dir),
+            )
+            if checkpoint is None:
+                self.notify_observers(
+                    source=__name__,
+                    message="No checkpoint found. Starting a new simulation",
+                )
+
         description = self.get_description()
 
         self.notify_observers(
@@ -65,7 +116,13 @@ class Model(Observable):
         )
         self.current_snapshot = 0
 
-        self.simulation.initialize()
+        if checkpoint is None:
+            self.simulation.initialize()
+        else:
+            self.simulation.initialize(
+                output_directory=checkpoint.output_directory,
+            )
+            checkpoint.restore(self.simulation)
 
         random.seed(self.parameters.general.seed)
 
@@ -76,6 +133,16 @@ class Model(Observable):
         for index in range(self.parameters.general.num_snapshots):
             self.secondary_seeds[index] = random.randint(1, max_seed)
 
+        if checkpoint is not None:
+            self.secondary_seeds = checkpoint.seeds
+            self.current_snapshot = checkpoint.snapshot_number
+            self.notify_observers(
+                source=__name__,
+                message="Resuming from snapshot #" + str(self.current_snapshot) +
+                " in " + checkpoint.output_directory,
+            )
+        self.last_checkpoint = self.current_snapshot
+
     def get_description(self) -> str:
         param_system = self.simulation.param_system
 
@@ -115,6 +182,82 @@ class Model(Observable):
             snapshot_number=self.current_snapshot,
             seed=self.secondary_seeds[self.current_snapshot - 1],
         )
+        if write_to_file:
+            self.save_checkpoint()
+
+    def parallel_snapshots(self, is_stopped=lambda: False):
+        """
+        Performs all the remaining simulation steps over a pool of worker
+        processes and collects the results in snapshot order. Results are
+        written to file at the same snapshots as in a serial run, so that the
+        output files are identical.
+
+        Parameters
+        ----------
+            is_stopped: function that returns True when the simulation has
+                to be stopped
+        """
+        pool = SnapshotPool(
+            self.param_file, self.num_workers,
+            general_overrides=self.general_overrides,
+        )
+        snapshots = pool.run(
+            self.secondary_seeds[self.current_snapshot:],
+            first_snapshot=self.current_snapshot + 1,
+        )
+        for snapshot_number, samples, profile in snapshots:
+            if is_stopped():
+                break
+            self.add_snapshot_samples(snapshot_number, samples, profile)
+        snapshots.close()
+
+    def add_snapshot_samples(self, snapshot_number: int, samples: dict, profile=None):
+        """
+        Collects the samples of a snapshot run in another process. Snapshots
+        must be added in order.
+
+        Parameters
+        ----------
+            snapshot_number: number of the snapshot
+            samples: dict returned by Results.take_samples after the snapshot
+            profile: dict returned by StageProfiler.take_stats, or None if
+                profiling is disabled
+        """
+        results = self.simulation.results
+        self.current_snapshot = snapshot_number
+        results.add_samples(samples)
+        if profile is not None:
+            self.simulation.profiler.merge(profile)
+
+        if not self.current_snapshot % 10:
+            self.notify_observers(
+                source=__name__,
+                message="Snapshot #" + str(self.current_snapshot),
+            )
+            results.write_files(self.current_snapshot)
+            self.simulation.notify_observers(
+                source=self.simulation.__module__,
+                results=results,
+            )
+            self.save_checkpoint()
+
+    def save_checkpoint(self):
+        """
+        Saves a checkpoint of the simulation if checkpoints are enabled and
+        at least checkpoint_interval snapshots were run since the last one.
+        It must be called right after the samples are written to file, so
+        that the checkpoint is consistent with the sample files.
+        """
+        interval = self.parameters.general.checkpoint_interval
+        if not interval or self.current_snapshot - self.last_checkpoint < interval:
+            return
+        Checkpoint.from_simulation(
+            self.param_file,
+            self.current_snapshot,
+            self.secondary_seeds,
+            self.simulation,
+        ).save()
+        self.last_checkpoint = self.current_snapshot
 
     def is_finished(self) -> bool:
         """
@@ -135,6 +278,9 @@ class Model(Observable):
         Finalizes the simulation and performs all post-simulation tasks
         """
         self.simulation.finalize(snapshot_number=self.current_snapshot)
+        if self.is_finished():
+            # the checkpoint is not needed once the simulation is complete
+            Checkpoint.remove(self.simulation.results.output_directory)
         self.notify_observers(
             source=__name__,
             message="FINISHED!", state=State.FINISHED,
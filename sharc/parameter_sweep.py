@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Expands a base parameter file into the variants of a parameter sweep and
+runs them.
+
+A sweep is defined in a YAML file such as
+
+    sweep:
+        # parameter file with the values that are not swept, relative to the
+        # sweep file
+        base_file: parameters_base.yaml
+        # GRID runs every combination of the axis values. LIST runs the i-th
+        # value of every axis together, so all axes must have the same length
+        mode: GRID
+        # directory where the output directories of the variants are created
+        # (relative to the sharc directory, as general.output_dir). Defaults
+        # to the general.output_dir of the base file
+        output_dir: campaigns/my_campaign/output
+        axes:
+            general.imt_link: [DOWNLINK, UPLINK]
+            imt.bs.antenna.n_rows: [4, 8]
+
+Each variant is written to a parameter file and its results to an output
+directory named output_<variant>_<date>_<id>, so the results of a sweep can
+be loaded with Results.load_many_from_dir.
+"""
+
+import itertools
+import os
+import re
+
+import yaml
+
+from sharc.campaign_scheduler import CampaignScheduler
+from sharc.parameters.parameters_base import read_config_file
+from sharc.results import Results
+
+
+class _SweepDumper(yaml.SafeDumper):
+    """
+    Writes tuples with the tag read by the parameter files loader.
+    """
+
+
+_SweepDumper.add_representer(
+    tuple,
+    lambda dumper, data: dumper.represent_sequence(
+        "tag:yaml.org,2002:python/tuple", data,
+    ),
+)
+
+
+class ParameterSweep(object):
+    """
+    Variants of a base parameter file.
+
+    Attributes
+    ----------
+        base_file (str): parameter file with the values that are not swept
+        axes (dict): values of each swept parameter, by dotted parameter
+            path (e.g. "imt.bs.antenna.n_rows")
+        mode (str): GRID or LIST
+        output_dir (str): directory where the output directories of the
+            variants are created
+    """
+
+    modes = ["GRID", "LIST"]
+
+    def __init__(self, base_file: str, axes: dict, mode="GRID", output_dir=None):
+        self.base_file = base_file
+        self.axes = dict(axes)
+        self.mode = mode.upper()
+        self.base_config = read_config_file(base_file)
+        self.output_dir = output_dir
+        if self.output_dir is None:
+            self.output_dir = self.base_config.get("general", {}).get(
+                "output_dir", "output",
+            )
+
+        self.validate()
+
+    @staticmethod
+    def from_file(sweep_file: str) -> "ParameterSweep":
+        """
+        Reads a sweep definition file.
+
+        Parameters
+        ----------
+        sweep_file : str
+            YAML file with a sweep section
+
+        Returns
+        -------
+        ParameterSweep
+            The sweep defined in the file
+        """
+        config = read_config_file(sweep_file)
+        if "sweep" not in config:
+            raise ValueError(f"ParameterSweep: no sweep section in {sweep_file}")
+        sweep = config["sweep"]
+        for name in ["base_file", "axes"]:
+            if name not in sweep:
+                raise ValueError(
+                    f"ParameterSweep: sweep.{name} is missing in {sweep_file}",
+                )
+
+        return ParameterSweep(
+            os.path.join(os.path.dirname(os.path.abspath(sweep_file)), sweep["base_file"]),
+            sweep["axes"],
+            sweep.get("mode", "GRID"),
+            sweep.get("output_dir"),
+        )
+
+    def validate(self):
+        if self.mode not in self.modes:
+            raise ValueError(
+                f"ParameterSweep: invalid mode {self.mode}. "
+                f"Possible values are {', '.join(self.modes)}",
+            )
+        if not self.axes:
+            raise ValueError("ParameterSweep: no axes to sweep")
+        for path, values in self.axes.items():
+            if not isinstance(values, (list, tuple)) or len(values) == 0:
+                raise ValueError(
+                    f"ParameterSweep: axis {path} must be a non-empty list of values",
+                )
+            # the section of the parameter must exist in the base file, which
+            # catches misspelled parameter paths
+            config = self.base_config
+            for key in path.split(".")[:-1]:
+                if not isinstance(config, dict) or key not in config:
+                    raise ValueError(
+                        f"ParameterSweep: {path} is not a parameter of {self.base_file}",
+                    )
+                config = config[key]
+        if self.mode == "LIST" and len({len(v) for v in self.axes.values()}) > 1:
+            raise ValueError(
+                "ParameterSweep: all axes of a LIST sweep must have the same length",
+            )
+
+    def get_variants(self) -> list:
+        """
+        Returns the swept values of each variant.
+
+        Returns
+        -------
+        list
+            List of (name, values) tuples, where values is a dict mapping the
+            parameter paths to the values of the variant
+        """
+        paths = list(self.axes.keys())
+        if self.mode == "GRID":
+            combinations = itertools.product(*self.axes.values())
+        else:
+            combinations = zip(*self.axes.values())
+
+        variants = []
+        for combination in combinations:
+            values = dict(zip(paths, combination))
+            name = "_".join(
+                f"{path.split('.')[-1]}_{value}" for path, value in values.items()
+            )
+            variants.append((re.sub(r"[^A-Za-z0-9.\-]+", "_", name), values))
+
+        return variants
+
+    def get_variant_config(self, name: str, values: dict) -> dict:
+        """
+        Returns the parameters of a variant: the base parameters with the
+        swept values, written to an output directory named after the variant.
+        """
+        config = read_config_file(self.base_file)
+        for path, value in values.items():
+            keys = path.split(".")
+            section = config
+            for key in keys[:-1]:
+                section = section[key]
+            section[keys[-1]] = value
+
+        general = config.setdefault("general", {})
+        general["output_dir"] = self.output_dir
+        general["output_dir_prefix"] = "output_" + name
+        general["overwrite_output"] = False
+
+        return config
+
+    def write_variants(self, directory: str) -> list:
+        """
+        Writes the parameter file of each variant.
+
+        Parameters
+        ----------
+        directory : str
+            Directory where the parameter files are written
+
+        Returns
+        -------
+        list
+            Path of the parameter file of each variant
+        """
+        os.makedirs(directory, exist_ok=True)
+        param_files = []
+        for name, values in self.get_variants():
+            param_file = os.path.join(directory, f"parameters_{name}.yaml")
+            with open(param_file, "w") as f:
+                yaml.dump(
+                    self.get_variant_config(name, values), f,
+                    Dumper=_SweepDumper, sort_keys=False,
+                )
+            param_files.append(param_file)
+
+        return param_files
+
+    def run(self, num_workers=None, observers=(), general_overrides=None) -> list:
+        """
+        Runs all the variants. The parameter files of the variants are
+        written to the sweep_variants subdirectory of the output directory.
+
+        Variants run in long-lived worker processes, so data loaded by the
+        first variant (parameter files, beamforming normalization, atmospheric
+        loss tables) is reused by the others. Variants with the same topology
+        run each snapshot together and calculate the topology only once.
+
+        Parameters
+        ----------
+        num_workers : int, optional
+            Number of worker processes, by default one per core
+        observers : list, optional
+            Observers notified of the progress of the sweep
+        general_overrides : dict, optional
+            General parameters that override the values of all the variants
+
+        Returns
+        -------
+        list
+            CampaignRun of each variant, with its final status
+        """
+        output_parent = Results.get_output_parent(self.output_dir)
+        param_files = self.write_variants(
+            os.path.join(output_parent, "sweep_variants"),
+        )
+        scheduler = CampaignScheduler(
+            param_files, num_workers,
+            general_overrides=general_overrides,
+            share_topology=True,
+        )
+        for observer in observers:
+            scheduler.add_observer(observer)
+        runs = scheduler.run()
+        scheduler.write_status(os.path.join(output_parent, "sweep_status.json"))
+
+        return runs
@@ -6,7 +6,7 @@ Created on Sat Apr 15 16:29:36 2017
 """
 
 from sharc.support.named_tuples import AntennaPar
-from numpy import load
+from sharc.antenna.beamforming_normalization.normalization_cache import get_normalization_data
 import typing
 
 from dataclasses import dataclass
@@ -90,14 +90,7 @@ class ParametersAntennaImt(ParametersBase):
             )
 
     def get_antenna_parameters(self) -> AntennaPar:
-        if self.normalization:
-            # Load data, save it in dict and close it
-            data = load(self.normalization_file, allow_pickle=True) #Diego
-            data_dict = {key: data[key] for key in data}
-            self.normalization_data = data_dict
-            data.close()
-        else:
-            self.normalization_data = None
+        self.normalization_data = None
         tpl = AntennaPar(
             self.adjacent_antenna_model,
             self.normalization,
@@ -116,5 +109,12 @@ class ParametersAntennaImt(ParametersBase):
             self.minimum_array_gain,
             self.downtilt,
         )
+        if self.normalization:
+            # Memory-mapped data shared by all antennas with this normalization.
+            # It is generated if the normalization file does not exist
+            self.normalization_data = get_normalization_data(
+                tpl, self.normalization_file,
+            )
+            tpl = tpl._replace(normalization_data=self.normalization_data)
 
         return tpl
@@ -7,7 +7,12 @@ Created on Wed Aug  9 19:35:52 2017
 
 import sys
 import os
+import glob
+import hashlib
+import pickle
+import tempfile
 
+from sharc.parameters.parameters_base import ParametersBase
 from sharc.parameters.parameters_general import ParametersGeneral
 from sharc.parameters.imt.parameters_imt import ParametersImt
 from sharc.parameters.parameters_eess_ss import ParametersEessSS
@@ -19,6 +24,7 @@ from sharc.parameters.parameters_haps import ParametersHaps
 from sharc.parameters.parameters_rns import ParametersRns
 from sharc.parameters.parameters_ras import ParametersRas
 from sharc.parameters.parameters_single_earth_station import ParametersSingleEarthStation
+from sharc.support.sharc_utils import get_cache_dir
 
 
 class Parameters(object):
@@ -26,6 +32,14 @@ class Parameters(object):
     Reads parameters from input file.
     """
 
+    # version of the compiled parameters cache. Files saved with another
+    # version are not loaded
+    cache_version = 1
+
+    # hash of the source code that parses the parameters, used to invalidate
+    # the compiled parameters cache when that code changes
+    _source_hash = None
+
     def __init__(self):
         self.file_name = None
 
@@ -51,8 +65,16 @@ class Parameters(object):
         """
         self.file_name = file_name
 
-    def read_params(self):
+    def read_params(self, use_cache=False):
         """Read the parameters from the config file
+
+        Parameters
+        ----------
+        use_cache : bool, optional
+            If True, the parsed and validated parameters are saved to the
+            SHARC cache directory, keyed by the hash of the config file, and
+            loaded from there the next time the same file is read, by
+            default False
         """
         if not os.path.isfile(self.file_name):
             err_msg = f"PARAMETER ERROR [{self.__class__.__name__}]: \
@@ -60,6 +82,12 @@ class Parameters(object):
             sys.stderr.write(err_msg)
             sys.exit(1)
 
+        cache_file = None
+        if use_cache:
+            cache_file = self._get_cache_file()
+            if cache_file is not None and self._load_cache(cache_file):
+                return
+
         #######################################################################
         # GENERAL
         #######################################################################
@@ -107,6 +135,98 @@ class Parameters(object):
 
         self.single_earth_station.load_parameters_from_file(self.file_name)
 
+        if cache_file is not None:
+            self._save_cache(cache_file)
+
+    def _sections(self) -> dict:
+        """Returns the parameter sections, indexed by attribute name"""
+        return {
+            name: value for name, value in vars(self).items()
+            if name != "file_name"
+        }
+
+    def _get_cache_file(self):
+        """Returns the compiled parameters cache file of the config file, or
+        None if the cache directory is not available. The file name depends on
+        the contents of the config file and on the parameters source code.
+        """
+        if Parameters._source_hash is None:
+            source_hash = hashlib.sha1()
+            sharc_dir = os.path.dirname(os.path.dirname(__file__))
+            source_files = sorted(
+                glob.glob(os.path.join(sharc_dir, "parameters", "**", "*.py"), recursive=True),
+            ) + [os.path.join(sharc_dir, "sharc_definitions.py")]
+            for source_file in source_files:
+                with open(source_file, "rb") as f:
+                    source_hash.update(f.read())
+            Parameters._source_hash = source_hash.hexdigest()
+
+        key = hashlib.sha1()
+        key.update(f"{self.cache_version}:{Parameters._source_hash}:".encode())
+        with open(self.file_name, "rb") as f:
+            key.update(f.read())
+
+        try:
+            return os.path.join(
+                get_cache_dir("parameters"), key.hexdigest() + ".pickle",
+            )
+        except OSError:
+            return None
+
+    def _load_cache(self, cache_file: str) -> bool:
+        """Loads the parameter sections from the compiled parameters cache.
+        Returns False if the cache file does not exist or is not valid.
+        """
+        try:
+            with open(cache_file, "rb") as f:
+                sections = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return False
+        if not isinstance(sections, dict) or sections.keys() != self._sections().keys():
+            return False
+
+        for name, value in sections.items():
+            setattr(self, name, value)
+
+        return True
+
+    @staticmethod
+    def _copy_class_attributes(section):
+        """Copies the parameters that are class attributes of section (e.g.
+        sub-parameters declared without a type annotation, which are shared
+        by all instances and set in place when loaded) to the instance, so
+        that they are pickled with it.
+        """
+        for name in dir(section):
+            if name.startswith("_") or isinstance(getattr(type(section), name, None), property):
+                continue
+            value = getattr(section, name)
+            if callable(value):
+                continue
+            if name not in vars(section):
+                setattr(section, name, value)
+            if isinstance(value, ParametersBase):
+                Parameters._copy_class_attributes(value)
+
+    def _save_cache(self, cache_file: str):
+        """Saves the parameter sections to the compiled parameters cache. The
+        file is written to a temporary file first, so that concurrent
+        processes never read a partial file.
+        """
+        try:
+            fd, tmp_name = tempfile.mkstemp(
+                dir=os.path.dirname(cache_file), suffix=".tmp",
+            )
+            sections = self._sections()
+            for section in sections.values():
+                self._copy_class_attributes(section)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(sections, f)
+            os.replace(tmp_name, cache_file)
+        except OSError:
+            # the cache is an optimization only
+            pass
+
 
 if __name__ == "__main__":
     from pprint import pprint
@@ -1,3 +1,6 @@
+import copy
+import os
+
 import yaml
 from dataclasses import dataclass
 
@@ -11,6 +14,40 @@ def tuple_constructor(loader, node):
 
 yaml.SafeLoader.add_constructor('tag:yaml.org,2002:python/tuple', tuple_constructor)
 
+# the C implementation of the loader is much faster, if PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlLoader.add_constructor('tag:yaml.org,2002:python/tuple', tuple_constructor)
+
+# configuration files already parsed, indexed by path. Each entry holds the
+# file modification time and size, so that modified files are parsed again
+_config_files = dict()
+
+
+def read_config_file(config_file: str) -> dict:
+    """Parses a YAML configuration file. Files are parsed only once, so that
+    all the parameter sections of a file can be loaded without parsing it
+    again for each section.
+
+    Parameters
+    ----------
+    config_file : str
+        the path to the configuration file
+
+    Returns
+    -------
+    dict
+        a copy of the parsed configuration, that can be freely modified
+    """
+    stat = os.stat(config_file)
+    path = os.path.abspath(config_file)
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    if path not in _config_files or _config_files[path][0] != version:
+        with open(config_file, 'r') as file:
+            _config_files[path] = (version, yaml.load(file, Loader=_YamlLoader))
+
+    return copy.deepcopy(_config_files[path][1])
+
 
 @dataclass
 class ParametersBase:
@@ -90,8 +127,7 @@ class ParametersBase:
             if a parameter is not valid
         """
 
-        with open(config_file, 'r') as file:
-            config = yaml.safe_load(file)
+        config = read_config_file(config_file)
 
         if self.section_name.lower() not in config.keys():
             if not quiet:
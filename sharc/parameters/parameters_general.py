@@ -19,6 +19,23 @@ class ParametersGeneral(ParametersBase):
     overwrite_output: bool = True
     output_dir: str = "output"
     output_dir_prefix: str = "output"
+    # Format of the sample files: CSV (text) or NPY (binary)
+    results_format: str = "CSV"
+    # If TRUE, samples are summarized in fixed-size histograms and running
+    # moments instead of being written to the sample files
+    streaming_statistics: bool = False
+    # If TRUE, the wall time of each stage of the snapshots is measured and
+    # written to profile.txt and profile.json in the output directory
+    profile_snapshots: bool = False
+    # If TRUE, the memory allocated by each stage is measured as well (slow)
+    profile_allocations: bool = False
+    # Minimum number of snapshots between checkpoints of the simulation
+    # state, which allow an interrupted simulation to be resumed. 0 disables
+    # checkpoints
+    checkpoint_interval: int = 0
+    # Resolution [deg] of the lookup tables of the system antenna patterns
+    # that depend only on the off-axis angle. 0 uses the exact patterns
+    antenna_lut_resolution: float = 0.0
 
     def load_parameters_from_file(self, config_file: str):
         """Load the parameters from file an run a sanity check
@@ -41,5 +58,20 @@ class ParametersGeneral(ParametersBase):
                              Invalid value for parameter imt_link - {self.imt_link} \
                              Possible values are DOWNLINK and UPLINK")
 
+        if self.results_format.upper() not in ["CSV", "NPY"]:
+            raise ValueError(f"ParametersGeneral: \
+                             Invalid value for parameter results_format - {self.results_format} \
+                             Possible values are CSV and NPY")
+
+        if not isinstance(self.checkpoint_interval, int) or self.checkpoint_interval < 0:
+            raise ValueError(f"ParametersGeneral: \
+                             Invalid value for parameter checkpoint_interval - {self.checkpoint_interval} \
+                             Must be a non-negative integer")
+
+        if not isinstance(self.antenna_lut_resolution, (int, float)) or self.antenna_lut_resolution < 0:
+            raise ValueError(f"ParametersGeneral: \
+                             Invalid value for parameter antenna_lut_resolution - {self.antenna_lut_resolution} \
+                             Must be a non-negative number of degrees")
+
         if self.system not in SHARC_IMPLEMENTED_SYSTEMS:
             raise ValueError(f"Invalid system name {self.system}")
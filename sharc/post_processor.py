@@ -1,4 +1,5 @@
 from sharc.results import Results
+from sharc.sample_summary import SampleSummary
 
 from dataclasses import dataclass, field
 import plotly.graph_objects as go
@@ -30,6 +31,19 @@ class FieldStatistics:
         )
         return self
 
+    def load_from_summary(
+        self, field_name: str, summary: SampleSummary, *, confidence=0.95
+    ) -> "FieldStatistics":
+        self.field_name = field_name
+        self.median = summary.quantile(0.5)
+        self.mean = summary.mean
+        self.variance = summary.variance
+        self.standard_deviation = summary.standard_deviation
+        self.confidence_interval = scipy.stats.norm.interval(
+            confidence, loc=self.mean, scale=self.standard_deviation
+        )
+        return self
+
     def __str__(self):
         attr_names = filter(
             lambda x: x != "field_name"
@@ -62,11 +76,14 @@ class ResultsStatistics:
         attr_names = result.get_relevant_attributes()
         for attr_name in attr_names:
             samples = getattr(result, attr_name)
-            if len(samples) == 0:
-                continue
-            self.fields_statistics.append(
-                FieldStatistics().load_from_sample(attr_name, samples)
-            )
+            if len(samples):
+                self.fields_statistics.append(
+                    FieldStatistics().load_from_sample(attr_name, samples)
+                )
+            elif attr_name in result.summaries:
+                self.fields_statistics.append(
+                    FieldStatistics().load_from_summary(attr_name, result.summaries[attr_name])
+                )
 
         return self
 
@@ -270,7 +287,7 @@ class PostProcessor:
 
             for attr_name in attr_names:
                 attr_val = getattr(res, attr_name)
-                if not len(attr_val):
+                if not len(attr_val) and attr_name not in res.summaries:
                     continue
                 if attr_name not in PostProcessor.RESULT_FIELDNAME_TO_PLOT_INFO:
                     print(
@@ -296,7 +313,10 @@ class PostProcessor:
                     )
 
                 # TODO: take this fn as argument, to plot more than only cdf's
-                x, y = PostProcessor.cdf_from(attr_val, n_bins=n_bins)
+                if len(attr_val):
+                    x, y = PostProcessor.cdf_from(attr_val, n_bins=n_bins)
+                else:
+                    x, y = res.summaries[attr_name].cdf(n_bins=n_bins)
 
                 fig = figs[attr_name]
 
@@ -13,6 +13,9 @@ class ReferenceAtmosphere:
     Implements diverse ITU recommendations on a reference atmosphere
     """
 
+    # number of layers whose specific attenuation is calculated at a time
+    layer_chunk_size = 4096
+
     def __init__(self):
         # Table C.1 of ITU-R P619 - Constants for the reference dry atmosphere
         self.ref_atmosphere_altitude_km = [
@@ -201,36 +204,44 @@ class ReferenceAtmosphere:
 
          Parameters
          ----------
-             pressure (float): dry-air partial pressure (hPa)
-             water_vapour_pressure (float): water-vapour partial pressure (hPa)
-             temperature (float): temperature(K)
+             pressure (float or np.array): dry-air partial pressure (hPa)
+             water_vapour_pressure (float or np.array): water-vapour partial pressure (hPa)
+             temperature (float or np.array): temperature(K)
              frequency_MHz (float) : carrier frequency (MHz)
 
          Returns
          -------
-             specific_attenuation (float): specific gaseous attenuation (dB/km)
+             specific_attenuation (float or np.array): specific gaseous attenuation (dB/km),
+             with the shape of the layer parameters
          """
 
-        theta = 300 / temperature
+        pressure = np.asarray(pressure, dtype=float)
+        water_vapour_pressure = np.asarray(water_vapour_pressure, dtype=float)
+        theta = 300 / np.asarray(temperature, dtype=float)
         f_GHz = frequency_MHz / 1000
 
+        # the spectral lines are in the last axis
+        p = pressure[..., np.newaxis]
+        e = water_vapour_pressure[..., np.newaxis]
+        th = theta[..., np.newaxis]
+
         # line strength
-        s_oxygen = self.p676_a[:, 0] * 1e-7 * pressure * theta ** 3 * \
-            np.exp(self.p676_a[:, 1] * (1 - theta))
-        s_vapour = self.p676_b[:, 0] * 1e-1 * water_vapour_pressure * theta ** 3.5 \
-            * np.exp(self.p676_b[:, 1] * (1 - theta))
+        s_oxygen = self.p676_a[:, 0] * 1e-7 * p * th ** 3 * \
+            np.exp(self.p676_a[:, 1] * (1 - th))
+        s_vapour = self.p676_b[:, 0] * 1e-1 * e * th ** 3.5 \
+            * np.exp(self.p676_b[:, 1] * (1 - th))
         # line width
         df_oxygen = self.p676_a[:, 2] * 1e-4 * (
-            pressure * theta ** (.8 - self.p676_a[:, 3]) +
-            1.1 * water_vapour_pressure * theta
+            p * th ** (.8 - self.p676_a[:, 3]) +
+            1.1 * e * th
         )
         df_vapour = self.p676_b[:, 2] * 1e-4 * (
-            pressure * theta ** (self.p676_b[:, 3]) +
-            self.p676_b[:, 4] * water_vapour_pressure * theta ** self.p676_b[:, 5]
+            p * th ** (self.p676_b[:, 3]) +
+            self.p676_b[:, 4] * e * th ** self.p676_b[:, 5]
         )
         # correction factor
-        delta_oxygen = (self.p676_a[:, 4] + self.p676_a[:, 5] * theta) * 1e-4 * \
-                       (pressure + water_vapour_pressure) * theta ** .8
+        delta_oxygen = (self.p676_a[:, 4] + self.p676_a[:, 5] * th) * 1e-4 * \
+                       (p + e) * th ** .8
 
         # line shape factor
         sf_oxygen = f_GHz / self.p676_oxygen_f0 * \
@@ -253,12 +264,12 @@ class ReferenceAtmosphere:
                 6.14e-5 / (dw * (1 + (f_GHz / dw) ** 2)) +
                 1.4e-12 * pressure * theta ** 1.5 / (1 + 1.9e-5 * f_GHz ** 1.5)
             )
-        att_oxygen = 0.182 * f_GHz * (np.sum(s_oxygen * sf_oxygen) + nd)
-        att_vapour = 0.182 * f_GHz * np.sum(s_vapour * sf_vapour)
+        att_oxygen = 0.182 * f_GHz * (np.sum(s_oxygen * sf_oxygen, axis=-1) + nd)
+        att_vapour = 0.182 * f_GHz * np.sum(s_vapour * sf_vapour, axis=-1)
 
         specific_attenuation = att_oxygen + att_vapour
 
-        return specific_attenuation
+        return specific_attenuation[()]
 
     def get_atmospheric_params(self, altitude_km, water_vapour_density_sea_level, f_MHz):
         """
@@ -278,22 +289,50 @@ class ReferenceAtmosphere:
              refractive_index (float) : index of refraction of atmospheric layer at altitude_km
              specific_attenuation (float): specific gaseous attenuation (dB/km)
          """
+        return [
+            float(param[0]) for param in self.get_layer_table(
+                np.array([altitude_km], dtype=float),
+                water_vapour_density_sea_level,
+                f_MHz,
+            )
+        ]
+
+    def get_layer_table(self, altitude_km, water_vapour_density_sea_level, f_MHz):
+        """
+         Calculates the atmospheric parameters of ITU-R P.619, Atttachment C.5
+         for an array of layer altitudes at once, e.g. all the layers crossed
+         by a ray.
+
+         Parameters
+         ----------
+             altitude_km (np.array) : altitudes [km]
+             water_vapour_density_sea_level (float) : water vapour density at sea level (g/m**3)
+             f_MHz (float) : carrier frequency (MHz)
+
+         Returns
+         -------
+             list of arrays with the temperature, pressure, water_vapour_pressure,
+             refractive_index and specific_attenuation at each altitude, as in
+             get_atmospheric_params
+         """
+        altitude_km = np.asarray(altitude_km, dtype=float)
 
-        index = np.where(altitude_km >= np.array(self.ref_atmosphere_altitude_km,),)[0][-1]
+        index = np.searchsorted(
+            self.ref_atmosphere_altitude_km, altitude_km, side="right",
+        ) - 1
 
-        Ti = self.ref_atmosphere_temperature[index]
-        Li = self.ref_atmosphere_temp_grad[index]
-        Hi = self.ref_atmosphere_altitude_km[index]
-        if Hi < 0:
-            Hi = 0
-        Pi = self.ref_atmosphere_pressure[index]
+        Ti = np.array(self.ref_atmosphere_temperature)[index]
+        Li = np.array(self.ref_atmosphere_temp_grad)[index]
+        Hi = np.maximum(np.array(self.ref_atmosphere_altitude_km)[index], 0)
+        Pi = np.array(self.ref_atmosphere_pressure)[index]
 
         temperature = Ti + Li * (altitude_km - Hi)
-        if Li:
-            pressure = Pi * \
-                (Ti / (Ti + Li * (altitude_km - Hi))) ** (34.163 / Li)
-        else:
-            pressure = Pi * np.exp(-34.163 * (altitude_km - Hi) / Ti)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pressure = np.where(
+                Li != 0,
+                Pi * (Ti / temperature) ** (34.163 / Li),
+                Pi * np.exp(-34.163 * (altitude_km - Hi) / Ti),
+            )
 
         water_vapour_density = water_vapour_density_sea_level * \
             np.exp(-altitude_km / 2)
@@ -305,10 +344,19 @@ class ReferenceAtmosphere:
                 4810 * water_vapour_pressure / pressure
             )
         )
-        specific_attenuation = self._get_specific_attenuation(
-            pressure, water_vapour_pressure,
-            temperature, f_MHz,
-        )
+
+        # the spectral lines of the layers are calculated in chunks, which
+        # bounds the memory used for long ray traces
+        specific_attenuation = np.empty(altitude_km.shape)
+        layers = [
+            a.ravel() for a in
+            (specific_attenuation, pressure, water_vapour_pressure, temperature)
+        ]
+        for i in range(0, altitude_km.size, self.layer_chunk_size):
+            chunk = slice(i, i + self.layer_chunk_size)
+            layers[0][chunk] = self._get_specific_attenuation(
+                layers[1][chunk], layers[2][chunk], layers[3][chunk], f_MHz,
+            )
 
         return [temperature, pressure, water_vapour_pressure, refractive_index, specific_attenuation]
 
@@ -331,7 +379,6 @@ class ReferenceAtmosphere:
         """
 
         h_km = altitude / 1000
-        print("h_km",h_km)
 
         if latitude <= 22:
             # low latitude
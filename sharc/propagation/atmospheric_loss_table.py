@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+"""
+Lookup tables of the atmospheric gasses loss of ITU-R P.619, Attachment C.
+"""
+
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+from sharc.parameters.constants import EARTH_RADIUS
+from sharc.propagation.atmosphere import ReferenceAtmosphere
+from sharc.support.sharc_utils import get_cache_dir
+
+
+class AtmosphericLossTable(object):
+    """
+    Atmospheric gasses loss as a function of the apparent elevation angle,
+    for a given frequency, Earth station altitude and atmosphere.
+
+    The loss is ray-traced through the reference atmosphere once, on a dense
+    grid of apparent elevations from 0 to 90 degrees, and then linearly
+    interpolated for whole arrays of elevations. Tables are kept in memory
+    and saved to the SHARC cache directory, so each one is built only once.
+    Tables are obtained with AtmosphericLossTable.get_table.
+
+    Attributes
+    ----------
+        elevation_step (float): step of the apparent elevation grid (degrees)
+        loss (np.array): atmospheric loss (dB) at each point of the grid
+    """
+
+    # version of the file format and of the ray tracing algorithm. Tables
+    # saved with another version are built again
+    version = 3
+    default_elevation_step = 0.01
+    # number of (ray, layer) paths calculated at a time when tracing, and
+    # minimum number of layers calculated at a time
+    trace_chunk_size = 2 ** 14
+    min_trace_chunk_layers = 32
+
+    # tables already built or loaded in this process, indexed by key
+    _tables = dict()
+
+    def __init__(self, elevation_step: float, loss: np.array):
+        self.elevation_step = elevation_step
+        self.loss = loss
+
+    @property
+    def elevation(self) -> np.array:
+        """Apparent elevation grid of the table (degrees)"""
+        return np.arange(len(self.loss)) * self.elevation_step
+
+    def get_loss(self, apparent_elevation) -> np.array:
+        """
+        Interpolates the atmospheric loss at the given apparent elevations.
+        The loss is symmetric around the zenith, so elevations above 90
+        degrees are supported.
+
+        Parameters
+        ----------
+        apparent_elevation : array like
+            Apparent elevation angles (degrees), between 0 and 180
+
+        Returns
+        -------
+        np.array
+            Atmospheric loss (dB), with the same shape as apparent_elevation
+        """
+        apparent_elevation = np.asarray(apparent_elevation, dtype=float)
+        if np.any(apparent_elevation < 0):
+            raise ValueError(
+                "AtmosphericLossTable: negative elevations are not supported",
+            )
+        apparent_elevation = np.where(
+            apparent_elevation > 90, 180 - apparent_elevation, apparent_elevation,
+        )
+
+        return np.interp(
+            apparent_elevation / self.elevation_step,
+            np.arange(len(self.loss)),
+            self.loss,
+        )
+
+    @classmethod
+    def get_table(
+        cls,
+        frequency_MHz: float,
+        earth_station_alt_m: float,
+        earth_station_lat_deg: float,
+        season: str,
+        surf_water_vapour_density: float,
+        elevation_step=None,
+        use_disk_cache=True,
+    ) -> "AtmosphericLossTable":
+        """
+        Returns the table for the given parameters. It is taken from the
+        in-process cache, else loaded from the disk cache, else built (and
+        saved to the disk cache).
+
+        Parameters
+        ----------
+        frequency_MHz : float
+            Center frequency (MHz)
+        earth_station_alt_m : float
+            Earth station altitude (m)
+        earth_station_lat_deg : float
+            Earth station latitude (degrees)
+        season : str
+            "SUMMER" or "WINTER"
+        surf_water_vapour_density : float
+            Surface water vapour density (g/m**3)
+        elevation_step : float, optional
+            Step of the apparent elevation grid (degrees), by default
+            default_elevation_step
+        use_disk_cache : bool, optional
+            Whether tables are loaded from and saved to the disk cache, by
+            default True
+
+        Returns
+        -------
+        AtmosphericLossTable
+            Table for the given parameters
+        """
+        if elevation_step is None:
+            elevation_step = cls.default_elevation_step
+        key = (
+            cls.version,
+            float(frequency_MHz),
+            float(earth_station_alt_m),
+            float(earth_station_lat_deg),
+            season.upper(),
+            float(surf_water_vapour_density),
+            float(elevation_step),
+        )
+        if key in cls._tables:
+            return cls._tables[key]
+
+        file_name = None
+        if use_disk_cache:
+            try:
+                file_name = os.path.join(
+                    get_cache_dir("atmospheric_loss"),
+                    hashlib.sha1(repr(key).encode()).hexdigest() + ".npz",
+                )
+            except OSError:
+                file_name = None
+
+        table = None
+        if file_name and os.path.exists(file_name):
+            table = cls._load(file_name, key)
+        if table is None:
+            elevation = np.arange(
+                0, 90 + elevation_step / 2, elevation_step,
+            )
+            table = AtmosphericLossTable(
+                elevation_step,
+                cls.trace(
+                    frequency_MHz,
+                    earth_station_alt_m,
+                    surf_water_vapour_density,
+                    elevation,
+                ),
+            )
+            if file_name:
+                table._save(file_name, key)
+
+        cls._tables[key] = table
+
+        return table
+
+    @staticmethod
+    def trace(
+        frequency_MHz: float,
+        earth_station_alt_m: float,
+        surf_water_vapour_density: float,
+        apparent_elevation: np.array,
+        atmosphere=None,
+    ) -> np.array:
+        """
+        Ray-traces the atmospheric gasses loss according to ITU-R P.619,
+        Attachment C, for many apparent elevations at once.
+
+        Rays with negative apparent elevations first go down through the
+        atmosphere layers until they are horizontal. All rays then go up to
+        100 km, and rays that start at the same altitude cross the same
+        layers, so the parameters of the layers are calculated once, as a
+        ReferenceAtmosphere layer table, for all of them.
+
+        Parameters
+        ----------
+        frequency_MHz : float
+            Center frequency (MHz)
+        earth_station_alt_m : float
+            Earth station altitude (m)
+        surf_water_vapour_density : float
+            Surface water vapour density (g/m**3)
+        apparent_elevation : np.array
+            Apparent elevation angles (degrees), between -90 and 90
+        atmosphere : ReferenceAtmosphere, optional
+            Reference atmosphere, by default ReferenceAtmosphere()
+
+        Returns
+        -------
+        np.array
+            Atmospheric loss (dB) at each apparent elevation
+        """
+        if atmosphere is None:
+            atmosphere = ReferenceAtmosphere()
+
+        h = earth_station_alt_m / 1000  # ray altitude in km
+        rho_s = surf_water_vapour_density * np.exp(h / 2)
+
+        apparent_elevation = np.asarray(apparent_elevation, dtype=float)
+        beta = (90 - np.abs(apparent_elevation)) * np.pi / 180.  # incidence angle
+        a_acc = np.zeros(apparent_elevation.shape)  # accumulated attenuation (in dB)
+        h_start = np.full(apparent_elevation.shape, float(h))
+
+        negative = apparent_elevation < 0
+        if np.any(negative):
+            a_acc[negative], h_start[negative], beta[negative] = \
+                AtmosphericLossTable._trace_down(
+                    frequency_MHz, h, rho_s, beta[negative], atmosphere,
+                )
+
+        for h_0 in np.unique(h_start[~np.isnan(h_start)]):
+            rays = h_start == h_0
+            a_acc[rays] += AtmosphericLossTable._trace_up(
+                frequency_MHz, h_0, rho_s, beta[rays], atmosphere,
+            )
+
+        return a_acc
+
+    @staticmethod
+    def _trace_up(
+        frequency_MHz: float,
+        h: float,
+        rho_s: float,
+        beta: np.array,
+        atmosphere: ReferenceAtmosphere,
+    ) -> np.array:
+        """
+        Traces rays from altitude h (km) with incidence angles beta (rad) up
+        to 100 km, through layers whose thickness grows with the altitude as
+        in ITU-R P.619, Attachment C.
+
+        By Snell's law in spherical layers, n * r * sin(beta) is the same in
+        all layers, so the path in each layer is obtained directly for all
+        layers and rays, without going through the layers one by one.
+        """
+        earth_radius_km = EARTH_RADIUS / 1000
+
+        # altitude and thickness of each layer the ray goes through up to
+        # 100 km. The layers are the same for all the rays
+        altitude = [h]
+        delta = []
+        while True:
+            delta.append(.0001 + .01 * max(altitude[-1], 0))
+            if altitude[-1] + delta[-1] >= 100:
+                break
+            altitude.append(altitude[-1] + delta[-1])
+        altitude = np.array(altitude)
+        delta = np.array(delta)
+        num_layers = len(altitude)
+        # radius of the lower edge of each layer, accumulated layer by layer
+        r = np.cumsum(np.concatenate(([earth_radius_km + h], delta[:-1])))
+
+        _, _, _, n, gamma = atmosphere.get_layer_table(
+            altitude, rho_s, frequency_MHz,
+        )
+
+        # with c = n * r * sin(beta), the path in the layer is
+        # sqrt((r + delta)**2 - (c / n)**2) - sqrt(r**2 - (c / n)**2)
+        c_sq = (n[0] * r[0] * np.sin(beta)) ** 2
+        n_sq_inv = 1 / n ** 2
+        r_top_sq = (r + delta) ** 2
+        r_sq = r ** 2
+        width = r_top_sq - r_sq
+
+        a_acc = np.zeros(beta.shape)
+        chunk_size = max(
+            AtmosphericLossTable.min_trace_chunk_layers,
+            AtmosphericLossTable.trace_chunk_size // max(beta.size, 1),
+        )
+        for i in range(0, num_layers, chunk_size):
+            chunk = slice(i, i + chunk_size)
+            c_n_sq = np.multiply.outer(c_sq, n_sq_inv[chunk])
+            path = np.sqrt(np.maximum(r_sq[chunk] - c_n_sq, 0))
+            if i == 0:
+                # r * cos(beta) at the start, which is exact for rays that
+                # start horizontal
+                path[:, 0] = r[0] * np.cos(beta)
+            path += np.sqrt(np.maximum(r_top_sq[chunk] - c_n_sq, 0))
+            np.divide(width[chunk], path, out=path)
+            a_acc += path @ gamma[chunk]
+
+        return a_acc
+
+    @staticmethod
+    def _trace_down(
+        frequency_MHz: float,
+        h: float,
+        rho_s: float,
+        beta: np.array,
+        atmosphere: ReferenceAtmosphere,
+    ) -> tuple:
+        """
+        Traces rays with negative apparent elevations from altitude h (km)
+        down through the atmosphere layers until they are horizontal.
+
+        Returns
+        -------
+        tuple
+            (attenuation, altitude, incidence angle) of each ray when it
+            starts going up. Rays that never become horizontal have NaN
+            values
+        """
+        earth_radius_km = EARTH_RADIUS / 1000
+        beta = np.array(beta, dtype=float)
+        a_acc = np.zeros(beta.shape)
+        h_end = np.full(beta.shape, np.nan)
+        active = np.ones(beta.shape, dtype=bool)
+
+        _, _, _, n, gamma = atmosphere.get_atmospheric_params(
+            h, rho_s, frequency_MHz,
+        )
+        delta = .0001 + 0.01 * max(h, 0)  # layer thickness
+        r = earth_radius_km + h - delta  # radius of lower edge
+        while True:
+            m = (r + delta) * np.sin(beta[active]) - r
+            horizontal = m >= 0
+            if np.any(horizontal):
+                rays = np.flatnonzero(active)[horizontal]
+                a_acc[rays] += 2 * np.sqrt(
+                    2 * r * (delta - m[horizontal]) +
+                    delta ** 2 - m[horizontal] ** 2,
+                ) * gamma  # horizontal path
+                h_end[rays] = h
+                active[rays] = False
+            # rays that never become horizontal are dropped
+            active &= ~np.isnan(beta)
+            if not np.any(active) or r <= 0:
+                break
+
+            b = beta[active]
+            ds = (r + delta) * np.cos(b) - np.sqrt(
+                (r + delta) ** 2 * np.cos(b) ** 2 - (2 * r * delta + delta ** 2),
+            )
+            a_acc[active] += ds * gamma
+            # angle to vertical
+            alpha = np.arcsin((r + delta) / r * np.sin(b))
+            h -= delta
+            r -= delta
+            _, _, _, n_new, gamma = atmosphere.get_atmospheric_params(
+                h, rho_s, frequency_MHz,
+            )
+            delta = 0.0001 + 0.01 * max(h, 0)
+            beta[active] = np.arcsin(n / n_new * np.sin(alpha))
+            n = n_new
+
+        a_acc[np.isnan(h_end)] = np.nan
+
+        return a_acc, h_end, beta
+
+    def _save(self, file_name: str, key: tuple):
+        """
+        Saves the table to file_name. The file is written to a temporary file
+        first, so that concurrent processes never read a partial table.
+        """
+        try:
+            fd, tmp_name = tempfile.mkstemp(
+                dir=os.path.dirname(file_name), suffix=".tmp",
+            )
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    key=np.array(repr(key)),
+                    elevation_step=self.elevation_step,
+                    loss=self.loss,
+                )
+            os.replace(tmp_name, file_name)
+        except OSError:
+            # the cache is an optimization only
+            pass
+
+    @staticmethod
+    def _load(file_name: str, key: tuple):
+        """
+        Loads the table saved in file_name, or returns None if it is not a
+        valid table for key.
+        """
+        try:
+            with np.load(file_name) as data:
+                if str(data["key"]) != repr(key):
+                    return None
+                return AtmosphericLossTable(
+                    float(data["elevation_step"]), data["loss"],
+                )
+        except (OSError, ValueError, KeyError):
+            return None
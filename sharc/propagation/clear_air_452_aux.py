@@ -2,10 +2,9 @@ import numpy as np
 
 
 def inv_cum_norm(x):
-    if x < 0.000001:
-        x = 0.000001
+    x = np.maximum(x, 0.000001)
 
-    if x > 0.5:
+    if np.any(x > 0.5):
         error_message = "WARNING: This function (inv_cum_norm) is defined for arguments not larger than 0.5"
         print(error_message)
 
@@ -94,9 +94,9 @@ class PropagationClearAir(Propagation):
         return dc, hc, zonec, htgc, hrgc, Aht, Ahr
 
     @staticmethod
-    def longest_cont_dist(d, zone, zone_r):
-        dm = 0
-
+    def _zone_section_lengths(d, zone, zone_r):
+        # lengths of the continuous sections of the path in zone_r. Profiles
+        # are along the last axis of d and all of them have the same zones
         if zone_r == 12:
             aux = (zone == 1) + (zone == 2)
         else:
@@ -110,16 +110,31 @@ class PropagationClearAir(Propagation):
         start = np.atleast_1d(start)
         stop = np.atleast_1d(stop)
         n = start.size
+        last = d.shape[-1] - 1
 
+        lengths = []
         for i in range(n):
-            delta = 0
-            if (d[stop[i]] < d[-1]):
-                delta = delta + (d[stop[i] + 1] - d[stop[i]]) / 2.0
+            delta = np.where(
+                d[..., stop[i]] < d[..., -1],
+                (d[..., min(stop[i] + 1, last)] - d[..., stop[i]]) / 2.0,
+                0,
+            )
+            delta = delta + np.where(
+                d[..., start[i]] > 0,
+                (d[..., stop[i]] - d[..., stop[i] - 1]) / 2.0,
+                0,
+            )
+            lengths.append(d[..., stop[i]] - d[..., start[i]] + delta)
 
-            if (d[start[i]] > 0):
-                delta = delta + (d[stop[i]] - d[stop[i] - 1]) / 2.0
+        return lengths
 
-            dm = max(d[stop[i]] - d[start[i]] + delta, dm)
+    @staticmethod
+    def longest_cont_dist(d, zone, zone_r):
+        d = np.asarray(d)
+        dm = np.zeros(d.shape[:-1])
+
+        for length in PropagationClearAir._zone_section_lengths(d, zone, zone_r):
+            dm = np.maximum(length, dm)
 
         return dm
 
@@ -156,121 +171,122 @@ class PropagationClearAir(Propagation):
 
         return ae, ab
 
+    @staticmethod
+    def _last_argmax(x):
+        # index of the last maximum of each row of x
+        return x.shape[1] - 1 - np.argmax(x[:, ::-1], axis=1)
+
     @staticmethod
     def smooth_earth_heights(d, h, htg, hrg, ae, f):
-        n = d.size
-        dtot = d[-1]
+        # d and h hold one profile per row. Results are arrays with one
+        # value per profile
+        d = np.atleast_2d(d)
+        h = np.atleast_2d(h)
+        rows = np.arange(d.shape[0])
+        dtot = d[:, -1]
 
         # Tx and Rx antenna heights above mean sea level amsl(m)
-        hts = h[0] + htg
-        hrs = h[-1] + hrg
+        hts = h[:, 0] + htg
+        hrs = h[:, -1] + hrg
 
         # Section 5.1.6.2
-        v1 = 0
-        for ii in range(1, n):
-            v1 = v1 + (d[ii] - d[ii - 1]) * (h[ii] + h[ii - 1])  # Eq(161)
-
-        v2 = 0
-        for ii in range(2, n):
-            v2 = v2 + (d[ii] - d[ii - 1]) * (
-                h[ii] * (
-                    2 * d[ii] + d[ii - 1]
+        dd = np.diff(d, axis=1)
+        v1 = np.sum(dd * (h[:, 1:] + h[:, :-1]), axis=1)  # Eq(161)
+
+        v2 = np.sum(
+            dd[:, 1:] * (
+                h[:, 2:] * (
+                    2 * d[:, 2:] + d[:, 1:-1]
                     # Eq(162)
-                ) + h[ii - 1] * (d[ii] + 2 * d[ii - 1])
-            )
+                ) + h[:, 1:-1] * (d[:, 2:] + 2 * d[:, 1:-1])
+            ),
+            axis=1,
+        )
 
         hst = (2 * v1 * dtot - v2) / dtot ** 2  # Eq(163)
         hsr = (v2 - v1 * dtot) / dtot ** 2  # Eq(164)
 
+        # intermediate profile points
+        di = d[:, 1:-1]
+        hi = h[:, 1:-1]
+        dtot_i = dtot[:, np.newaxis]
+        hts_i = hts[:, np.newaxis]
+        hrs_i = hrs[:, np.newaxis]
+
         # Section 5.1.6.3
-        HH = h - (hts * (dtot - d) + hrs * d) / dtot  # Eq(165d)
-        hobs = max(HH[1:n - 1])  # Eq(165a)
+        HH = hi - (hts_i * (dtot_i - di) + hrs_i * di) / dtot_i  # Eq(165d)
+        hobs = np.max(HH, axis=1)  # Eq(165a)
 
-        alpha_obt = max(HH[1:n - 1] / d[1:n - 1])  # Eq(165b)
-        alpha_obr = max(HH[1:n - 1] / (dtot - d[1:n - 1]))  # Eq(165c)
+        alpha_obt = np.max(HH / di, axis=1)  # Eq(165b)
+        alpha_obr = np.max(HH / (dtot_i - di), axis=1)  # Eq(165c)
 
         # Calculate provisional values for the Tx and Rx smooth surface heights
         gt = alpha_obt / (alpha_obt + alpha_obr)  # Eq(166e)
         gr = alpha_obr / (alpha_obt + alpha_obr)  # Eq(166f)
 
-        if hobs <= 0:
-            hstp = hst
-            hsrp = hsr
-        else:
-            hstp = hst - hobs * gt
-            hsrp = hsr - hobs * gr
+        hstp = np.where(hobs <= 0, hst, hst - hobs * gt)
+        hsrp = np.where(hobs <= 0, hsr, hsr - hobs * gr)
 
         # calculate the final values as required by the diffraction model
-        if hstp >= h[0]:
-            hstd = h[0]
-        else:
-            hstd = hstp
-
-        if hsrp > h[-1]:
-            hsrd = h[-1]
-        else:
-            hsrd = hsrp
+        hstd = np.where(hstp >= h[:, 0], h[:, 0], hstp)
+        hsrd = np.where(hsrp > h[:, -1], h[:, -1], hsrp)
 
         # Interfering antenna horizon elevation angle and distance
-        ii = np.arange(1, n - 1)
-
-        theta = 1000 * np.arctan((h[ii] - hts) /
-                                 (1000 * d[ii]) - d[ii] / (2 * ae))
+        theta = 1000 * np.arctan((hi - hts_i) /
+                                 (1000 * di) - di / (2 * ae))
 
         # theta(theta < 0) = 0; % condition below equation(152)
 
-        theta_t = max(theta)
+        theta_t = np.max(theta, axis=1)
 
         theta_td = 1000 * np.arctan((hrs - hts) /
                                     (1000 * dtot) - dtot / (2 * ae))
         theta_rd = 1000 * np.arctan((hts - hrs) /
                                     (1000 * dtot) - dtot / (2 * ae))
 
-        if theta_t > theta_td:
-            pathtype = 2  # transhorizon
-        else:
-            pathtype = 1  # los
-
-        kindex = np.nonzero(theta == theta_t)
+        # 2 for transhorizon, 1 for los
+        pathtype = np.where(theta_t > theta_td, 2, 1)
 
-        lt = kindex[0] + 1
-
-        dlt = d[lt]
+        lt = np.argmax(theta, axis=1) + 1
+        dlt = d[rows, lt]
 
         # Interfered-with antenna horizon elevation angle and distance
 
         theta = 1000 * \
-            np.arctan((h[ii] - hrs) / (1000 * (dtot - d[ii])) -
-                      (dtot - d[ii]) / (2 * ae))
+            np.arctan((hi - hrs_i) / (1000 * (dtot_i - di)) -
+                      (dtot_i - di) / (2 * ae))
 
         # theta(theta < 0) = 0;
 
-        theta_r = max(theta)
+        theta_r = np.max(theta, axis=1)
 
-        kindex = np.nonzero(np.ravel(theta) == theta_r)
-        lr = kindex[-1] + 1
+        lr = PropagationClearAir._last_argmax(theta) + 1
 
-        dlr = dtot - d[lr]
+        dlr = dtot - d[rows, lr]
 
-        if pathtype == 1:
-            theta_t = theta_td
-            theta_r = theta_rd
+        # los paths
+        los = pathtype == 1
+        theta_t = np.where(los, theta_td, theta_t)
+        theta_r = np.where(los, theta_rd, theta_r)
 
-            ii = np.arange(1, n - 1)
+        lamb = 0.3 / f
+        Ce = 1 / ae
 
-            lamb = 0.3 / f
-            Ce = 1 / ae
+        with np.errstate(divide="ignore", invalid="ignore"):
+            nu = (hi + 500 * Ce * di * (dtot_i - di) - (hts_i * (dtot_i - di) + hrs_i * di) / dtot_i) * \
+                np.sqrt(0.002 * dtot_i / (lamb * di * (dtot_i - di)))
 
-            nu = (h[ii] + 500 * Ce * d[ii] * (dtot - d[ii]) - (hts * (dtot - d[ii]) + hrs * d[ii]) / dtot) * \
-                np.sqrt(0.002 * dtot / (lamb * d[ii] * (dtot - d[ii])))
-            numax = max(nu)
+        lt_los = PropagationClearAir._last_argmax(nu) + 1
+        dlt_los = d[rows, lt_los]
+        dlr_los = dtot - dlt_los
+        lr_los = PropagationClearAir._last_argmax(
+            dlr_los[:, np.newaxis] <= dtot_i - di,
+        ) + 1
 
-            kindex = np.nonzero(nu == numax)
-            lt = kindex[-1] + 1
-            dlt = d[lt]
-            dlr = dtot - dlt
-            kindex = np.nonzero(dlr <= dtot - d[ii])
-            lr = kindex[0][-1] + 1
+        lt = np.where(los, lt_los, lt)
+        dlt = np.where(los, dlt_los, dlt)
+        dlr = np.where(los, dlr_los, dlr)
+        lr = np.where(los, lr_los, lr)
 
         # Angular distance
 
@@ -281,47 +297,54 @@ class PropagationClearAir(Propagation):
         # Calculate the smooth-Earth heights at transmitter and receiver as
         # required for the roughness factor
 
-        hst = min(hst, h[0])
-        hsr = min(hsr, h[-1])
+        hst = np.minimum(hst, h[:, 0])
+        hsr = np.minimum(hsr, h[:, -1])
 
         # Slope of the smooth - Earth surface
         m = (hsr - hst) / dtot
 
         # The terminal effective heigts for the ducting / layer - reflection model
-        hte = htg + h[0] - hst
-        hre = hrg + h[-1] - hsr
-
-        ii = np.arange(lt, lr + 1)
-        hm = max(h[ii] - (hst + m * d[ii]))
+        hte = htg + h[:, 0] - hst
+        hre = hrg + h[:, -1] - hsr
+
+        ii = np.arange(d.shape[1])
+        in_path = (ii >= lt[:, np.newaxis]) & (ii <= lr[:, np.newaxis])
+        hm = np.max(
+            np.where(
+                in_path,
+                h - (hst[:, np.newaxis] + m[:, np.newaxis] * d),
+                -np.inf,
+            ),
+            axis=1,
+        )
 
         return hst, hsr, hstd, hsrd, hte, hre, hm, dlt, dlr, theta_t, theta_r, theta_tot, pathtype
 
     @staticmethod
     def path_fraction(d, zone, zone_r):
-        dm = 0
-
-        aux = np.nonzero(zone == zone_r)
-        start = aux[0]  # actually find_intervals
-        stop = aux[-1]
-        start = np.atleast_1d(start)
-        stop = np.atleast_1d(stop)
-
-        n = start.size
-
-        for i in range(n):
-            delta = 0
-            if (d(stop[1]) < d[-1]):
-                delta = delta + (d(stop[i] + 1) - d(stop[i])) / 2.0
+        d = np.asarray(d)
+        dm = np.zeros(d.shape[:-1])
 
-            if (d(start[i]) > 0):
-                delta = delta + (d(stop[i]) - d(stop[i] - 1)) / 2.0
+        for length in PropagationClearAir._zone_section_lengths(d, zone, zone_r):
+            dm = dm + length
 
-            dm = dm + d(stop[i]) - d(start[i]) + delta
-
-        omega = dm / (d[-1] - d[0])
+        omega = dm / (d[..., -1] - d[..., 0])
 
         return omega
 
+    @staticmethod
+    def specific_attenuation(f, press, rho, T):
+        # specific attenuation due to dry air and water vapor (dB/km) for
+        # each value of the water vapour density rho
+        rho = np.asarray(rho, dtype=float)
+        values, inverse = np.unique(rho, return_inverse=True)
+        gamma = np.empty(values.shape)
+        for i, value in enumerate(values):
+            [g_0, g_w] = p676_ga(f, press, value, T, True)
+            gamma[i] = g_0 + g_w
+
+        return gamma[inverse].reshape(rho.shape)
+
     @staticmethod
     def pl_los(d, f, p, b0, w, T, press, dlt, dlr):
 
@@ -329,9 +352,7 @@ class PropagationClearAir(Propagation):
         rho = 7.5 + 2.5 * w
 
         # compute specific attenuation due to dry air and water vapor:
-        [g_0, g_w] = p676_ga(f, press, rho, T, True)
-
-        Ag = (g_0 + g_w) * d
+        Ag = PropagationClearAir.specific_attenuation(f, press, rho, T) * d
 
         # Basic transmission loss due to free - space propagation and attenuation
         # by atmospheric gases
@@ -390,79 +411,58 @@ class PropagationClearAir(Propagation):
             Alf = 45.375 - 137.0 * f + 92.5 * f * f
 
         # site - shielding diffraction losses for the interfering and interfered -with
-        # stations(48)
-
-        theta_t1 = theta_t - 0.1 * dlt
-        theta_r1 = theta_r - 0.1 * dlr
+        # stations(48). They are zero if theta_t1 (theta_r1) is not positive
+        theta_t1 = np.maximum(theta_t - 0.1 * dlt, 0)
+        theta_r1 = np.maximum(theta_r - 0.1 * dlr, 0)
 
-        Ast = 0
-        Asr = 0
+        Ast = 20 * np.log10(
+            1 + 0.361 * theta_t1 *
+            np.sqrt(f * dlt),
+        ) + 0.264 * theta_t1 * f ** (1 / 3)
 
-        if theta_t1 > 0:
-            Ast = 20 * np.log10(
-                1 + 0.361 * theta_t1 *
-                np.sqrt(f * dlt),
-            ) + 0.264 * theta_t1 * f ** (1 / 3)
-
-        if theta_r1 > 0:
-            Asr = 20 * np.log10(
-                1 + 0.361 * theta_r1 *
-                np.sqrt(f * dlr),
-            ) + 0.264 * theta_r1 * f ** (1 / 3)
+        Asr = 20 * np.log10(
+            1 + 0.361 * theta_r1 *
+            np.sqrt(f * dlr),
+        ) + 0.264 * theta_r1 * f ** (1 / 3)
 
         # over - sea surface duct coupling correction for the interfering and
         # interfered-with stations(49) and (49a)
-        Act = 0
-        Acr = 0
-
-        if dct <= 5:
-            if dct <= dlt:
-                if omega >= 0.75:
-                    Act = -3 * np.exp(-0.25 * dct * dct) * \
-                        (1 + np.tanh(0.07 * (50 - hts)))
-
-        if dcr <= 5:
-            if dcr <= dlr:
-                if omega >= 0.75:
-                    Acr = -3 * np.exp(-0.25 * dcr * dcr) * \
-                        (1 + np.tanh(0.07 * (50 - hrs)))
+        Act = np.where(
+            (dct <= 5) & (dct <= dlt) & (omega >= 0.75),
+            -3 * np.exp(-0.25 * dct * dct) * (1 + np.tanh(0.07 * (50 - hts))),
+            0,
+        )
+        Acr = np.where(
+            (dcr <= 5) & (dcr <= dlr) & (omega >= 0.75),
+            -3 * np.exp(-0.25 * dcr * dcr) * (1 + np.tanh(0.07 * (50 - hrs))),
+            0,
+        )
 
         # specific attenuation(51)
         gamma_d = 5e-5 * ae * f ** (1 / 3)
 
         # angular distance(corrected where appropriate) (52 - 52a)
-
-        theta_t1 = theta_t
-        theta_r1 = theta_r
-
-        if theta_t > 0.1 * dlt:
-            theta_t1 = 0.1 * dlt
-
-        if theta_r > 0.1 * dlr:
-            theta_r1 = 0.1 * dlr
+        theta_t1 = np.minimum(theta_t, 0.1 * dlt)
+        theta_r1 = np.minimum(theta_r, 0.1 * dlr)
 
         theta1 = 1e3 * dtot / ae + theta_t1 + theta_r1
 
-        dI = min(dtot - dlt - dlr, 40)
+        dI = np.minimum(dtot - dlt - dlr, 40)
 
-        mu3 = 1
-
-        if hm > 10:
-            mu3 = np.exp(-4.6e-5 * (hm - 10) * (43 + 6 * dI))
+        # mu3 is 1 if hm <= 10
+        mu3 = np.exp(-4.6e-5 * (np.maximum(hm, 10) - 10) * (43 + 6 * dI))
 
         tau = 1 - np.exp(-(4.12e-4 * dlm ** 2.41))
 
         epsilon = 3.5
 
-        alpha = -0.6 - epsilon * 1e-9 * dtot ** (3.1) * tau
+        alpha = np.maximum(-0.6 - epsilon * 1e-9 * dtot ** (3.1) * tau, -3.4)
 
-        if alpha < -3.4:
-            alpha = -3.4
         # correction for path geometry:
-        mu2 = (500 / ae * dtot ** 2 / (np.sqrt(hte) + np.sqrt(hre)) ** 2) ** alpha
-
-        if mu2 > 1:
-            mu2 = 1
+        mu2 = np.minimum(
+            (500 / ae * dtot ** 2 / (np.sqrt(hte) + np.sqrt(hre)) ** 2) ** alpha,
+            1,
+        )
 
         beta = b0 * mu2 * mu3
 
@@ -487,9 +487,7 @@ class PropagationClearAir(Propagation):
         rho = 7.5 + 2.5 * omega
 
         # compute specific attenuation due to dry air and water vapor:
-        [g_0, g_w] = p676_ga(f, press, rho, T, True)
-
-        Ag = (g_0 + g_w) * dtot
+        Ag = PropagationClearAir.specific_attenuation(f, press, rho, T) * dtot
 
         # total of fixed coupling losses(except for local clutter losses) between
         # the antennas and the anomalous propagation structure within the atmosphere (47)
@@ -506,6 +504,7 @@ class PropagationClearAir(Propagation):
 
     @staticmethod
     def dl_bull(d, h, hts, hrs, ap, f):
+        # d and h hold one profile per row, hts and hrs one value per profile
 
         # Effective Earth curvature Ce(km ^ -1)
         Ce = 1 / ap
@@ -514,55 +513,62 @@ class PropagationClearAir(Propagation):
         lamb = 0.3 / f
 
         # Complete path length
-        dtot = d[-1] - d[0]
+        dtot = (d[:, -1] - d[:, 0])[:, np.newaxis]
+        hts = np.reshape(hts, (-1, 1))
+        hrs = np.reshape(hrs, (-1, 1))
 
         # Find the intermediate profile point with the highest slope of the line
         # from the transmitter to the point
 
-        di = d[1: -1]
-        hi = h[1:- 1]
+        di = d[:, 1: -1]
+        hi = h[:, 1:- 1]
 
-        Stim = np.max((hi + 500 * Ce * di * (dtot - di) - hts) / di)
+        Stim = np.max((hi + 500 * Ce * di * (dtot - di) - hts) / di, axis=1)
 
         # Calculate the slope of the line from transmitter to receiver assuming a
         # LoS path
-        Str = (hrs - hts) / dtot
-
-        if Stim < Str:  # Case 1, Path is LoS
+        Str = (hrs - hts)[:, 0] / dtot[:, 0]
+
+        # Case 1, Path is LoS
+        # Find the intermediate profile point with the highest diffraction parameter nu:
+        numax = np.max(
+            (
+                hi + 500 * Ce * di * (dtot - di) -
+                (hts * (dtot - di) + hrs * di) / dtot
+            ) *
+            np.sqrt(0.002 * dtot / (lamb * di * (dtot - di))),
+            axis=1,
+        )
 
-            # Find the intermediate profile point with the highest diffraction parameter nu:
-            numax = np.max(
-                (
-                    hi + 500 * Ce * di * (dtot - di) -
-                    (hts * (dtot - di) + hrs * di) / dtot
-                ) *
-                np.sqrt(0.002 * dtot / (lamb * di * (dtot - di))),
-            )
+        # Path is transhorizon
+        # Find the intermediate profile pointwith the highest slope of the
+        # line from the receiver to the point
+        Srim = np.max(
+            (hi + 500 * Ce * di * (dtot - di) - hrs) / (dtot - di),
+            axis=1,
+        )
 
-            Luc = 0
-            if numax > -0.78:
-                Luc = 6.9 + 20 * \
-                    np.log10(np.sqrt((numax - 0.1) ** 2 + 1) + numax - 0.1)
-        else:
-            # Path is transhorizon
-            # Find the intermediate profile pointwith the highest slope of the
-            # line from the receiver to the point
-            Srim = np.max(
-                (hi + 500 * Ce * di * (dtot - di) - hrs) / (dtot - di),
-            )
+        hts = hts[:, 0]
+        hrs = hrs[:, 0]
+        dtot = dtot[:, 0]
 
-            # Calculate the distance of the Bullington point from the transmitter:
-            dbp = (hrs - hts + Srim * dtot) / (Stim + Srim)
+        # Calculate the distance of the Bullington point from the transmitter:
+        dbp = (hrs - hts + Srim * dtot) / (Stim + Srim)
 
-            # Calculate the diffraction parameter, nub, for the Bullington point
+        # Calculate the diffraction parameter, nub, for the Bullington point
+        # (only valid for transhorizon paths)
+        with np.errstate(divide="ignore", invalid="ignore"):
             nub = (hts + Stim * dbp - (hts * (dtot - dbp) + hrs * dbp) / dtot) * \
                 np.sqrt(0.002 * dtot / (lamb * dbp * (dtot - dbp)))
 
-            # The knife - edge loss for the Bullington point is given by
-            Luc = 0
-            if nub > -0.78:
-                Luc = 6.9 + 20 * \
-                    np.log10(np.sqrt((nub - 0.1) ** 2 + 1) + nub - 0.1)
+        nu = np.where(Stim < Str, numax, nub)
+
+        # The knife - edge loss for the Bullington point is given by
+        Luc = np.where(
+            nu > -0.78,
+            6.9 + 20 * np.log10(np.sqrt((nu - 0.1) ** 2 + 1) + nu - 0.1),
+            0,
+        )
 
         # For Luc calculated using either(17) or (21), Bullington diffraction loss
         # for the path is given by
@@ -571,14 +577,18 @@ class PropagationClearAir(Propagation):
 
     @staticmethod
     def dl_se_ft_inner(epsr, sigma, d, hte, hre, adft, f):
+        # Results have the horizontal (1) and vertical (2) polarizations along
+        # the first axis
+
         # Normalized factor for surface admittance for horizontal (1) and vertical
         # (2) polarizations
-        K = np.empty(2)
-        K[0] = 0.036 * (adft * f) ** (-1 / 3) * (
+        K_h = 0.036 * (adft * f) ** (-1 / 3) * (
             (epsr - 1) **
             2 + (18 * sigma / f) ** 2
         ) ** (-1 / 4)
-        K[1] = K[0] * (epsr ** 2 + (18 * sigma / f) ** 2) ** (1 / 2)
+        K_v = K_h * (epsr ** 2 + (18 * sigma / f) ** 2) ** (1 / 2)
+        K_h, K_v, _ = np.broadcast_arrays(K_h, K_v, d)
+        K = np.stack((K_h, K_v))
 
         # Earth ground / polarization parameter
         beta_dft = (1 + 1.6 * K ** 2 + 0.67 * K**4) / \
@@ -591,38 +601,30 @@ class PropagationClearAir(Propagation):
         Yt = 0.9575 * beta_dft * (f ** 2 / adft) ** (1 / 3) * hte
         Yr = 0.9575 * beta_dft * (f ** 2 / adft) ** (1 / 3) * hre
 
-        # Calculate the distance term given by:
-        Fx = np.empty(2)
-        for ii in range(2):
-            if X[ii] >= 1.6:
-                Fx[ii] = 11 + 10 * np.log10(X[ii]) - 17.6 * X[ii]
-            else:
-                Fx[ii] = -20 * np.log10(X[ii]) - 5.6488 * (X[ii]) ** 1.425
-
-        Bt = beta_dft * Yt
-        Br = beta_dft * Yr
-
-        GYt = np.empty(2)
-        GYr = np.empty(2)
-
-        for ii in range(2):
-            if Bt[ii] > 2:
-                GYt[ii] = 17.6 * (Bt[ii] - 1.1) ** 0.5 - 5 * \
-                    np.log10(Bt[ii] - 1.1) - 8
-            else:
-                GYt[ii] = 20 * np.log10(Bt[ii] + 0.1 * Bt[ii] ** 3)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Calculate the distance term given by:
+            Fx = np.where(
+                X >= 1.6,
+                11 + 10 * np.log10(X) - 17.6 * X,
+                -20 * np.log10(X) - 5.6488 * (X) ** 1.425,
+            )
 
-            if Br[ii] > 2:
-                GYr[ii] = 17.6 * (Br[ii] - 1.1) ** 0.5 - 5 * \
-                    np.log10(Br[ii] - 1.1) - 8
-            else:
-                GYr[ii] = 20 * np.log10(Br[ii] + 0.1 * Br[ii] ** 3)
+            Bt = beta_dft * Yt
+            Br = beta_dft * Yr
 
-            if GYr[ii] < 2 + 20 * np.log10(K[ii]):
-                GYr[ii] = 2 + 20 * np.log10(K[ii])
+            GYt = np.where(
+                Bt > 2,
+                17.6 * (Bt - 1.1) ** 0.5 - 5 * np.log10(Bt - 1.1) - 8,
+                20 * np.log10(Bt + 0.1 * Bt ** 3),
+            )
+            GYr = np.where(
+                Br > 2,
+                17.6 * (Br - 1.1) ** 0.5 - 5 * np.log10(Br - 1.1) - 8,
+                20 * np.log10(Br + 0.1 * Br ** 3),
+            )
 
-            if GYt[ii] < 2 + 20 * np.log10(K[ii]):
-                GYt[ii] = 2 + 20 * np.log10(K[ii])
+        GYr = np.maximum(GYr, 2 + 20 * np.log10(K))
+        GYt = np.maximum(GYt, 2 + 20 * np.log10(K))
 
         Ldft = -Fx - GYt - GYr
 
@@ -653,19 +655,21 @@ class PropagationClearAir(Propagation):
 
     @staticmethod
     def dl_se(d, hte, hre, ap, f, omega):
+        # Results have the polarizations along the first axis
+
         # Wavelength in meters
         lamb = 0.3 / f
 
         # Calculate the marginal LoS distance for a smooth path
         dlos = np.sqrt(2 * ap) * (np.sqrt(0.001 * hte) + np.sqrt(0.001 * hre))
 
-        if d >= dlos:
-            # calculate diffraction loss Ldft using the method in Sec.4.2.2.1 for
-            # adft = ap and set Ldsph to Ldft
-            Ldsph = PropagationClearAir.dl_se_ft(d, hte, hre, ap, f, omega)
-        else:
-            # calculate the smallest clearance between the curved - Earth path and
-            # the ray between the antennas, hse
+        # for d >= dlos, calculate diffraction loss Ldft using the method in
+        # Sec.4.2.2.1 for adft = ap and set Ldsph to Ldft
+        Ldsph_los = PropagationClearAir.dl_se_ft(d, hte, hre, ap, f, omega)
+
+        # otherwise, calculate the smallest clearance between the curved - Earth
+        # path and the ray between the antennas, hse
+        with np.errstate(divide="ignore", invalid="ignore"):
             c = (hte - hre) / (hte + hre)
             m = 250 * d * d / (ap * (hte + hre))
 
@@ -684,22 +688,20 @@ class PropagationClearAir(Propagation):
             # Calculate the required clearance for zero diffraction loss
             hreq = 17.456 * np.sqrt(dse1 * dse2 * lamb / d)
 
-            if hse > hreq:
-                Ldsph = np.array([0, 0])
-            else:
-                # calculate the modified effective Earth radius aem, which gives
-                # marginal LoS at distance d
-                aem = 500 * (d / (np.sqrt(hte) + np.sqrt(hre)))**2
+            # calculate the modified effective Earth radius aem, which gives
+            # marginal LoS at distance d
+            aem = 500 * (d / (np.sqrt(hte) + np.sqrt(hre)))**2
 
-                # Use the method in Sec.4.2.2.1 for adft ) aem to obtain Ldft
-                Ldft = PropagationClearAir.dl_se_ft(d, hte, hre, aem, f, omega)
+            # Use the method in Sec.4.2.2.1 for adft ) aem to obtain Ldft
+            Ldft = PropagationClearAir.dl_se_ft(d, hte, hre, aem, f, omega)
 
-                if (Ldft < 0).any():
-                    Ldsph = np.array([0, 0])
-                else:
-                    Ldsph = (1 - hse / hreq) * Ldft
+            Ldsph = np.where(
+                (hse > hreq) | np.any(Ldft < 0, axis=0),
+                0,
+                (1 - hse / hreq) * Ldft,
+            )
 
-        return Ldsph
+        return np.where(d >= dlos, Ldsph_los, Ldsph)
 
     @staticmethod
     def dl_delta_bull(d, h, hts, hrs, hstd, hsrd, ap, f, omega):
@@ -712,7 +714,7 @@ class PropagationClearAir(Propagation):
         # set to zero and modified antenna heights given by
         hts1 = hts - hstd
         hrs1 = hrs - hsrd
-        h1 = np.zeros(h.size)
+        h1 = np.zeros(h.shape)
 
         # where hstd and hsrd are given in 5.1 .6.3 of Attachment 2. Set the
         # resulting Bullington diffraction loss for this smooth path to Lbulls
@@ -722,14 +724,12 @@ class PropagationClearAir(Propagation):
         # for the actual path length (dtot) with
         hte = hts1
         hre = hrs1
-        dtot = d[-1] - d[0]
+        dtot = d[:, -1] - d[:, 0]
 
         Ldsph = PropagationClearAir.dl_se(dtot, hte, hre, ap, f, omega)
 
         # Diffraction loss for the general paht is now given by
-        Ld = np.empty(2)
-        Ld[0] = Lbulla + max(Ldsph[0] - Lbulls, 0)
-        Ld[1] = Lbulla + max(Ldsph[1] - Lbulls, 0)
+        Ld = Lbulla + np.maximum(Ldsph - Lbulls, 0)
 
         return Ld
 
@@ -747,26 +747,24 @@ class PropagationClearAir(Propagation):
             d, h, hts, hrs, hstd, hsrd, ap, f, omega,
         )
 
-        if p == 50:
-            Ldp = Ld50
-        elif p < 50:
-            # Use the method in 4.2.3 to calculate diffraction loss Ld for effective
-            # Earth radius ap = abeta, as given in equation(6b).Set diffraction loss
-            # not exceeded for beta0 % time Ldb = Ld
-            ap = ab
+        # For p < 50, use the method in 4.2.3 to calculate diffraction loss Ld
+        # for effective Earth radius ap = abeta, as given in equation(6b). Set
+        # diffraction loss not exceeded for beta0 % time Ldb = Ld
+        ap = ab
 
-            Ldb = PropagationClearAir.dl_delta_bull(
-                d, h, hts, hrs, hstd, hsrd, ap, f, omega,
-            )
+        Ldb = PropagationClearAir.dl_delta_bull(
+            d, h, hts, hrs, hstd, hsrd, ap, f, omega,
+        )
 
-            # Compute the interpolation factor Fi
-            if p > b0:
-                Fi = inv_cum_norm(p / 100) / inv_cum_norm(b0 / 100)
-            else:
-                Fi = 1
+        # Compute the interpolation factor Fi
+        Fi = np.where(
+            p > b0,
+            inv_cum_norm(np.minimum(p, 50) / 100) / inv_cum_norm(np.minimum(b0, 50) / 100),
+            1,
+        )
 
-            # The diffraction loss Ldp not exceeded for p of time is now given by
-            Ldp = Ld50 + Fi * (Ldb - Ld50)
+        # The diffraction loss Ldp not exceeded for p of time is now given by
+        Ldp = np.where(p < 50, Ld50 + Fi * (Ldb - Ld50), Ld50)
 
         return Ldp, Ld50
 
@@ -838,6 +836,9 @@ class PropagationClearAir(Propagation):
     ) -> np.array:
         """Calculates the loss according to P.452
 
+        All the links are calculated at once: path profiles are stored as
+        arrays with one row per link and one column per profile point.
+
         Parameters
         ----------
         distance : np.ndarray
@@ -863,6 +864,14 @@ class PropagationClearAir(Propagation):
             error_message = "different frequencies not supported in P.452"
             raise ValueError(error_message)
 
+        if (self.model_params.polarization).lower() == "horizontal":
+            polarization = 0
+        elif (self.model_params.polarization).lower() == "vertical":
+            polarization = 1
+        else:
+            error_message = "invalid polarization"
+            raise ValueError(error_message)
+
         # TODO: Remove unecessary assignments
         Ph = np.asarray(self.model_params.atmospheric_pressure)
         T = np.asarray(self.model_params.air_temperature)
@@ -883,172 +892,151 @@ class PropagationClearAir(Propagation):
         tx_gain = np.ravel(tx_gain)
         rx_gain = np.ravel(rx_gain)
 
+        f = frequency[0]
+
         # Modify the path according to Section 4.5.4, Step 1  and compute clutter losses
         # consider no obstacles profile
         profile_length = 100
-        num_dists = distance.size
-        d = np.empty([num_dists, profile_length])
-        for ii in range(num_dists):
-            d[ii, :] = np.linspace(0, distance[0][ii], profile_length)
+        if profile_length < 4:
+            error_message = "tl_p452: path profile requires at least 4 points."
+            raise ValueError(error_message)
 
+        d = np.linspace(0, np.ravel(distance), profile_length, axis=1)
         h = np.zeros(d.shape)
 
-        ha_t = []
-        ha_r = []
-        dk_t = []
-        dk_r = []
-
         # Compute the path profile parameters
         # Path center latitude
         phi_path = (tx_lat + rx_lat) / 2
 
         # Compute dtm - the longest continuous land(inland + coastal) section of the great - circle path(km)
         # Compute  dlm - the longest continuous inland section of the great-circle path (km)
-
-        dtm = np.empty(num_dists)
-        dlm = np.empty(num_dists)
-
         zone = np.ones(profile_length) * 2
-        for index in range(num_dists):
-
-            zone_r = 12
-            dtm[index] = self.longest_cont_dist(d[index, :], zone, zone_r)
-
-            zone_r = 2
-            dlm[index] = self.longest_cont_dist(d[index, :], zone, zone_r)
+        dtm = self.longest_cont_dist(d, zone, 12)
+        dlm = self.longest_cont_dist(d, zone, 2)
 
         # compute beta0
         b0 = self.beta0(phi_path, dtm, dlm)
         [ae, ab] = self.earth_rad_eff(deltaN)
 
         # Compute the path fraction over sea
-        omega = self.path_fraction(d.transpose(), zone, 3)
+        omega = self.path_fraction(d, zone, 3)
+
+        # The path would be modified according to Section 4.5.4, Step 1 by
+        # closs_corr, and clutter losses computed, only if the clutter
+        # heights ha_t and ha_r were given. They are not, so the path is
+        # kept and there are no clutter losses at the terminals
+        htg = Hte
+        hrg = Hre
+        Aht = 0
+        Ahr = 0
 
-        # Modify the path according to Section 4.5.4, Step 1 and compute clutter losses
-        # only if not isempty ha_t and ha_r
-        # [dc, hc, zonec, htgc, hrgc, Aht, Ahr] = self.closs_corr(f, d, h, zone, Hte, Hre, ha_t, ha_r, dk_t, dk_r)
+        [
+            hst, hsr, hstd, hsrd, hte, hre, hm, dlt,
+            dlr, theta_t, theta_r, theta, pathtype,
+        ] = self.smooth_earth_heights(d, h, htg, hrg, ae, f)
 
-        Lb = np.empty([1, num_dists])
+        dtot = d[:, -1] - d[:, 0]
+
+        # Tx and Rx antenna heights above mean sea level amsl(m)
+        hts = h[:, 0] + htg
+        hrs = h[:, -1] + hrg
 
         # Effective Earth curvature Ce(km ^ -1)
         Ce = 1 / ae
 
-        # Wavelength in meters
+        # Find the intermediate profile point with the highest slope of the line
+        # from the transmitter to the point
+        di = d[:, 1: -1]
+        hi = h[:, 1: -1]
+
+        Stim = np.max(
+            (hi + 500 * Ce * di * (dtot[:, np.newaxis] - di) - hts[:, np.newaxis]) / di,
+            axis=1,
+        )
+
+        # Calculate the slope of the line from transmitter to receiver assuming a
+        # LoS path
+        Str = (hrs - hts) / dtot
 
         # Calculate an interpolation factor Fj to take account of the path angular
         # distance(58)
         THETA = 0.3
         KSI = 0.8
 
-        for ii in range(num_dists):
-            [dc, hc, zonec, htg, hrg, Aht, Ahr] = self.closs_corr(
-                frequency, d[ii, :], h[ii, :], zone, Hte, Hre, ha_t, ha_r, dk_t, dk_r,
-            )
-            d[ii, :] = dc
-            h[ii, :] = hc
-
-            [
-                hst, hsr, hstd, hsrd, hte, hre, hm, dlt,
-                dlr, theta_t, theta_r, theta, pathtype,
-            ] = self.smooth_earth_heights(d[ii, :], h[ii, :], htg, hrg, ae, frequency)
-
-            dtot = d[ii, -1] - d[ii, 0]
-
-            # Tx and Rx antenna heights above mean sea level amsl(m)
-            hts = hc[0] + htg
-            hrs = hc[-1] + hrg
-
-            # Find the intermediate profile point with the highest slope of the line
-            # from the transmitter to the point
-
-            if len(d[ii]) < 4:
-                error_message = "tl_p452: path profile requires at least 4 points."
-                raise ValueError(error_message)
-
-            di = d[ii, 1: -1]
-            hi = h[ii, 1: -1]
+        # changed the definition for Fj on 15DEC16.
+        # Fj = 1.0 - 0.5 * (1.0 + tanh(3.0 * KSI * (theta - THETA) / THETA))
+        Fj = 1.0 - 0.5 * (1.0 + np.tanh(3.0 * KSI * (Stim - Str) / THETA))
 
-            Stim = max((hi + 500 * Ce * di * (dtot - di) - hts) / di)
+        # Calculate an interpolation factor, Fk, to take account of the great
+        # circle path distance:
+        dsw = 20
+        kappa = 0.5
 
-            # Calculate the slope of the line from transmitter to receiver assuming a
-            # LoS path
-            Str = (hrs - hts) / dtot
+        Fk = 1.0 - 0.5 * (1.0 + np.tanh(3.0 * kappa * (dtot - dsw) / dsw))
 
-            # changed the definition for Fj on 15DEC16.
-            # Fj = 1.0 - 0.5 * (1.0 + tanh(3.0 * KSI * (theta - THETA) / THETA))
-            Fj = 1.0 - 0.5 * (1.0 + np.tanh(3.0 * KSI * (Stim - Str) / THETA))
-
-            # Calculate an interpolation factor, Fk, to take account of the great
-            # circle path distance:
-            dsw = 20
-            kappa = 0.5
-
-            Fk = 1.0 - 0.5 * (1.0 + np.tanh(3.0 * kappa * (dtot - dsw) / dsw))
-
-            [Lbfsg, Lb0p, Lb0b] = self.pl_los(
-                dtot, frequency, p[ii], b0[ii], omega[ii], T, Ph, dlt, dlr,
-            )
-
-            [Ldp, Ld50] = self.dl_p(
-                d[ii], h[ii], hts, hrs, hstd, hsrd, frequency, omega[ii], p[ii], b0[ii], deltaN,
-            )
+        [Lbfsg, Lb0p, Lb0b] = self.pl_los(
+            dtot, f, p, b0, omega, T, Ph, dlt, dlr,
+        )
 
-            # The median basic transmission loss associated with diffraction Eq (43)
-            Lbd50 = Lbfsg + Ld50
+        # diffraction losses have the polarizations along the first axis
+        [Ldp, Ld50] = self.dl_p(
+            d, h, hts, hrs, hstd, hsrd, f, omega, p, b0, deltaN,
+        )
 
-            # The basic tranmission loss associated with diffraction not exceeded for p % time Eq(44)
-            Lbd = Lb0p + Ldp
+        # The median basic transmission loss associated with diffraction Eq (43)
+        Lbd50 = Lbfsg + Ld50
 
-            # A notional minimum basic transmission loss associated with LoS
-            # propagation and over-sea sub-path diffraction
-            Lminb0p = Lb0p + (1 - omega[ii]) * Ldp
+        # The basic tranmission loss associated with diffraction not exceeded for p % time Eq(44)
+        Lbd = Lb0p + Ldp
 
-            if p[ii] >= b0[ii]:
-                Fi = inv_cum_norm(p[ii] / 100) / inv_cum_norm(b0[ii] / 100)
-                Lminb0p = Lbd50 + (Lb0b + (1 - omega[ii]) * Ldp - Lbd50) * Fi
+        # A notional minimum basic transmission loss associated with LoS
+        # propagation and over-sea sub-path diffraction
+        Fi = inv_cum_norm(np.minimum(p, 50) / 100) / \
+            inv_cum_norm(np.minimum(b0, 50) / 100)
+        Lminb0p = np.where(
+            p >= b0,
+            Lbd50 + (Lb0b + (1 - omega) * Ldp - Lbd50) * Fi,
+            Lb0p + (1 - omega) * Ldp,
+        )
 
-            # Calculate a notional minimum basic transmission loss associated with LoS
-            # and transhorizon signal enhancements
-            eta = 2.5
+        # Calculate a notional minimum basic transmission loss associated with LoS
+        # and transhorizon signal enhancements
+        eta = 2.5
 
-            Lba = self.tl_anomalous(
-                dtot, dlt, dlr, Dct, Dcr, dlm[ii], hts, hrs, hte, hre, hm, theta_t, theta_r,
-                frequency, p[ii], T, Ph,
-                omega[ii], ae, b0[ii],
-            )
+        Lba = self.tl_anomalous(
+            dtot, dlt, dlr, Dct, Dcr, dlm, hts, hrs, hte, hre, hm, theta_t, theta_r,
+            f, p, T, Ph,
+            omega, ae, b0,
+        )
 
-            Lminbap = eta * np.log(np.exp(Lba / eta) + np.exp(Lb0p / eta))
+        Lminbap = eta * np.log(np.exp(Lba / eta) + np.exp(Lb0p / eta))
 
-            # Calculate a notional basic transmission loss associated with diffraction
-            # and LoS or ducting / layer reflection enhancements
-            Lbda = Lbd
-            if (Lbd >= Lminbap).any():
-                Lbda = Lminbap + (Lbd - Lminbap) * Fk
+        # Calculate a notional basic transmission loss associated with diffraction
+        # and LoS or ducting / layer reflection enhancements
+        Lbda = np.where(
+            np.any(Lbd >= Lminbap, axis=0),
+            Lminbap + (Lbd - Lminbap) * Fk,
+            Lbd,
+        )
 
-            # Calculate a modified basic transmission loss, which takes diffraction and
-            # LoS or ducting / layer - reflection enhancements into account
-            Lbam = Lbda + (Lminb0p - Lbda) * Fj
+        # Calculate a modified basic transmission loss, which takes diffraction and
+        # LoS or ducting / layer - reflection enhancements into account
+        Lbam = Lbda + (Lminb0p - Lbda) * Fj
 
-            # Calculate the basic transmission loss due to troposcatter not exceeded
-            # for any time percantage p
-            Lbs = self.tl_tropo(
-                dtot, theta, frequency,
-                p[ii], T, Ph, N0, tx_gain[ii], rx_gain[ii],
-            )
+        # Calculate the basic transmission loss due to troposcatter not exceeded
+        # for any time percantage p
+        Lbs = self.tl_tropo(
+            dtot, theta, f,
+            p, T, Ph, N0, tx_gain, rx_gain,
+        )
 
-            # Calculate the final transmission loss not exceeded for p % time
-            Lb_pol = -5 * np.log10(
-                10 ** (-0.2 * Lbs) +
-                10 ** (-0.2 * Lbam),
-            ) + Aht + Ahr
+        # Calculate the final transmission loss not exceeded for p % time
+        Lb_pol = -5 * np.log10(
+            10 ** (-0.2 * Lbs) +
+            10 ** (-0.2 * Lbam),
+        ) + Aht + Ahr
 
-            if (self.model_params.polarization).lower() == "horizontal":
-                Lb[0, ii] = Lb_pol[0]
-            elif (self.model_params.polarization).lower() == "vertical":
-                Lb[0, ii] = Lb_pol[1]
-            else:
-                error_message = "invalid polarization"
-                raise ValueError(error_message)
+        Lb = np.reshape(Lb_pol[polarization], distance.shape)
 
         if self.model_params.clutter_loss:
             clutter_loss = self.clutter.get_loss(
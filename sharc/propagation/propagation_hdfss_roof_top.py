@@ -7,7 +7,6 @@ Created on Mon Jul 30 17:28:47 2018
 
 import numpy as np
 import sys
-from shapely.geometry import LineString, Polygon, Point
 from sharc.parameters.constants import SPEED_OF_LIGHT
 
 from sharc.parameters.parameters_hdfss import ParametersHDFSS
@@ -298,26 +297,43 @@ class PropagationHDFSSRoofTop(Propagation):
         return loss
 
     def get_diff_distances(self, imt_x, imt_y, imt_z, es_x, es_y, es_z, dist_2D=False):
+        """
+        Calculates the distances of the diffraction over the roof edge of the
+        Earth station building, for all the IMT stations at once.
+
+        The length of the path from the Earth station to each IMT station
+        that is inside the building is found with the slab method: the path
+        is inside the building for the part that is inside both the x and y
+        ranges of the building.
 
-        build_poly = Polygon([
-            [es_x + self.b_w / 2, es_y + self.b_d / 2],
-            [es_x - self.b_w / 2, es_y + self.b_d / 2],
-            [es_x - self.b_w / 2, es_y - self.b_d / 2],
-            [es_x + self.b_w / 2, es_y - self.b_d / 2],
-        ])
-        es_point = Point([es_x, es_y])
-
-        d1_2D = np.zeros_like(imt_x)
-        d2_2D = np.zeros_like(imt_x)
-        dist = np.zeros_like(imt_x)
-        for k, (x, y) in enumerate(zip(imt_x, imt_y)):
-            line = LineString([[es_x, es_y], [x, y]])
-            intersection_line = line.intersection(build_poly)
-            d1_2D[k] = intersection_line.length
-
-            imt_point = Point([x, y])
-            dist[k] = es_point.distance(imt_point)
-            d2_2D[k] = dist[k] - d1_2D[k]
+        Returns
+        -------
+            h, d1 and d2 arrays of the diffraction model or, if dist_2D is
+            True, the 2D distances inside and outside the building
+        """
+        imt_x = np.asarray(imt_x, dtype=float)
+        imt_y = np.asarray(imt_y, dtype=float)
+
+        # path parameter t in [0, 1] from the Earth station to the IMT station
+        t_in = np.zeros_like(imt_x)
+        t_out = np.ones_like(imt_x)
+        for es, imt, half_size in [
+            (es_x, imt_x, self.b_w / 2),
+            (es_y, imt_y, self.b_d / 2),
+        ]:
+            delta = imt - es
+            parallel = delta == 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t_1 = -half_size / delta
+                t_2 = half_size / delta
+            # paths parallel to the slab are inside it, as the Earth station
+            # is in the center of the building
+            t_in = np.where(parallel, t_in, np.maximum(t_in, np.minimum(t_1, t_2)))
+            t_out = np.where(parallel, t_out, np.minimum(t_out, np.maximum(t_1, t_2)))
+
+        dist = np.sqrt(np.power(imt_x - es_x, 2) + np.power(imt_y - es_y, 2))
+        d1_2D = np.maximum(t_out - t_in, 0) * dist
+        d2_2D = dist - d1_2D
 
         if dist_2D:
             return d1_2D, d2_2D
@@ -139,31 +139,108 @@ class PropagationIndoor(Propagation):
             array with path loss values with dimensions of distance_2D
 
         """
-        loss = PropagationIndoor.HIGH_PATH_LOSS * np.ones(frequency.shape)
-        iter = int(frequency.shape[0] / self.bs_per_building)
-        for i in range(iter):
-            bi = int(self.bs_per_building * i)
-            bf = int(self.bs_per_building * (i + 1))
-            ui = int(self.ue_per_building * i)
-            uf = int(self.ue_per_building * (i + 1))
-
-            # calculate basic path loss
-            loss[bi:bf, ui:uf] = self.bpl.get_loss(
-                distance_3D=distance_3D[bi:bf, ui:uf],
-                distance_2D=distance_2D[bi:bf, ui:uf],
-                frequency=frequency[bi:bf, ui:uf],
-                indoor=indoor_stations[0, ui:uf],
-                shadowing=shadowing_flag,
-            )
+        blocks = self.get_loss_blocks(
+            distance_3D, distance_2D, frequency, elevation, indoor_stations,
+            shadowing_flag,
+        )
+        return self.blocks_to_dense(blocks, frequency.shape)
+
+    def get_block_indices(self, shape: tuple) -> tuple:
+        """
+        Returns the indices of the BS's and UE's of each building, which
+        index the intra-building blocks of a (BS x UE) matrix.
+
+        Parameters
+        ----------
+            shape (tuple) : shape of the (BS x UE) matrix
+
+        Returns
+        -------
+            (bs_idx, ue_idx) tuple with arrays of shapes
+            (num_buildings, bs_per_building, 1) and
+            (num_buildings, 1, ue_per_building)
+        """
+        num_buildings = int(shape[0] / self.bs_per_building)
+        bs_idx = np.arange(num_buildings * int(self.bs_per_building)).reshape(
+            (num_buildings, -1, 1),
+        )
+        ue_idx = np.arange(num_buildings * int(self.ue_per_building)).reshape(
+            (num_buildings, 1, -1),
+        )
+        return bs_idx, ue_idx
+
+    def get_loss_blocks(
+        self, distance_3D: np.ndarray, distance_2D: np.ndarray, frequency: np.ndarray,
+        elevation: np.ndarray, indoor_stations: np.ndarray, shadowing_flag: bool,
+    ) -> np.array:
+        """
+        Calculates the path loss between the BS's and UE's of each building.
+        The blocks of all buildings are laid side by side and calculated in
+        a single call of the path loss models.
+
+        Parameters
+        ----------
+            same as get_loss
+
+        Returns
+        -------
+            array with shape (num_buildings, bs_per_building, ue_per_building)
+            with the path loss of each intra-building block
+        """
+        bs_idx, ue_idx = self.get_block_indices(frequency.shape)
+        num_buildings, bs_per_building, ue_per_building = \
+            bs_idx.shape[0], bs_idx.shape[1], ue_idx.shape[2]
+        if num_buildings == 0:
+            return np.empty((0, bs_per_building, ue_per_building))
 
-            # calculates the additional building entry loss for outdoor UE's
-            # that are served by indoor BS's
-            bel = (~ indoor_stations[0, ui:uf]) * self.bel.get_loss(
-                frequency[bi:bf, ui:uf], elevation[bi:bf, ui:uf], "RANDOM", self.building_class,
+        def side_by_side(values: np.ndarray) -> np.ndarray:
+            # (num_buildings, bs, ue) blocks to a (bs, num_buildings * ue) array
+            return np.transpose(values[bs_idx, ue_idx], (1, 0, 2)).reshape(
+                (bs_per_building, -1),
             )
 
-            loss[bi:bf, ui:uf] = loss[bi:bf, ui:uf] + bel
+        frequency_blocks = side_by_side(frequency)
+        indoor = indoor_stations[0, :num_buildings * ue_per_building]
 
+        # calculate basic path loss
+        loss = self.bpl.get_loss(
+            distance_3D=side_by_side(distance_3D),
+            distance_2D=side_by_side(distance_2D),
+            frequency=frequency_blocks,
+            indoor=indoor,
+            shadowing=shadowing_flag,
+        )
+
+        # calculates the additional building entry loss for outdoor UE's
+        # that are served by indoor BS's
+        bel = (~ indoor) * self.bel.get_loss(
+            frequency_blocks, side_by_side(elevation), "RANDOM", self.building_class,
+        )
+        loss = loss + bel
+
+        return np.transpose(
+            loss.reshape((bs_per_building, num_buildings, ue_per_building)),
+            (1, 0, 2),
+        )
+
+    def blocks_to_dense(self, blocks: np.ndarray, shape: tuple) -> np.array:
+        """
+        Returns the (BS x UE) path loss matrix of the intra-building blocks.
+        BS's and UE's of different buildings have HIGH_PATH_LOSS.
+
+        Parameters
+        ----------
+            blocks (np.array) : intra-building blocks, as returned by
+                get_loss_blocks
+            shape (tuple) : shape of the (BS x UE) matrix
+
+        Returns
+        -------
+            array with the path loss between each BS and UE
+        """
+        loss = np.full(shape, PropagationIndoor.HIGH_PATH_LOSS, dtype=float)
+        bs_idx, ue_idx = self.get_block_indices(shape)
+        loss[bs_idx, ue_idx] = blocks
         return loss
 
 
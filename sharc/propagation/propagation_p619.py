@@ -6,9 +6,6 @@ Created on Mon Apr 17 15:35:00 2017
 """
 
 
-import os
-import csv
-from scipy.interpolate import interp1d
 import numpy as np
 from multipledispatch import dispatch
 from sharc.station_manager import StationManager
@@ -18,9 +15,9 @@ from sharc.propagation.propagation_free_space import PropagationFreeSpace
 from sharc.propagation.propagation_clutter_loss import PropagationClutterLoss
 from sharc.propagation.propagation_building_entry_loss import PropagationBuildingEntryLoss
 from sharc.propagation.atmosphere import ReferenceAtmosphere
+from sharc.propagation.atmospheric_loss_table import AtmosphericLossTable
 from sharc.support.enumerations import StationType
 from sharc.propagation.scintillation import Scintillation
-from sharc.parameters.constants import EARTH_RADIUS
 
 
 class PropagationP619(Propagation):
@@ -72,10 +69,9 @@ class PropagationP619(Propagation):
 
         self.depolarization_loss = 0
         self.polarization_mismatch_loss = 0
-        self.elevation_has_atmospheric_loss = []
-        self.freq_has_atmospheric_loss = []
-        self.surf_water_dens_has_atmospheric_loss = []
-        self.atmospheric_loss = []
+        # atmospheric loss of the traced elevations, by (frequency, surface
+        # water vapour density)
+        self.atmospheric_loss = dict()
         self.elevation_delta = .01
 
         self.space_station_alt_m = space_station_alt_m
@@ -88,34 +84,27 @@ class PropagationP619(Propagation):
                 f"PropagationP619: Invalid value for parameter season - {season}. Possible values are \"SUMMER\", \"WINTER\".",
             )
         self.season = season
-        # Load city name based on latitude
-        self.lookup_table = False
-        self.city_name = self._get_city_name_by_latitude()
-        if self.city_name != "Unknown":
-            self.lookup_table = True
-
-    def _get_city_name_by_latitude(self):
-        localidades_file = os.path.join(
-            os.path.dirname(__file__), 'Dataset/localidades.csv',
-        )
-        with open(localidades_file, mode='r') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                if abs(float(row['Latitude']) - self.earth_station_lat_deg) < 1e-5:
-                    return row['Cidade']
-        return 'Unknown'
 
     def _get_atmospheric_gasses_loss(self, *args, **kwargs) -> float:
         """
         Calculates atmospheric gasses loss based on ITU-R P.619, Attachment C
 
+        By default, the loss is interpolated from an AtmosphericLossTable,
+        which is built once per frequency, Earth station and atmosphere.
+        Otherwise (and for negative elevations), the rays are traced through
+        the atmosphere, all together, and the loss of each elevation is
+        cached.
+
         Parameters
         ----------
             frequency_MHz (float) : center frequencies [MHz]
-            apparent_elevation (float) : apparent elevation angle at the Earth-based station (degrees)
+            apparent_elevation (float or np.array) : apparent elevation angle at the Earth-based station (degrees)
+            surf_water_vapour_density (float) : surface water vapour density (g/m**3). If not given, it is
+                obtained from the reference atmosphere at the Earth station latitude
+            lookupTable (bool) : whether the lookup table is used (default = True)
         Returns
         -------
-            path_loss (float): scalar with atmospheric loss
+            path_loss (float or np.array): atmospheric loss with the same shape as apparent_elevation
         """
         frequency_MHz = kwargs["frequency_MHz"]
         apparent_elevation = kwargs["apparent_elevation"]
@@ -124,115 +113,60 @@ class PropagationP619(Propagation):
             "surf_water_vapour_density", False,
         )
 
-        if lookupTable and self.city_name != 'Unknown':
-            # Define the path to the CSV file
-            output_dir = os.path.join(os.path.dirname(__file__), 'Dataset')
-            csv_file = os.path.join(
-                output_dir, f'{self.city_name}_{int(frequency_MHz)}_{int(self.earth_station_alt_m)}m.csv',
-            )
-            if os.path.exists(csv_file):
-                elevations = []
-                losses = []
-                with open(csv_file, mode='r') as file:
-                    reader = csv.reader(file)
-                    next(reader)  # Skip header
-                    for row in reader:
-                        elevations.append(float(row[0]))
-                        losses.append(float(row[1]))
-                interpolation_function = interp1d(
-                    elevations, losses, kind='linear', fill_value='extrapolate',
-                )
-                return interpolation_function(apparent_elevation)
-
-        earth_radius_km = EARTH_RADIUS / 1000
-        a_acc = 0.  # accumulated attenuation (in dB)
-        h = self.earth_station_alt_m / 1000  # ray altitude in km
-        beta = (90 - abs(apparent_elevation)) * np.pi / 180.  # incidence angle
-        print("Angulo incidencia: ",beta )
-        beta_degrees = beta * 180 / np.pi
-        print("Ángulo de incidencia en grados: ", beta_degrees)
-
         if not surf_water_vapour_density:
             _, _, surf_water_vapour_density = self.atmosphere.get_reference_atmosphere_p835(
                 self.earth_station_lat_deg, 0, season=self.season,
             )
 
-        if len(self.elevation_has_atmospheric_loss):
-            elevation_diff = np.abs(
-                apparent_elevation - np.array(self.elevation_has_atmospheric_loss),
+        apparent_elevation = np.asarray(apparent_elevation, dtype=float)
+        if lookupTable:
+            table = AtmosphericLossTable.get_table(
+                frequency_MHz,
+                self.earth_station_alt_m,
+                self.earth_station_lat_deg,
+                self.season,
+                surf_water_vapour_density,
             )
-            elevation_diff = np.abs(
-                apparent_elevation - np.array(self.elevation_has_atmospheric_loss),
-            )
-            indices = np.where(elevation_diff <= self.elevation_delta)
-            if indices[0].size:
-                index = np.argmin(elevation_diff)
-                if self.freq_has_atmospheric_loss[index] == frequency_MHz and \
-                   self.surf_water_dens_has_atmospheric_loss[index] == surf_water_vapour_density:
-                    return self.atmospheric_loss[index]
-
-        rho_s = surf_water_vapour_density * \
-            np.exp(h / 2)  # water vapour density at h
-        if apparent_elevation < 0:
-            t, p, e, n, gamma = self.atmosphere.get_atmospheric_params(
-                h, rho_s, frequency_MHz,
-            )
-            delta = .0001 + 0.01 * max(h, 0)  # layer thickness
-            r = earth_radius_km + h - delta  # radius of lower edge
-            while True:
-                m = (r + delta) * np.sin(beta) - r
-                if m >= 0:
-                    dh = 2 * np.sqrt(
-                        2 * r * (delta - m) +
-                        delta ** 2 - m ** 2,
-                    )  # horizontal path
-                    a_acc += dh * gamma
-                    break
-                ds = (r + delta) * np.cos(beta) - np.sqrt((r + delta) **
-                                                          2 * np.cos(beta) ** 2 - (2 * r * delta + delta ** 2))
-                a_acc += ds * gamma
-                # angle to vertical
-                alpha = np.arcsin((r + delta) / r * np.sin(beta))
-                h -= delta
-                r -= delta
-                t, p, e, n_new, gamma = self.atmosphere.get_atmospheric_params(
-                    h, rho_s, frequency_MHz,
+            loss = np.array(table.get_loss(np.maximum(apparent_elevation, 0)))
+            negative = apparent_elevation < 0
+            if np.any(negative):
+                loss[negative] = self._get_atmospheric_gasses_loss(
+                    frequency_MHz=frequency_MHz,
+                    apparent_elevation=apparent_elevation[negative],
+                    surf_water_vapour_density=surf_water_vapour_density,
+                    lookupTable=False,
                 )
-                delta = 0.0001 + 0.01 * max(h, 0)
-                beta = np.arcsin(n / n_new * np.sin(alpha))
-                n = n_new
+            return loss if loss.ndim else float(loss)
 
-        t, p, e, n, gamma = self.atmosphere.get_atmospheric_params(
-            h, rho_s, frequency_MHz,
-        )
-        delta = .0001 + .01 * max(h, 0)
-        r = earth_radius_km + h
-
-        while True:
-            ds = np.sqrt(
-                r ** 2 * np.cos(beta) ** 2 + 2 * r *
-                delta + delta ** 2,
-            ) - r * np.cos(beta)
-            a_acc += ds * gamma
-            alpha = np.arcsin(r / (r + delta) * np.sin(beta))
-            h += delta
-            if h >= 100:
-                break
-            r += delta
-            t, p, e, n_new, gamma = self.atmosphere.get_atmospheric_params(
-                h, rho_s, frequency_MHz,
-            )
-            beta = np.arcsin(n / n_new * np.sin(alpha))
-            n = n_new
-
-        self.atmospheric_loss.append(a_acc)
-        self.elevation_has_atmospheric_loss.append(apparent_elevation)
-        self.freq_has_atmospheric_loss.append(frequency_MHz)
-        self.surf_water_dens_has_atmospheric_loss.append(
-            surf_water_vapour_density,
-        )
+        # Losses are calculated and cached on a grid of elevation_delta, so
+        # that the returned value does not depend on the elevations that were
+        # requested before
+        apparent_elevation = np.round(
+            apparent_elevation / self.elevation_delta,
+        ) * self.elevation_delta
 
-        return a_acc
+        cache = self.atmospheric_loss.setdefault(
+            (float(frequency_MHz), float(surf_water_vapour_density)), dict(),
+        )
+        elevations, inverse = np.unique(apparent_elevation, return_inverse=True)
+        missing = [elevation for elevation in elevations if elevation not in cache]
+        if missing:
+            # rays of all the missing elevations are traced together
+            cache.update(zip(
+                missing,
+                AtmosphericLossTable.trace(
+                    frequency_MHz,
+                    self.earth_station_alt_m,
+                    surf_water_vapour_density,
+                    np.array(missing),
+                    atmosphere=self.atmosphere,
+                ),
+            ))
+
+        loss = np.array([cache[elevation] for elevation in elevations])[inverse]
+        loss = loss.reshape(apparent_elevation.shape)
+
+        return loss if loss.ndim else float(loss)
 
     @staticmethod
     def _get_beam_spreading_att(elevation, altitude, earth_to_space) -> np.array:
@@ -435,8 +369,8 @@ class PropagationP619(Propagation):
             raise ValueError(error_message)
 
         atmospheric_gasses_loss = self._get_atmospheric_gasses_loss(
-            frequency_MHz=freq_set,
-            apparent_elevation=np.mean(elevation["apparent"]),
+            frequency_MHz=freq_set[0],
+            apparent_elevation=elevation["apparent"],
         )
         beam_spreading_attenuation = self._get_beam_spreading_att(
             elevation["free_space"],
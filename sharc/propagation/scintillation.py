@@ -21,6 +21,50 @@ class Scintillation():
 
         self.atmosphere = ReferenceAtmosphere()
 
+        # wet refractivity of each Earth station site, by (latitude, altitude, season)
+        self._wet_refractivity = dict()
+
+    def get_wet_refractivity(
+        self,
+        earth_station_lat_deg: float,
+        earth_station_alt_m: float,
+        season: str,
+    ) -> float:
+        """
+        Calculates the wet term of the radio refractivity at the Earth station
+        according to ITU-R P.453-12, using the ITU-R P.835 reference atmosphere.
+        Values are calculated once for each site and then reused.
+
+        Parameters
+        ----------
+            earth_station_lat_deg (float) : Earth station latitude (degrees)
+            earth_station_alt_m (float) : Earth station altitude (m)
+            season (str) : season of the year, "summer"/"winter"
+
+        Returns
+        -------
+            wet_refractivity (float) : wet term of the radio refractivity
+        """
+        key = (float(earth_station_lat_deg), float(earth_station_alt_m), season)
+        if key not in self._wet_refractivity:
+            temperature, \
+                pressure, \
+                water_vapour_density = self.atmosphere.get_reference_atmosphere_p835(
+                    earth_station_lat_deg,
+                    earth_station_alt_m,
+                    season,
+                )
+
+            # calculate saturation water vapour pressure according to ITU-R P.453-12
+            # water coefficients (ice disregarded)
+            vapour_pressure = water_vapour_density * temperature / 216.7  # eq 10 in P453
+            self._wet_refractivity[key] = (
+                72 * vapour_pressure / temperature +
+                3.75e5 * vapour_pressure / temperature ** 2
+            )
+
+        return self._wet_refractivity[key]
+
     def get_tropospheric_attenuation(self, *args, **kwargs) -> np.array:
         """
         Calculates tropospheric scintillation based on ITU-R P.619, Appendix D
@@ -33,6 +77,8 @@ class Scintillation():
             time_ratio (np.array / string) : percentage time that gain is exceeded
                                              if "random", then random values are chosen for each link
                                              default = "random"
+            random_number_gen (np.random.RandomState) : generator of the random
+                time ratios - optional, default is the generator of the object
             wet_refractivity (float) : wet term of the radio refractivity - optional
                                        if not given, then it is calculated from sat_params
 
@@ -49,42 +95,35 @@ class Scintillation():
                 Optional needed only if wet_refractivity is not given
         Returns
         -------
-            attenuation (np.array): attenuation (dB) with dimensions equal to "elevation"
+            attenuation (np.array): attenuation (dB) with dimensions equal to
+            "elevation" broadcast with "antenna_gain_dB" and "time_ratio"
         """
 
         f_GHz = kwargs["frequency_MHz"] / 1000.
-        elevation_rad = kwargs["elevation"] / 180. * np.pi
+        elevation_rad = np.asarray(kwargs["elevation"], dtype=float) / 180. * np.pi
         antenna_gain_dB = kwargs["antenna_gain_dB"]
         time_ratio = kwargs.pop("time_ratio", "random")
+        random_number_gen = kwargs.pop("random_number_gen", self.random_number_gen)
         wet_refractivity = kwargs.pop("wet_refractivity", False)
 
         if not wet_refractivity:
             for p in ["earth_station_alt_m", "earth_station_lat_deg", "season"]:
                 if p not in kwargs:
                     raise ValueError(
-                        f"Scintillation: parameter {p} is mandatory if wet_refractivity is set.",
+                        f"Scintillation: parameter {p} is mandatory if wet_refractivity is not set.",
                     )
 
-            temperature, \
-                pressure, \
-                water_vapour_density = self.atmosphere.get_reference_atmosphere_p835(
-                    kwargs["earth_station_lat_deg"],
-                    kwargs["earth_station_lat_deg"],
-                    kwargs["season"],
-                )
-
-            # calculate saturation water vapour pressure according to ITU-R P.453-12
-            # water coefficients (ice disregarded)
-            vapour_pressure = water_vapour_density * temperature / 216.7  # eq 10 in P453
-            wet_refractivity = (
-                72 * vapour_pressure / temperature +
-                3.75e5 * vapour_pressure / temperature ** 2
+            wet_refractivity = self.get_wet_refractivity(
+                kwargs["earth_station_lat_deg"],
+                kwargs["earth_station_alt_m"],
+                kwargs["season"],
             )
 
         sigma_ref = 3.6e-3 + 1e-4 * wet_refractivity
         h_l = 1000
+        sin_elevation = np.sin(elevation_rad)
         path_length = 2 * h_l / \
-            (np.sqrt(np.sin(elevation_rad) ** 2 + 2.35e-4) + np.sin(elevation_rad))
+            (np.sqrt(sin_elevation ** 2 + 2.35e-4) + sin_elevation)
         eff_antenna_diameter = .3 * \
             10 ** (.05 * antenna_gain_dB) / (np.pi * f_GHz)
 
@@ -95,51 +134,37 @@ class Scintillation():
         )
         scintillation_intensity = (
             sigma_ref * f_GHz ** (7 / 12) * antenna_averaging_factor /
-            np.sin(elevation_rad) ** 1.2
+            sin_elevation ** 1.2
         )
 
         if isinstance(time_ratio, str) and time_ratio.lower() == "random":
-            time_ratio = self.random_number_gen.rand(
+            time_ratio = random_number_gen.rand(
                 elevation_rad.size,
             ).reshape(elevation_rad.shape)
 
         # tropospheric scintillation attenuation not exceeded for time_percentage percent time
-        time_percentage = time_ratio * 100.
-
-        num_el = 1
-        if np.isscalar(scintillation_intensity):
-            if not np.isscalar(time_percentage):
-                num_el = time_percentage.size
-                scintillation_intensity = np.ones(
-                    num_el,
-                ) * scintillation_intensity
-        else:
-            num_el = scintillation_intensity.size
-            if np.isscalar(time_percentage):
-                time_percentage = np.ones(num_el) * time_percentage
-
-        attenuation = np.empty(elevation_rad.shape)
-
-        a_ste = (
-            2.672 - 1.258 * np.log10(time_percentage) -
-            .0835 * np.log10(time_percentage) ** 2 -
-            .0597 * np.log10(time_percentage) ** 3
-        )
+        time_percentage = np.asarray(time_ratio) * 100.
+
+        # enhancements are calculated for time percentages up to 50% and fades
+        # above it, so the logarithms of 0 of the other case are discarded
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_p = np.log10(time_percentage)
+            a_ste = (
+                2.672 - 1.258 * log_p -
+                .0835 * log_p ** 2 -
+                .0597 * log_p ** 3
+            )
 
-        a_stf = (
-            3. - 1.71 * np.log10(100 - time_percentage) +
-            .072 * np.log10(100 - time_percentage) ** 2 -
-            .061 * np.log10(100 - time_percentage) ** 3
-        )
+            log_q = np.log10(100 - time_percentage)
+            a_stf = (
+                3. - 1.71 * log_q +
+                .072 * log_q ** 2 -
+                .061 * log_q ** 3
+            )
 
-        gain_indices = np.where(time_percentage <= 50.)
-        if gain_indices:
-            attenuation[gain_indices] = - \
-                scintillation_intensity[gain_indices] * a_ste[gain_indices]
-        fade_indices = np.where(time_percentage > 50.)[0]
-        if fade_indices.size:
-            attenuation[fade_indices] = scintillation_intensity[fade_indices] * \
-                a_stf[fade_indices]
+        attenuation = scintillation_intensity * np.where(
+            time_percentage <= 50., -a_ste, a_stf,
+        )
 
         return attenuation
 
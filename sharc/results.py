@@ -10,9 +10,12 @@ import os
 import datetime
 import re
 import pathlib
-import pandas as pd
+import numpy as np
 from shutil import copy
 
+from sharc.results_store import CsvResultsStore, NpyResultsStore, create_results_store
+from sharc.sample_summary import SampleSummary
+
 
 class SampleList(list):
     """
@@ -91,6 +94,13 @@ class Results(object):
         self.system_pfd = SampleList()
         self.system_rx_interf = SampleList()
 
+        self.store = CsvResultsStore()
+
+        # If streaming statistics are enabled, samples are folded into a
+        # SampleSummary per attribute on every flush, instead of being written
+        self.streaming_statistics = False
+        self.summaries = dict()
+
         self.__sharc_dir = pathlib.Path(__file__).parent.resolve()
 
     def prepare_to_write(
@@ -99,10 +109,25 @@ class Results(object):
         overwrite_output: bool,
         output_dir="output",
         output_dir_prefix="output",
+        results_format="CSV",
+        streaming_statistics=False,
+        output_directory=None,
     ):
+        """Creates the output directory
+
+        Parameters
+        ----------
+        output_directory : str, optional
+            If given, results are written to this existing output directory
+            (e.g. when a simulation is resumed) instead of a new one
+        """
         self.output_dir_parent = output_dir
+        self.store = create_results_store(results_format)
+        self.streaming_statistics = streaming_statistics
 
-        if not overwrite_output:
+        if output_directory is not None:
+            self.output_directory = pathlib.Path(output_directory)
+        elif not overwrite_output:
             today = datetime.date.today()
 
             results_number = 1
@@ -146,6 +171,29 @@ class Results(object):
         except FileExistsError:
             self.create_dir(results_number + 1, dir_head)
 
+    @staticmethod
+    def get_output_parent(output_dir: str) -> pathlib.Path:
+        """Returns the directory where the output directories are created
+        for the output_dir parameter
+        """
+        return pathlib.Path(__file__).parent.resolve() / output_dir
+
+    def get_sample_files(self) -> dict:
+        """Returns the path of the sample file of each sample attribute
+
+        Returns
+        -------
+        dict
+            A dict mapping sample attribute names to file paths
+        """
+        return {
+            attr_name: os.path.join(
+                self.output_directory,
+                attr_name + self.store.file_extension,
+            )
+            for attr_name in self.get_relevant_attributes()
+        }
+
     def get_relevant_attributes(self):
         """
         Returns the attributes that are used for storing samples
@@ -153,11 +201,40 @@ class Results(object):
         self_dict = self.__dict__
 
         results_relevant_attr_names = list(
-            filter(lambda x: isinstance(getattr(self, x), SampleList), self_dict)
+            filter(lambda x: isinstance(getattr(self, x), (SampleList, np.ndarray)), self_dict)
         )
 
         return results_relevant_attr_names
 
+    def take_samples(self) -> dict:
+        """Removes the samples collected so far and returns them
+
+        Returns
+        -------
+        dict
+            A dict mapping each non-empty sample attribute name to its list
+            of samples
+        """
+        samples = {}
+        for attr_name in self.get_relevant_attributes():
+            if len(getattr(self, attr_name)):
+                samples[attr_name] = getattr(self, attr_name)
+                setattr(self, attr_name, SampleList())
+
+        return samples
+
+    def add_samples(self, samples: dict):
+        """Appends samples, as returned by take_samples, to the samples
+        collected so far
+
+        Parameters
+        ----------
+        samples : dict
+            A dict mapping sample attribute names to lists of samples
+        """
+        for attr_name, attr_samples in samples.items():
+            getattr(self, attr_name).extend(attr_samples)
+
     def write_files(self, snapshot_number: int):
         """Writes the sample data to the output file
 
@@ -166,25 +243,50 @@ class Results(object):
         snapshot_number : int
             Current snapshot number
         """
+        if self.streaming_statistics:
+            self.write_summaries()
+            return
+
         results_relevant_attr_names = self.get_relevant_attributes()
         for attr_name in results_relevant_attr_names:
             file_path = os.path.join(
                 self.output_directory,
-                attr_name + ".csv",
+                attr_name + self.store.file_extension,
             )
             samples = getattr(self, attr_name)
             if len(samples) == 0:
                 continue
-            df = pd.DataFrame({"samples": samples})
-            if self.overwrite_sample_files:
-                df.to_csv(file_path, mode="w", index=False)
-            else:
-                df.to_csv(file_path, mode="a", index=False, header=False)
+            self.store.write(file_path, samples, self.overwrite_sample_files)
             setattr(self, attr_name, SampleList())
 
         if self.overwrite_sample_files:
             self.overwrite_sample_files = False
 
+    def write_summaries(self):
+        """Adds the samples collected so far to the summary of each attribute
+        and writes the summaries to <attribute>_summary.npz files
+        """
+        for attr_name, samples in self.take_samples().items():
+            self.summaries.setdefault(attr_name, SampleSummary()).add(samples)
+
+        for attr_name, summary in self.summaries.items():
+            np.savez(
+                os.path.join(self.output_directory, f"{attr_name}_summary.npz"),
+                **summary.to_dict(),
+            )
+
+    def merge_summaries(self, summaries: dict):
+        """Merges summaries (e.g. from other workers) into the summaries of
+        this object
+
+        Parameters
+        ----------
+        summaries : dict
+            A dict mapping sample attribute names to SampleSummary objects
+        """
+        for attr_name, summary in summaries.items():
+            self.summaries.setdefault(attr_name, SampleSummary()).merge(summary)
+
     @staticmethod
     def load_many_from_dir(root_dir: str, *, only_latest=True) -> list["Results"]:
         output_dirs = list(glob.glob(f"{root_dir}/output_*"))
@@ -203,48 +305,80 @@ class Results(object):
 
         return all_res
 
-    def load_from_dir(self, abs_path: str) -> "Results":
+    def load_from_dir(self, abs_path: str, *, mmap=False) -> "Results":
+        """Loads the samples written to a results directory. Binary (.npy)
+        sample files are preferred over .csv files if both exist. Sample
+        summaries written in streaming statistics mode are loaded into
+        the summaries dict.
+
+        Parameters
+        ----------
+        abs_path : str
+            Results directory
+        mmap : bool, optional
+            If True, binary sample files are memory-mapped as read-only arrays
+            instead of being loaded into SampleLists, by default False
+        """
         self.output_directory = abs_path
 
         self_dict = self.__dict__
-        results_relevant_attr_names = filter(
+        results_relevant_attr_names = list(filter(
             lambda x: isinstance(getattr(self, x), SampleList), self_dict
-        )
+        ))
+
+        for attr_name in results_relevant_attr_names:
+            for store in [NpyResultsStore(), CsvResultsStore()]:
+                file_path = os.path.join(abs_path, attr_name + store.file_extension)
+                if os.path.exists(file_path):
+                    break
+            else:
+                continue
+
+            try:
+                data = store.read(file_path, mmap=mmap)
+            except Exception as e:
+                print(e)
+                raise Exception(
+                    f"Error processing the sample file ({os.path.basename(file_path)}) for {attr_name}: {e}"
+                )
+
+            # Ignore if there is no data
+            if len(data) == 0:
+                continue
+
+            if mmap and isinstance(data, np.memmap):
+                setattr(self, attr_name, data)
+            else:
+                setattr(self, attr_name, SampleList(data))
 
         for attr_name in results_relevant_attr_names:
-            file_path = os.path.join(abs_path, f"{attr_name}.csv")
+            file_path = os.path.join(abs_path, f"{attr_name}_summary.npz")
             if os.path.exists(file_path):
-                try:
-                    # Try reading the .csv file using pandas with different delimiters
-                    try:
-                        data = pd.read_csv(file_path, delimiter=",")
-                    except pd.errors.ParserError:
-                        data = pd.read_csv(file_path, delimiter=";")
-
-                    # Ensure the data has exactly one column
-                    if data.shape[1] != 1:
-                        raise Exception(
-                            f"The file with samples of {attr_name} should have a single column.",
-                        )
-
-                    # Remove rows that do not contain valid numeric values
-                    data = data.apply(pd.to_numeric, errors="coerce").dropna()
-
-                    # Ignore if there is no data
-                    if data.empty:
-                        continue
-                    # Check if there is enough data to load results from.
-
-                    setattr(self, attr_name, SampleList(data.to_numpy()[:, 0]))
-
-                except Exception as e:
-                    print(e)
-                    raise Exception(
-                        f"Error processing the sample file ({attr_name}.csv) for {attr_name}: {e}"
-                    )
+                with np.load(file_path) as state:
+                    self.summaries[attr_name] = SampleSummary.from_dict(state)
 
         return self
 
+    @staticmethod
+    def convert_dir(abs_path: str, results_format: str) -> "Results":
+        """Writes the samples of a results directory again using another
+        results format, e.g. to get .csv files from a binary results store.
+        The original sample files are kept.
+
+        Parameters
+        ----------
+        abs_path : str
+            Results directory
+        results_format : str
+            Format of the new sample files (CSV or NPY)
+        """
+        res = Results().load_from_dir(abs_path)
+        res.store = create_results_store(results_format)
+        res.overwrite_sample_files = True
+        res.write_files(0)
+
+        return res
+
     @staticmethod
     def get_most_recent_outputs_for_each_prefix(dirnames: list[str]) -> list[str]:
         """
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Storage backends for the sample files written by Results.
+"""
+
+from abc import ABC, abstractmethod
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class ResultsStore(ABC):
+    """
+    Writes and reads the file that holds the samples of a single Results
+    attribute.
+
+    Attributes
+    ----------
+        file_extension (str): extension of the sample files
+    """
+
+    file_extension = ""
+
+    @abstractmethod
+    def write(self, file_path: str, samples: list, overwrite: bool):
+        """
+        Writes samples to the sample file.
+
+        Parameters
+        ----------
+        file_path : str
+            Sample file path
+        samples : list
+            Samples to be written
+        overwrite : bool
+            If True, the file is overwritten. Otherwise samples are appended
+        """
+
+    @abstractmethod
+    def read(self, file_path: str, mmap=False) -> np.ndarray:
+        """
+        Reads all the samples of the sample file.
+
+        Parameters
+        ----------
+        file_path : str
+            Sample file path
+        mmap : bool, optional
+            If True and supported by the store, the file is memory-mapped
+            instead of loaded into memory, by default False
+
+        Returns
+        -------
+        np.ndarray
+            1-D array of samples
+        """
+
+    def truncate(self, file_path: str, size: int):
+        """
+        Truncates the sample file to a size it had before, discarding the
+        samples written after that.
+
+        Parameters
+        ----------
+        file_path : str
+            Sample file path
+        size : int
+            Previous file size [bytes]
+        """
+        os.truncate(file_path, size)
+
+
+class CsvResultsStore(ResultsStore):
+    """
+    Stores samples as text, in a single column CSV file.
+    """
+
+    file_extension = ".csv"
+
+    def write(self, file_path: str, samples: list, overwrite: bool):
+        df = pd.DataFrame({"samples": samples})
+        if overwrite:
+            df.to_csv(file_path, mode="w", index=False)
+        else:
+            df.to_csv(file_path, mode="a", index=False, header=False)
+
+    def read(self, file_path: str, mmap=False) -> np.ndarray:
+        # Try reading the .csv file using pandas with different delimiters
+        try:
+            data = pd.read_csv(file_path, delimiter=",")
+        except pd.errors.ParserError:
+            data = pd.read_csv(file_path, delimiter=";")
+
+        # Ensure the data has exactly one column
+        if data.shape[1] != 1:
+            raise Exception(
+                f"The file {file_path} should have a single column.",
+            )
+
+        # Remove rows that do not contain valid numeric values
+        data = data.apply(pd.to_numeric, errors="coerce").dropna()
+
+        return data.to_numpy()[:, 0]
+
+
+class NpyResultsStore(ResultsStore):
+    """
+    Stores samples as a binary column in a .npy file that is used as an
+    append log: new samples are written at the end of the file and only then
+    the array length in the header is updated, so an interrupted write never
+    exposes partial samples. Files can be loaded with numpy.load and
+    memory-mapped.
+
+    Attributes
+    ----------
+        dtype (np.dtype): data type of the stored samples
+    """
+
+    file_extension = ".npy"
+
+    def __init__(self, dtype=np.float64):
+        self.dtype = np.dtype(dtype).newbyteorder("<")
+
+    def write(self, file_path: str, samples: list, overwrite: bool):
+        data = np.asarray(samples, dtype=self.dtype).ravel()
+
+        if overwrite or not os.path.exists(file_path):
+            with open(file_path, "wb") as f:
+                self._write_header(f, self.dtype, len(data))
+                f.write(data.tobytes())
+            return
+
+        with open(file_path, "r+b") as f:
+            np.lib.format.read_magic(f)
+            shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+            data_offset = f.tell()
+
+            f.seek(0, os.SEEK_END)
+            f.write(data.astype(dtype).tobytes())
+            f.flush()
+
+            # the header has spare space to grow the array length in place
+            f.seek(0)
+            self._write_header(f, dtype, shape[0] + len(data))
+            if f.tell() != data_offset:
+                raise ValueError(
+                    f"NpyResultsStore: could not update header of {file_path}",
+                )
+
+    def read(self, file_path: str, mmap=False) -> np.ndarray:
+        if mmap:
+            return np.load(file_path, mmap_mode="r")
+        return np.load(file_path)
+
+    def truncate(self, file_path: str, size: int):
+        with open(file_path, "r+b") as f:
+            np.lib.format.read_magic(f)
+            _, _, dtype = np.lib.format.read_array_header_1_0(f)
+            data_offset = f.tell()
+
+            f.truncate(size)
+            f.seek(0)
+            self._write_header(f, dtype, (size - data_offset) // dtype.itemsize)
+
+    @staticmethod
+    def _write_header(f, dtype: np.dtype, length: int):
+        np.lib.format.write_array_header_1_0(
+            f,
+            {
+                "descr": np.lib.format.dtype_to_descr(dtype),
+                "fortran_order": False,
+                "shape": (length,),
+            },
+        )
+
+
+RESULTS_STORES = {
+    "CSV": CsvResultsStore,
+    "NPY": NpyResultsStore,
+}
+
+
+def create_results_store(results_format: str) -> ResultsStore:
+    """
+    Creates the store for the given results format.
+
+    Parameters
+    ----------
+    results_format : str
+        One of the keys of RESULTS_STORES (case insensitive)
+
+    Returns
+    -------
+    ResultsStore
+        Store that writes and reads sample files in that format
+
+    Raises
+    ------
+    ValueError
+        if the format is not supported
+    """
+    if results_format.upper() not in RESULTS_STORES:
+        raise ValueError(
+            f"Invalid results format {results_format}. "
+            f"Possible values are {', '.join(RESULTS_STORES.keys())}",
+        )
+
+    return RESULTS_STORES[results_format.upper()]()
@@ -1,33 +1,82 @@
-import subprocess
 import os
 import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+# sharc.gui.view_cli imports modules of the sharc directory as top level modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from sharc.campaign_scheduler import CampaignScheduler
+from sharc.gui.view_cli import ViewCli
+from sharc.parameter_sweep import ParameterSweep
+from sharc.support.logging import Logging
 
-def run_campaign(campaign_name):
+
+def get_parameter_files(campaign_name):
     # Get the current working directory
     workfolder = os.path.dirname(os.path.abspath(__file__))
 
-    # Path to the main_cli.py script
-    main_cli_path = os.path.join(workfolder, "main_cli.py")
-
     # Campaign directory
     campaign_folder = os.path.join(
         workfolder, "campaigns", campaign_name, "input",
     )
 
     # List of parameter files
-    parameter_files = [
+    return sorted(
         os.path.join(campaign_folder, f) for f in os.listdir(
             campaign_folder,
         ) if f.endswith('.yaml')
-    ]
+    )
+
+
+def run_campaign(campaign_name, num_workers=1):
+    """
+    Runs all the parameter files of a campaign in a pool of num_workers
+    worker processes and writes the status of each run to
+    campaigns/<campaign_name>/output/campaign_status.json.
+    Returns True if all the runs finished.
+    """
+    # Parameter files use paths relative to the sharc directory
+    workfolder = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(workfolder)
+
+    Logging.setup_logging()
+
+    scheduler = CampaignScheduler(
+        get_parameter_files(campaign_name), num_workers,
+    )
+    scheduler.add_observer(ViewCli())
+    runs = scheduler.run()
+
+    output_folder = os.path.join(
+        workfolder, "campaigns", campaign_name, "output",
+    )
+    os.makedirs(output_folder, exist_ok=True)
+    scheduler.write_status(
+        os.path.join(output_folder, "campaign_status.json"),
+    )
+
+    return all(run.status == "FINISHED" for run in runs)
+
+
+def run_sweep(sweep_file, num_workers=None):
+    """
+    Runs all the variants of a parameter sweep (see sharc.parameter_sweep)
+    and writes the status of each variant to sweep_status.json in the sweep
+    output directory. Returns True if all the variants finished.
+    """
+    sweep_file = os.path.abspath(sweep_file)
+    # Parameter files use paths relative to the sharc directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    Logging.setup_logging()
+
+    runs = ParameterSweep.from_file(sweep_file).run(
+        num_workers, observers=[ViewCli()],
+    )
 
-    # Run the command for each parameter file
-    for param_file in parameter_files:
-        command = [sys.executable, main_cli_path, "-p", param_file]
-        subprocess.run(command)
+    return all(run.status == "FINISHED" for run in runs)
 
 
 if __name__ == "__main__":
     # Example usage
-    run_campaign("imt_hibs_ras_2600_MHz")
+    if not run_campaign("imt_hibs_ras_2600_MHz"):
+        sys.exit(1)
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""
+Fixed-size, mergeable summaries of streams of samples.
+"""
+
+import numpy as np
+
+
+class SampleSummary(object):
+    """
+    Summarizes a stream of samples with running moments and a histogram of
+    fixed-width bins, so that statistics and CDFs can be computed over any
+    number of samples in bounded memory. Summaries of different streams (e.g.
+    from parallel workers) can be merged.
+
+    Bin k of the histogram holds the samples in
+    [k * bin_width, (k + 1) * bin_width). If the histogram would have more
+    than max_bins bins, the bin width is doubled, so memory stays bounded and
+    quantiles are always known within one bin width. Since simulation results
+    are in logarithmic units (dB, dBm, ...), a fixed width gives a constant
+    resolution over the whole range of values.
+
+    Infinite samples are counted separately and not included in the moments
+    or in the histogram. NaN samples are ignored.
+
+    Attributes
+    ----------
+        bin_width (float): histogram bin width
+        max_bins (int): maximum number of histogram bins
+        count (int): number of finite samples
+        mean (float): mean of finite samples
+        m2 (float): sum of squared differences from the mean
+        min (float): minimum finite sample
+        max (float): maximum finite sample
+        neg_inf (int): number of samples equal to -inf
+        pos_inf (int): number of samples equal to +inf
+        offset (int): index of the first histogram bin
+        counts (np.array): number of samples in each histogram bin
+    """
+
+    def __init__(self, bin_width=0.01, max_bins=2**17):
+        self.bin_width = bin_width
+        self.max_bins = max_bins
+        self.count = 0
+        self.mean = 0.
+        self.m2 = 0.
+        self.min = np.inf
+        self.max = -np.inf
+        self.neg_inf = 0
+        self.pos_inf = 0
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the finite samples"""
+        return self.m2 / self.count if self.count else np.nan
+
+    @property
+    def standard_deviation(self) -> float:
+        """Population standard deviation of the finite samples"""
+        return np.sqrt(self.variance)
+
+    def add(self, samples) -> "SampleSummary":
+        """
+        Adds samples to the summary.
+
+        Parameters
+        ----------
+        samples : array like
+            New samples
+        """
+        samples = np.ravel(np.asarray(samples, dtype=float))
+        samples = samples[~np.isnan(samples)]
+        is_inf = np.isinf(samples)
+        if np.any(is_inf):
+            self.neg_inf += int(np.sum(samples[is_inf] < 0))
+            self.pos_inf += int(np.sum(samples[is_inf] > 0))
+            samples = samples[~is_inf]
+        if len(samples) == 0:
+            return self
+
+        batch = SampleSummary(self.bin_width, self.max_bins)
+        batch.count = len(samples)
+        batch.mean = np.mean(samples)
+        batch.m2 = np.sum((samples - batch.mean)**2)
+        batch.min = np.min(samples)
+        batch.max = np.max(samples)
+        self._merge_moments(batch)
+
+        # the bin width is doubled before binning until the range of all the
+        # samples fits in max_bins bins, so memory does not depend on the
+        # range of the batch
+        while np.floor(self.max / self.bin_width) - \
+                np.floor(self.min / self.bin_width) >= self.max_bins:
+            self._double_bin_width()
+
+        index = np.floor(samples / self.bin_width).astype(np.int64)
+        self._add_to_histogram(
+            index.min(),
+            np.bincount(index - index.min()),
+        )
+
+        return self
+
+    def merge(self, other: "SampleSummary") -> "SampleSummary":
+        """
+        Adds the samples summarized by other to this summary.
+
+        Parameters
+        ----------
+        other : SampleSummary
+            Summary to be merged. Its bin width must be this summary's bin
+            width times a power of two (or vice versa).
+        """
+        self.neg_inf += other.neg_inf
+        self.pos_inf += other.pos_inf
+        if other.count == 0:
+            return self
+
+        self._merge_moments(other)
+
+        offset, counts = other.offset, other.counts
+        bin_width = other.bin_width
+        while bin_width < self.bin_width:
+            offset, counts = self._coarsen(offset, counts)
+            bin_width *= 2
+        while self.bin_width < bin_width:
+            self._double_bin_width()
+        if not np.isclose(bin_width, self.bin_width):
+            raise ValueError(
+                "SampleSummary: cannot merge summaries with incompatible bin widths "
+                f"{self.bin_width} and {other.bin_width}",
+            )
+        self._add_to_histogram(offset, counts)
+
+        return self
+
+    def cdf_at(self, values) -> np.array:
+        """
+        Fraction of samples that are smaller than or equal to each value.
+        Samples are assumed to be uniformly distributed within each bin.
+
+        Parameters
+        ----------
+        values : array like
+            Values where the CDF is evaluated
+
+        Returns
+        -------
+        np.array
+            CDF at each value
+        """
+        total = self.count + self.neg_inf + self.pos_inf
+        edges = (self.offset + np.arange(len(self.counts) + 1)) * self.bin_width
+        cumulative = np.concatenate(([0], np.cumsum(self.counts)))
+        cdf = np.interp(values, edges, cumulative) + self.neg_inf
+
+        return cdf / total
+
+    def quantile(self, q) -> np.array:
+        """
+        Sample quantiles, accurate within one bin width.
+
+        Parameters
+        ----------
+        q : array like
+            Probabilities in [0, 1]
+
+        Returns
+        -------
+        np.array
+            Quantile of each probability
+        """
+        total = self.count + self.neg_inf + self.pos_inf
+        edges = (self.offset + np.arange(len(self.counts) + 1)) * self.bin_width
+        edges[0] = max(edges[0], self.min)
+        edges[-1] = min(edges[-1], self.max)
+        cumulative = np.concatenate(([0], np.cumsum(self.counts))) + self.neg_inf
+        rank = np.asarray(q) * total
+
+        quantiles = np.interp(rank, cumulative, edges)
+        quantiles = np.where(rank < self.neg_inf, -np.inf, quantiles)
+        quantiles = np.where(rank > total - self.pos_inf, np.inf, quantiles)
+
+        return quantiles
+
+    def cdf(self, n_bins=200) -> (np.array, np.array):
+        """
+        Both axis of a CDF (x, y) of the summarized samples, in the same form
+        as PostProcessor.cdf_from: x holds the left edges of n_bins equal
+        width bins between the minimum and the maximum sample, and y the
+        fraction of samples up to the right edge of each bin.
+
+        Parameters
+        ----------
+        n_bins : int, optional
+            Number of points of the CDF, by default 200
+        """
+        base = np.linspace(self.min, self.max, n_bins + 1)
+        y = self.cdf_at(base[1:])
+        y[-1] = 1 - self.pos_inf / (self.count + self.neg_inf + self.pos_inf)
+
+        return base[:-1], y
+
+    def to_dict(self) -> dict:
+        """
+        Returns the summary state as a dict of numpy values, e.g. to be saved
+        with numpy.savez
+        """
+        return {
+            "bin_width": self.bin_width,
+            "max_bins": self.max_bins,
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min,
+            "max": self.max,
+            "neg_inf": self.neg_inf,
+            "pos_inf": self.pos_inf,
+            "offset": self.offset,
+            "counts": self.counts,
+        }
+
+    @staticmethod
+    def from_dict(state: dict) -> "SampleSummary":
+        """
+        Builds a summary from a dict returned by to_dict (or loaded with
+        numpy.load from a file written with numpy.savez)
+        """
+        summary = SampleSummary(float(state["bin_width"]), int(state["max_bins"]))
+        summary.count = int(state["count"])
+        summary.mean = float(state["mean"])
+        summary.m2 = float(state["m2"])
+        summary.min = float(state["min"])
+        summary.max = float(state["max"])
+        summary.neg_inf = int(state["neg_inf"])
+        summary.pos_inf = int(state["pos_inf"])
+        summary.offset = int(state["offset"])
+        summary.counts = np.array(state["counts"], dtype=np.int64)
+
+        return summary
+
+    def _merge_moments(self, other: "SampleSummary"):
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.count / count
+        self.m2 = self.m2 + other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def _add_to_histogram(self, offset: int, counts: np.array):
+        if len(self.counts) == 0:
+            self.offset, self.counts = int(offset), counts.astype(np.int64)
+        else:
+            # histograms far apart are coarsened before they are combined
+            while max(self.offset + len(self.counts), offset + len(counts)) - \
+                    min(self.offset, offset) > self.max_bins:
+                self._double_bin_width()
+                offset, counts = self._coarsen(offset, counts)
+            start = min(self.offset, offset)
+            end = max(self.offset + len(self.counts), offset + len(counts))
+            new_counts = np.zeros(end - start, dtype=np.int64)
+            new_counts[self.offset - start:self.offset - start + len(self.counts)] += self.counts
+            new_counts[offset - start:offset - start + len(counts)] += counts
+            self.offset, self.counts = int(start), new_counts
+
+        while len(self.counts) > self.max_bins:
+            self._double_bin_width()
+
+    def _double_bin_width(self):
+        if len(self.counts):
+            self.offset, self.counts = self._coarsen(self.offset, self.counts)
+        self.bin_width *= 2
+
+    @staticmethod
+    def _coarsen(offset: int, counts: np.array) -> (int, np.array):
+        """
+        Merges pairs of adjacent bins, doubling the bin width
+        """
+        if offset % 2:
+            offset -= 1
+            counts = np.concatenate(([0], counts))
+        if len(counts) % 2:
+            counts = np.concatenate((counts, [0]))
+
+        return offset // 2, counts.reshape(-1, 2).sum(axis=1)
@@ -19,6 +19,7 @@ from sharc.parameters.parameters import Parameters
 from sharc.station_manager import StationManager
 from sharc.results import Results
 from sharc.propagation.propagation_factory import PropagationFactory
+from sharc.support.stage_profiler import StageProfiler
 
 
 class Simulation(ABC, Observable):
@@ -67,6 +68,8 @@ class Simulation(ABC, Observable):
         self.adjacent_channel = self.parameters.general.enable_adjacent_channel
 
         self.topology = TopologyFactory.createTopology(self.parameters)
+        # state shared with the simulations that share the topology
+        self._shared_topology = None
 
         self.bs_power_gain = 0
         self.ue_power_gain = 0
@@ -101,6 +104,12 @@ class Simulation(ABC, Observable):
 
         self.results = None
 
+        # measures the time spent in each stage of the snapshots
+        self.profiler = StageProfiler(
+            self.parameters.general.profile_snapshots,
+            self.parameters.general.profile_allocations,
+        )
+
         imt_min_freq = self.parameters.imt.frequency - self.parameters.imt.bandwidth / 2
         imt_max_freq = self.parameters.imt.frequency + self.parameters.imt.bandwidth / 2
         system_min_freq = self.param_system.frequency - self.param_system.bandwidth / 2
@@ -121,18 +130,22 @@ class Simulation(ABC, Observable):
         if not self.co_channel and not self.adjacent_channel:
             raise ValueError("Both co_channel and adjacent_channel can't be false")
 
-        random_number_gen = np.random.RandomState(self.parameters.general.seed)
+        # random number generator shared by the propagation models. It is
+        # reseeded on every snapshot (see reseed_propagation)
+        self.propagation_random_number_gen = np.random.RandomState(
+            self.parameters.general.seed,
+        )
         self.propagation_imt = PropagationFactory.create_propagation(
             self.parameters.imt.channel_model,
             self.parameters,
             self.parameters.imt,
-            random_number_gen,
+            self.propagation_random_number_gen,
         )
         self.propagation_system = PropagationFactory.create_propagation(
             self.param_system.channel_model,
             self.parameters,
             self.param_system,
-            random_number_gen,
+            self.propagation_random_number_gen,
         )
 
     def add_observer_list(self, observers: list):
@@ -142,6 +155,17 @@ class Simulation(ABC, Observable):
     def initialize(self, *args, **kwargs):
         """
         This method is executed only once to initialize the simulation variables.
+
+        Parameters
+        ----------
+        write_results : bool, optional
+            Whether the results will be written to the output directory, by
+            default True. Simulations that only produce samples to be merged
+            elsewhere (e.g. parallel snapshot workers) should set it to False
+            so that no output directory is created.
+        output_directory : str, optional
+            Existing output directory to write the results to, e.g. when a
+            simulation is resumed. By default a new one is created
         """
 
         self.topology.calculate_coordinates()
@@ -187,24 +211,97 @@ class Simulation(ABC, Observable):
             self.num_rb_per_bs / self.parameters.imt.ue.k,
         )
 
-        self.results = Results().prepare_to_write(
-            self.parameters_filename,
-            self.parameters.general.overwrite_output,
-            self.parameters.general.output_dir,
-            self.parameters.general.output_dir_prefix,
-        )
+        self.results = Results()
+        if kwargs.get("write_results", True):
+            self.results.prepare_to_write(
+                self.parameters_filename,
+                self.parameters.general.overwrite_output,
+                self.parameters.general.output_dir,
+                self.parameters.general.output_dir_prefix,
+                self.parameters.general.results_format,
+                self.parameters.general.streaming_statistics,
+                kwargs.get("output_directory"),
+            )
 
         if hasattr(self.param_system, "polarization_loss"):
             self.polarization_loss = self.param_system.polarization_loss
         else:
             self.polarization_loss = 3.0
         #print("polarization: ", self.polarization_loss)
+
+    def calculate_topology(self, random_number_gen: np.random.RandomState, seed: int):
+        """
+        Calculates the topology coordinates of the snapshot. Simulations that
+        share their topology (see share_topology) run each snapshot one after
+        the other with the same seed, so only the first one calculates the
+        coordinates and the others just restore the state the random number
+        generator had after the calculation.
+
+        Parameters
+        ----------
+        random_number_gen : np.random.RandomState
+            Random number generator of the snapshot
+        seed : int
+            Seed of the snapshot
+        """
+        shared = self._shared_topology
+        if shared is not None and shared["seed"] == seed:
+            random_number_gen.set_state(shared["state"])
+            return
+
+        self.topology.calculate_coordinates(random_number_gen)
+        if shared is not None:
+            shared["seed"] = seed
+            shared["state"] = random_number_gen.get_state()
+
+    def share_topology(self, simulation: "Simulation"):
+        """
+        Uses the topology of another simulation with the same topology
+        parameters, so that the coordinates of each snapshot are only
+        calculated once for both simulations.
+        """
+        if simulation._shared_topology is None:
+            simulation._shared_topology = {"seed": None, "state": None}
+        self.topology = simulation.topology
+        self._shared_topology = simulation._shared_topology
+
+    def reseed_propagation(self, seed: int):
+        """
+        Reseeds the random number generator shared by the propagation models,
+        so that the losses of a snapshot depend only on the snapshot seed and
+        not on the snapshots that were run before it. This allows snapshots to
+        be run in any order, or in different processes, with the same results.
+
+        Parameters
+        ----------
+        seed : int
+            Seed of the current snapshot
+        """
+        self.propagation_random_number_gen.seed(
+            [self.parameters.general.seed, seed],
+        )
+
     def finalize(self, *args, **kwargs):
         """
         Finalizes the simulation (collect final results, etc...)
         """
         snapshot_number = kwargs["snapshot_number"]
         self.results.write_files(snapshot_number)
+        self.write_profile()
+
+    def write_profile(self):
+        """
+        Writes the stage profile of the snapshots to the output directory,
+        if profiling is enabled and results are being written.
+        """
+        output_directory = getattr(self.results, "output_directory", None)
+        if output_directory is not None:
+            self.profiler.write(output_directory)
+        if self.profiler.enabled:
+            self.notify_observers(
+                source=__name__,
+                message="Snapshot profile:\n" + self.profiler.summary(),
+            )
 
     def calculate_coupling_loss_system_imt(
         self,
@@ -28,58 +28,75 @@ class SimulationDownlink(Simulation):
         seed = kwargs["seed"]
 
         random_number_gen = np.random.RandomState(seed)
+        self.reseed_propagation(seed)
+
+        profiler = self.profiler
 
         # In case of hotspots, base stations coordinates have to be calculated
         # on every snapshot. Anyway, let topology decide whether to calculate
         # or not
-        self.topology.calculate_coordinates(random_number_gen)
-
-        # Create the base stations (remember that it takes into account the
-        # network load factor)
-        self.bs = StationFactory.generate_imt_base_stations(
-            self.parameters.imt,
-            self.parameters.imt.bs.antenna,
-            self.topology, random_number_gen,
-        )
-
-        # Create the other system (FSS, HAPS, etc...)
-        self.system = StationFactory.generate_system(
-            self.parameters, self.topology, random_number_gen,
-        )
+        with profiler.stage("topology"):
+            self.calculate_topology(random_number_gen, seed)
+
+        with profiler.stage("station_generation"):
+            # Create the base stations (remember that it takes into account the
+            # network load factor). Stations of the previous snapshot are
+            # reused, so that antennas are not built on every snapshot
+            self.bs = StationFactory.generate_imt_base_stations(
+                self.parameters.imt,
+                self.parameters.imt.bs.antenna,
+                self.topology, random_number_gen,
+                imt_base_stations=self.bs,
+            )
 
-        # Create IMT user equipments
-        self.ue = StationFactory.generate_imt_ue(
-            self.parameters.imt,
-            self.parameters.imt.ue.antenna,
-            self.topology, random_number_gen,
-        )
+            # Create the other system (FSS, HAPS, etc...)
+            self.system = StationFactory.generate_system(
+                self.parameters, self.topology, random_number_gen,
+            )
 
-        #self.plot_scenario()
+            # Create IMT user equipments
+            self.ue = StationFactory.generate_imt_ue(
+                self.parameters.imt,
+                self.parameters.imt.ue.antenna,
+                self.topology, random_number_gen,
+                imt_ue=self.ue,
+            )
+            #self.plot_scenario()
 
-        self.connect_ue_to_bs()
-        self.select_ue(random_number_gen)
+        with profiler.stage("connect_ue_to_bs"):
+            self.connect_ue_to_bs()
+        with profiler.stage("select_ue"):
+            self.select_ue(random_number_gen)
 
         # Calculate coupling loss after beams are created
-        self.coupling_loss_imt = self.calculate_intra_imt_coupling_loss(
-            self.ue, self.bs,
-        )
-        self.scheduler()
-        self.power_control()
+        with profiler.stage("intra_imt_coupling_loss"):
+            self.coupling_loss_imt = self.calculate_intra_imt_coupling_loss(
+                self.ue, self.bs,
+            )
+        with profiler.stage("scheduler"):
+            self.scheduler()
+        with profiler.stage("power_control"):
+            self.power_control()
 
+        with profiler.stage("sinr"):
+            self.calculate_sinr()
         if self.parameters.imt.interfered_with:
             # Execute this piece of code if the other system generates
             # interference into IMT
-            self.calculate_sinr()
-            self.calculate_sinr_ext()
+            with profiler.stage("external_interference"):
+                self.calculate_sinr_ext()
         else:
             # Execute this piece of code if IMT generates interference into
             # the other system
-            self.calculate_sinr()
-            self.calculate_external_interference()
+            with profiler.stage("external_interference"):
+                self.calculate_external_interference()
 
-        self.collect_results(write_to_file, snapshot_number)
+        with profiler.stage("collect_results"):
+            self.collect_results(write_to_file, snapshot_number)
+        profiler.end_snapshot()
 
     def finalize(self, *args, **kwargs):
+        self.write_profile()
         self.notify_observers(source=__name__, results=self.results)
 
     def power_control(self):
@@ -110,23 +127,31 @@ class SimulationDownlink(Simulation):
         Calculates the downlink SINR for each UE.
         """
         bs_active = np.where(self.bs.active)[0]
-        for bs in bs_active:
-            ue = self.link[bs]
-            self.ue.rx_power[ue] = self.bs.tx_power[bs] - \
-                self.coupling_loss_imt[bs, ue]
-
-            # create a list with base stations that generate interference in ue_list
-            bs_interf = [b for b in bs_active if b not in [bs]]
-
-            # calculate intra system interference
-            for bi in bs_interf:
-                interference = self.bs.tx_power[bi] - \
-                    self.coupling_loss_imt[bi, ue]
-
-                self.ue.rx_interference[ue] = 10 * np.log10(
-                    np.power(
-                        10, 0.1 * self.ue.rx_interference[ue]) + np.power(10, 0.1 * interference),
-                )
+        if len(bs_active):
+            # serving base station (as a row of bs_active), UE and beam of
+            # every downlink
+            serving = np.concatenate(
+                [np.full(len(self.link[bs]), i) for i, bs in enumerate(bs_active)],
+            )
+            ue = np.concatenate([self.link[bs] for bs in bs_active]).astype(int)
+            beam = np.concatenate([np.arange(len(self.link[bs])) for bs in bs_active])
+
+            # received power [dBm] at the UE of each link from the beam with
+            # the same index of every active base station
+            tx_power = np.array([self.bs.tx_power[bs] for bs in bs_active])
+            rx_power = tx_power[:, beam] - \
+                self.coupling_loss_imt[np.ix_(bs_active, ue)]
+
+            self.ue.rx_power[ue] = rx_power[serving, np.arange(len(ue))]
+
+            # intra system interference is the sum of the power received from
+            # all the other active base stations
+            rx_power_lin = np.power(10, 0.1 * rx_power)
+            rx_power_lin[serving, np.arange(len(ue))] = 0
+            self.ue.rx_interference[ue] = 10 * np.log10(
+                np.power(10, 0.1 * self.ue.rx_interference[ue]) +
+                np.sum(rx_power_lin, axis=0),
+            )
 
         # Thermal noise in dBm
         self.ue.thermal_noise = \
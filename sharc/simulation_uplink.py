@@ -28,56 +28,73 @@ class SimulationUplink(Simulation):
         seed = kwargs["seed"]
 
         random_number_gen = np.random.RandomState(seed)
+        self.reseed_propagation(seed)
+
+        profiler = self.profiler
 
         # In case of hotspots, base stations coordinates have to be calculated
         # on every snapshot. Anyway, let topology decide whether to calculate
         # or not
-        self.topology.calculate_coordinates(random_number_gen)
-
-        # Create the base stations (remember that it takes into account the
-        # network load factor)
-        self.bs = StationFactory.generate_imt_base_stations(
-            self.parameters.imt,
-            self.parameters.imt.bs.antenna,
-            self.topology, random_number_gen,
-        )
+        with profiler.stage("topology"):
+            self.calculate_topology(random_number_gen, seed)
+
+        with profiler.stage("station_generation"):
+            # Create the base stations (remember that it takes into account the
+            # network load factor). Stations of the previous snapshot are
+            # reused, so that antennas are not built on every snapshot
+            self.bs = StationFactory.generate_imt_base_stations(
+                self.parameters.imt,
+                self.parameters.imt.bs.antenna,
+                self.topology, random_number_gen,
+                imt_base_stations=self.bs,
+            )
 
-        # Create the other system (FSS, HAPS, etc...)
-        self.system = StationFactory.generate_system(
-            self.parameters, self.topology, random_number_gen,
-        )
+            # Create the other system (FSS, HAPS, etc...)
+            self.system = StationFactory.generate_system(
+                self.parameters, self.topology, random_number_gen,
+            )
 
-        # Create IMT user equipments
-        self.ue = StationFactory.generate_imt_ue(
-            self.parameters.imt,
-            self.parameters.imt.ue.antenna,
-            self.topology, random_number_gen,
-        )
-        # self.plot_scenario()
+            # Create IMT user equipments
+            self.ue = StationFactory.generate_imt_ue(
+                self.parameters.imt,
+                self.parameters.imt.ue.antenna,
+                self.topology, random_number_gen,
+                imt_ue=self.ue,
+            )
+            # self.plot_scenario()
 
-        self.connect_ue_to_bs()
-        self.select_ue(random_number_gen)
+        with profiler.stage("connect_ue_to_bs"):
+            self.connect_ue_to_bs()
+        with profiler.stage("select_ue"):
+            self.select_ue(random_number_gen)
 
         # Calculate coupling loss after beams are created
-        self.coupling_loss_imt = self.calculate_intra_imt_coupling_loss(
-            self.ue,
-            self.bs,
-        )
-        self.scheduler()
-        self.power_control()
+        with profiler.stage("intra_imt_coupling_loss"):
+            self.coupling_loss_imt = self.calculate_intra_imt_coupling_loss(
+                self.ue,
+                self.bs,
+            )
+        with profiler.stage("scheduler"):
+            self.scheduler()
+        with profiler.stage("power_control"):
+            self.power_control()
 
+        with profiler.stage("sinr"):
+            self.calculate_sinr()
         if self.parameters.imt.interfered_with:
             # Execute this piece of code if the other system generates
             # interference into IMT
-            self.calculate_sinr()
-            self.calculate_sinr_ext()
+            with profiler.stage("external_interference"):
+                self.calculate_sinr_ext()
         else:
             # Execute this piece of code if IMT generates interference into
             # the other system
-            self.calculate_sinr()
-            self.calculate_external_interference()
+            with profiler.stage("external_interference"):
+                self.calculate_external_interference()
 
-        self.collect_results(write_to_file, snapshot_number)
+        with profiler.stage("collect_results"):
+            self.collect_results(write_to_file, snapshot_number)
+        profiler.end_snapshot()
 
     def power_control(self):
         """
@@ -89,8 +106,11 @@ class SimulationUplink(Simulation):
                 np.ones(len(ue_active))
         else:
             bs_active = np.where(self.bs.active)[0]
-            for bs in bs_active:
-                ue = self.link[bs]
+            if len(bs_active):
+                bs = np.concatenate(
+                    [np.full(len(self.link[b]), b) for b in bs_active],
+                )
+                ue = np.concatenate([self.link[b] for b in bs_active]).astype(int)
                 p_cmax = self.parameters.imt.ue.p_cmax
                 m_pusch = self.num_rb_per_ue
                 p_o_pusch = self.parameters.imt.ue.p_o_pusch
@@ -111,44 +131,59 @@ class SimulationUplink(Simulation):
         """
         Calculates the uplink SINR for each BS.
         """
-        # calculate uplink received power for each active BS
         bs_active = np.where(self.bs.active)[0]
-        for bs in bs_active:
-            ue = self.link[bs]
+        if len(bs_active) == 0:
+            return
+
+        # link table: row i holds the UEs served by the i-th active BS, so
+        # that link[i, j] is the UE scheduled in the j-th resource block
+        link = np.array([self.link[bs] for bs in bs_active], dtype=int)
+        num_bs, num_ue = link.shape
+
+        # received power [dBm] at each active BS from each scheduled UE,
+        # indexed as rx_power[bs, serving bs, resource block]
+        rx_power = self.ue.tx_power[link][np.newaxis, :, :] - \
+            self.coupling_loss_imt[
+                bs_active[:, np.newaxis, np.newaxis], link[np.newaxis, :, :],
+            ]
 
-            self.bs.rx_power[bs] = self.ue.tx_power[ue] - \
-                self.coupling_loss_imt[bs, ue]
-            # create a list of BSs that serve the interfering UEs
-            bs_interf = [b for b in bs_active if b not in [bs]]
-
-            # calculate intra system interference
-            for bi in bs_interf:
-                ui = self.link[bi]
-                interference = self.ue.tx_power[ui] - \
-                    self.coupling_loss_imt[bs, ui]
-                self.bs.rx_interference[bs] = 10 * np.log10(
-                    np.power(10, 0.1 * self.bs.rx_interference[bs]) +
-                    np.power(10, 0.1 * interference),
-                )
+        # calculate intra system interference, which is the power received
+        # in the same resource block from UEs served by the other BSs
+        rx_power_lin = np.power(10, 0.1 * rx_power)
+        rx_power_lin[np.arange(num_bs), np.arange(num_bs), :] = 0
+        rx_interference = np.array(
+            [self.bs.rx_interference[bs] for bs in bs_active],
+        )
+        rx_interference = 10 * np.log10(
+            np.power(10, 0.1 * rx_interference) + np.sum(rx_power_lin, axis=1),
+        )
 
-            # calculate N
-            # thermal noise in dBm
-            self.bs.thermal_noise[bs] = \
-                10 * np.log10(BOLTZMANN_CONSTANT * self.parameters.imt.noise_temperature * 1e3) + \
-                10 * np.log10(self.bs.bandwidth[bs] * 1e6) + \
-                self.bs.noise_figure[bs]
-
-            # calculate I+N
-            self.bs.total_interference[bs] = \
-                10 * np.log10(
-                    np.power(10, 0.1 * self.bs.rx_interference[bs]) +
-                    np.power(10, 0.1 * self.bs.thermal_noise[bs]),
-                )
+        # calculate N
+        # thermal noise in dBm
+        self.bs.thermal_noise[bs_active] = \
+            10 * np.log10(BOLTZMANN_CONSTANT * self.parameters.imt.noise_temperature * 1e3) + \
+            10 * np.log10(self.bs.bandwidth[bs_active] * 1e6) + \
+            self.bs.noise_figure[bs_active]
+        thermal_noise = self.bs.thermal_noise[bs_active, np.newaxis]
+
+        # calculate I+N
+        total_interference = \
+            10 * np.log10(
+                np.power(10, 0.1 * rx_interference) +
+                np.power(10, 0.1 * thermal_noise),
+            )
 
-            # calculate SNR and SINR
-            self.bs.sinr[bs] = self.bs.rx_power[bs] - \
-                self.bs.total_interference[bs]
-            self.bs.snr[bs] = self.bs.rx_power[bs] - self.bs.thermal_noise[bs]
+        # received power from the served UEs, SNR and SINR
+        rx_power = rx_power[np.arange(num_bs), np.arange(num_bs), :]
+        sinr = rx_power - total_interference
+        snr = rx_power - thermal_noise
+
+        for i, bs in enumerate(bs_active):
+            self.bs.rx_power[bs] = rx_power[i]
+            self.bs.rx_interference[bs] = rx_interference[i]
+            self.bs.total_interference[bs] = total_interference[i]
+            self.bs.sinr[bs] = sinr[i]
+            self.bs.snr[bs] = snr[i]
 
     def calculate_sinr_ext(self):
         """
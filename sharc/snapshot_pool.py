@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Runs the snapshots of a simulation over a pool of worker processes.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from sharc.parameters.parameters import Parameters
+from sharc.simulation_downlink import SimulationDownlink
+from sharc.simulation_uplink import SimulationUplink
+
+# Simulation object of the worker process. It is built only once, when the
+# worker is started, and reused by all the snapshots run in that worker.
+_simulation = None
+
+
+def _init_worker(param_file: str, general_overrides: dict):
+    """
+    Builds the simulation of a worker process from the parameter file.
+    """
+    global _simulation
+
+    _simulation = build_simulation(param_file, general_overrides)
+
+
+def build_simulation(param_file: str, general_overrides: dict):
+    """
+    Builds a simulation that runs snapshots of the parameter file without
+    writing results.
+    """
+    parameters = Parameters()
+    parameters.set_file_name(param_file)
+    # the main process has just saved the compiled parameters to the cache
+    parameters.read_params(use_cache=True)
+    for name, value in general_overrides.items():
+        setattr(parameters.general, name, value)
+
+    if parameters.general.imt_link == "DOWNLINK":
+        simulation = SimulationDownlink(parameters, param_file)
+    else:
+        simulation = SimulationUplink(parameters, param_file)
+
+    simulation.initialize(write_results=False)
+
+    return simulation
+
+
+def _run_snapshots(snapshots: list) -> list:
+    """
+    Runs a chunk of snapshots in the worker process.
+    """
+    return run_snapshots(_simulation, snapshots)
+
+
+def run_snapshots(simulation, snapshots: list) -> list:
+    """
+    Runs a chunk of snapshots of a simulation built by build_simulation.
+
+    Parameters
+    ----------
+    simulation : Simulation
+        Simulation that runs the snapshots
+    snapshots : list
+        List of (snapshot_number, seed) tuples
+
+    Returns
+    -------
+    list
+        List of (snapshot_number, samples, profile) tuples, where samples is
+        the dict returned by Results.take_samples after the snapshot is run
+        and profile the dict returned by StageProfiler.take_stats (None if
+        profiling is disabled)
+    """
+    samples = []
+    profiler = simulation.profiler
+    for snapshot_number, seed in snapshots:
+        simulation.snapshot(
+            write_to_file=False,
+            snapshot_number=snapshot_number,
+            seed=seed,
+        )
+        samples.append((
+            snapshot_number,
+            simulation.results.take_samples(),
+            profiler.take_stats() if profiler.enabled else None,
+        ))
+
+    return samples
+
+
+class SnapshotPool(object):
+    """
+    Spreads the snapshots of a simulation over a pool of worker processes.
+    Each worker builds its own simulation and sends back only the samples
+    collected in each snapshot. Samples are returned in snapshot order, so
+    merging them gives the same results as a serial run with the same seeds,
+    regardless of the number of workers or the order in which they finish.
+
+    Attributes
+    ----------
+        param_file (str): simulation parameter file
+        num_workers (int): number of worker processes
+        chunk_size (int): number of snapshots sent to a worker at a time
+        general_overrides (dict): general parameters that override the values
+            read from the parameter file (e.g. set from the command line)
+    """
+
+    def __init__(
+        self, param_file: str, num_workers: int, chunk_size=1,
+        general_overrides=None,
+    ):
+        self.param_file = param_file
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+        self.general_overrides = dict(general_overrides or {})
+
+    def run(self, seeds: list, first_snapshot=1):
+        """
+        Runs one snapshot per seed and yields its samples (and its stage
+        profile) in snapshot order.
+        At most two chunks per worker are pending at any time, so that
+        samples of finished snapshots do not pile up in memory.
+
+        Parameters
+        ----------
+        seeds : list
+            Seed of each snapshot
+        first_snapshot : int, optional
+            Number of the snapshot that uses the first seed, by default 1
+
+        Yields
+        ------
+        tuple
+            (snapshot_number, samples, profile)
+        """
+        snapshots = list(enumerate(seeds, start=first_snapshot))
+        executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            initializer=_init_worker,
+            initargs=(self.param_file, self.general_overrides),
+        )
+        pending = deque()
+        try:
+            for i in range(0, len(snapshots), self.chunk_size):
+                pending.append(
+                    executor.submit(
+                        _run_snapshots,
+                        snapshots[i:i + self.chunk_size],
+                    ),
+                )
+                if len(pending) >= 2 * self.num_workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
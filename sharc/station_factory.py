@@ -46,6 +46,7 @@ from sharc.antenna.antenna_s1528 import AntennaS1528
 from sharc.antenna.antenna_s1855 import AntennaS1855
 from sharc.antenna.antenna_sa509 import AntennaSA509
 from sharc.antenna.antenna_beamforming_imt import AntennaBeamformingImt
+from sharc.antenna.antenna_lut import AntennaLut
 from sharc.topology.topology import Topology
 from sharc.topology.topology_macrocell import TopologyMacrocell
 from sharc.mask.spectral_mask_3gpp import SpectralMask3Gpp
@@ -61,11 +62,19 @@ class StationFactory(object):
         param_ant_bs: ParametersAntennaImt,
         topology: Topology,
         random_number_gen: np.random.RandomState,
+        imt_base_stations=None,
     ):
-        param_ant = param_ant_bs.get_antenna_parameters()
+        # Base stations of the previous snapshot are updated in place, so
+        # that their antennas, spectral mask and buffers are built only once
         num_bs = topology.num_base_stations
-        imt_base_stations = StationManager(num_bs)
-        imt_base_stations.station_type = StationType.IMT_BS
+        reuse = StationFactory._is_reusable(
+            imt_base_stations, num_bs, StationType.IMT_BS,
+        )
+        if reuse:
+            imt_base_stations.clear_geometry_cache()
+        else:
+            imt_base_stations = StationManager(num_bs)
+            imt_base_stations.station_type = StationType.IMT_BS
         if param.topology.type == "NTN":
             imt_base_stations.x = topology.space_station_x * np.ones(num_bs)
             imt_base_stations.y = topology.space_station_y * np.ones(num_bs)
@@ -76,7 +85,7 @@ class StationFactory(object):
         else:
             imt_base_stations.x = topology.x
             imt_base_stations.y = topology.y
-            imt_base_stations.elevation = -param_ant.downtilt * np.ones(num_bs)
+            imt_base_stations.elevation = -param_ant_bs.downtilt * np.ones(num_bs)
             if param.topology.type == 'INDOOR':
                 imt_base_stations.height = topology.height
             else:
@@ -87,42 +96,18 @@ class StationFactory(object):
             num_bs,
         ) < param.bs.load_probability
         imt_base_stations.tx_power = param.bs.conducted_power * np.ones(num_bs)
-        imt_base_stations.rx_power = dict(
-            [(bs, -500 * np.ones(param.ue.k)) for bs in range(num_bs)],
-        )
-        imt_base_stations.rx_interference = dict(
-            [(bs, -500 * np.ones(param.ue.k)) for bs in range(num_bs)],
-        )
-        imt_base_stations.ext_interference = dict(
-            [(bs, -500 * np.ones(param.ue.k)) for bs in range(num_bs)],
-        )
-        imt_base_stations.total_interference = dict(
-            [(bs, -500 * np.ones(param.ue.k)) for bs in range(num_bs)],
-        )
-
-        imt_base_stations.snr = dict(
-            [(bs, -500 * np.ones(param.ue.k)) for bs in range(num_bs)],
-        )
-        imt_base_stations.sinr = dict(
-            [(bs, -500 * np.ones(param.ue.k)) for bs in range(num_bs)],
-        )
-        imt_base_stations.sinr_ext = dict(
-            [(bs, -500 * np.ones(param.ue.k)) for bs in range(num_bs)],
-        )
-        imt_base_stations.inr = dict(
-            [(bs, -500 * np.ones(param.ue.k)) for bs in range(num_bs)],
+        imt_base_stations.reset_buffers(
+            [
+                "rx_power", "rx_interference", "ext_interference",
+                "total_interference", "snr", "sinr", "sinr_ext", "inr",
+            ],
+            param.ue.k,
         )
 
-        imt_base_stations.antenna = np.empty(
-            num_bs, dtype=AntennaBeamformingImt,
+        StationFactory._set_imt_antennas(
+            imt_base_stations, param_ant_bs, reuse,
         )
 
-        for i in range(num_bs):
-            imt_base_stations.antenna[i] = \
-                AntennaBeamformingImt(
-                    param_ant, imt_base_stations.azimuth[i],
-                    imt_base_stations.elevation[i],)
-
         # imt_base_stations.antenna = [AntennaOmni(0) for bs in range(num_bs)]
         imt_base_stations.bandwidth = param.bandwidth * np.ones(num_bs)
         imt_base_stations.center_freq = param.frequency * np.ones(num_bs)
@@ -130,21 +115,22 @@ class StationFactory(object):
             np.ones(num_bs)
         imt_base_stations.thermal_noise = -500 * np.ones(num_bs)
 
-        if param.spectral_mask == "IMT-2020":
-            imt_base_stations.spectral_mask = SpectralMaskImt(
-                StationType.IMT_BS,
-                param.frequency,
-                param.bandwidth,
-                param.spurious_emissions,
-                scenario=param.topology.type,
-            )
-        elif param.spectral_mask == "3GPP E-UTRA":
-            imt_base_stations.spectral_mask = SpectralMask3Gpp(
-                StationType.IMT_BS,
-                param.frequency,
-                param.bandwidth,
-                param.spurious_emissions,
-            )
+        if not reuse:
+            if param.spectral_mask == "IMT-2020":
+                imt_base_stations.spectral_mask = SpectralMaskImt(
+                    StationType.IMT_BS,
+                    param.frequency,
+                    param.bandwidth,
+                    param.spurious_emissions,
+                    scenario=param.topology.type,
+                )
+            elif param.spectral_mask == "3GPP E-UTRA":
+                imt_base_stations.spectral_mask = SpectralMask3Gpp(
+                    StationType.IMT_BS,
+                    param.frequency,
+                    param.bandwidth,
+                    param.spurious_emissions,
+                )
 
         if param.topology.type == 'MACROCELL':
             imt_base_stations.intersite_dist = param.topology.macrocell.intersite_distance
@@ -153,18 +139,57 @@ class StationFactory(object):
 
         return imt_base_stations
 
+    @staticmethod
+    def _is_reusable(
+        stations, num_stations: int, station_type: StationType,
+    ) -> bool:
+        """
+        Checks if stations generated in a previous snapshot can be updated in
+        place instead of generating new ones.
+        """
+        return isinstance(stations, StationManager) and \
+            stations.station_type == station_type and \
+            stations.num_stations == num_stations
+
+    @staticmethod
+    def _set_imt_antennas(
+        stations: StationManager, param_ant: ParametersAntennaImt, reuse: bool,
+    ):
+        """
+        Points the beamforming antennas of the IMT stations to the stations'
+        azimuth and elevation. Antennas of reused stations are reset instead
+        of being built again, which also avoids reloading the beamforming
+        normalization data.
+        """
+        if reuse:
+            for i in range(stations.num_stations):
+                stations.antenna[i].set_orientation(
+                    stations.azimuth[i], stations.elevation[i],
+                )
+            return
+
+        par = param_ant.get_antenna_parameters()
+        stations.antenna = np.empty(
+            stations.num_stations, dtype=AntennaBeamformingImt,
+        )
+        for i in range(stations.num_stations):
+            stations.antenna[i] = AntennaBeamformingImt(
+                par, stations.azimuth[i], stations.elevation[i],
+            )
+
     @staticmethod
     def generate_imt_ue(
         param: ParametersImt,
         ue_param_ant: ParametersAntennaImt,
         topology: Topology,
         random_number_gen: np.random.RandomState,
+        imt_ue=None,
     ) -> StationManager:
 
         if param.topology.type == "INDOOR":
-            return StationFactory.generate_imt_ue_indoor(param, ue_param_ant, random_number_gen, topology)
+            return StationFactory.generate_imt_ue_indoor(param, ue_param_ant, random_number_gen, topology, imt_ue)
         else:
-            return StationFactory.generate_imt_ue_outdoor(param, ue_param_ant, random_number_gen, topology)
+            return StationFactory.generate_imt_ue_outdoor(param, ue_param_ant, random_number_gen, topology, imt_ue)
 
     @staticmethod
     def generate_ras_station(
@@ -183,14 +208,21 @@ class StationFactory(object):
         ue_param_ant: ParametersAntennaImt,
         random_number_gen: np.random.RandomState,
         topology: Topology,
+        imt_ue=None,
     ) -> StationManager:
         num_bs = topology.num_base_stations
         num_ue_per_bs = param.ue.k * param.ue.k_m
 
         num_ue = num_bs * num_ue_per_bs
 
-        imt_ue = StationManager(num_ue)
-        imt_ue.station_type = StationType.IMT_UE
+        # UEs of the previous snapshot are updated in place, so that their
+        # arrays, antennas and spectral mask are built only once
+        reuse = StationFactory._is_reusable(imt_ue, num_ue, StationType.IMT_UE)
+        if reuse:
+            imt_ue.clear_geometry_cache()
+        else:
+            imt_ue = StationManager(num_ue)
+            imt_ue.station_type = StationType.IMT_UE
 
         ue_x = list()
         ue_y = list()
@@ -332,36 +364,32 @@ class StationFactory(object):
         imt_ue.ext_interference = -500 * np.ones(num_ue)
 
         # TODO: this piece of code works only for uplink
-        par = ue_param_ant.get_antenna_parameters()
-        for i in range(num_ue):
-            imt_ue.antenna[i] = AntennaBeamformingImt(
-                par, imt_ue.azimuth[i],
-                imt_ue.elevation[i],
-            )
+        StationFactory._set_imt_antennas(imt_ue, ue_param_ant, reuse)
 
         # imt_ue.antenna = [AntennaOmni(0) for bs in range(num_ue)]
         imt_ue.bandwidth = param.bandwidth * np.ones(num_ue)
         imt_ue.center_freq = param.frequency * np.ones(num_ue)
         imt_ue.noise_figure = param.ue.noise_figure * np.ones(num_ue)
 
-        if param.spectral_mask == "IMT-2020":
-            imt_ue.spectral_mask = SpectralMaskImt(
-                StationType.IMT_UE,
-                param.frequency,
-                param.bandwidth,
-                param.spurious_emissions,
-                scenario="OUTDOOR",
-            )
+        if not reuse:
+            if param.spectral_mask == "IMT-2020":
+                imt_ue.spectral_mask = SpectralMaskImt(
+                    StationType.IMT_UE,
+                    param.frequency,
+                    param.bandwidth,
+                    param.spurious_emissions,
+                    scenario="OUTDOOR",
+                )
 
-        elif param.spectral_mask == "3GPP E-UTRA":
-            imt_ue.spectral_mask = SpectralMask3Gpp(
-                StationType.IMT_UE,
-                param.frequency,
-                param.bandwidth,
-                param.spurious_emissions,
-            )
+            elif param.spectral_mask == "3GPP E-UTRA":
+                imt_ue.spectral_mask = SpectralMask3Gpp(
+                    StationType.IMT_UE,
+                    param.frequency,
+                    param.bandwidth,
+                    param.spurious_emissions,
+                )
 
-        imt_ue.spectral_mask.set_mask()
+            imt_ue.spectral_mask.set_mask()
 
         if param.topology.type == 'MACROCELL':
             imt_ue.intersite_dist = param.topology.macrocell.intersite_distance
@@ -376,13 +404,20 @@ class StationFactory(object):
         ue_param_ant: ParametersAntennaImt,
         random_number_gen: np.random.RandomState,
         topology: Topology,
+        imt_ue=None,
     ) -> StationManager:
         num_bs = topology.num_base_stations
         num_ue_per_bs = param.ue.k * param.ue.k_m
         num_ue = num_bs * num_ue_per_bs
 
-        imt_ue = StationManager(num_ue)
-        imt_ue.station_type = StationType.IMT_UE
+        # UEs of the previous snapshot are updated in place, so that their
+        # arrays, antennas and spectral mask are built only once
+        reuse = StationFactory._is_reusable(imt_ue, num_ue, StationType.IMT_UE)
+        if reuse:
+            imt_ue.clear_geometry_cache()
+        else:
+            imt_ue = StationManager(num_ue)
+            imt_ue.station_type = StationType.IMT_UE
         ue_x = list()
         ue_y = list()
         ue_z = list()
@@ -489,36 +524,32 @@ class StationFactory(object):
         imt_ue.ext_interference = -500 * np.ones(num_ue)
 
         # TODO: this piece of code works only for uplink
-        par = ue_param_ant.get_antenna_parameters()
-        for i in range(num_ue):
-            imt_ue.antenna[i] = AntennaBeamformingImt(
-                par, imt_ue.azimuth[i],
-                imt_ue.elevation[i],
-            )
+        StationFactory._set_imt_antennas(imt_ue, ue_param_ant, reuse)
 
         # imt_ue.antenna = [AntennaOmni(0) for bs in range(num_ue)]
         imt_ue.bandwidth = param.bandwidth * np.ones(num_ue)
         imt_ue.center_freq = param.frequency * np.ones(num_ue)
         imt_ue.noise_figure = param.ue.noise_figure * np.ones(num_ue)
 
-        if param.spectral_mask == "IMT-2020":
-            imt_ue.spectral_mask = SpectralMaskImt(
-                StationType.IMT_UE,
-                param.frequency,
-                param.bandwidth,
-                param.spurious_emissions,
-                scenario="INDOOR",
-            )
+        if not reuse:
+            if param.spectral_mask == "IMT-2020":
+                imt_ue.spectral_mask = SpectralMaskImt(
+                    StationType.IMT_UE,
+                    param.frequency,
+                    param.bandwidth,
+                    param.spurious_emissions,
+                    scenario="INDOOR",
+                )
 
-        elif param.spectral_mask == "3GPP E-UTRA":
-            imt_ue.spectral_mask = SpectralMask3Gpp(
-                StationType.IMT_UE,
-                param.frequency,
-                param.bandwidth,
-                param.spurious_emissions,
-            )
+            elif param.spectral_mask == "3GPP E-UTRA":
+                imt_ue.spectral_mask = SpectralMask3Gpp(
+                    StationType.IMT_UE,
+                    param.frequency,
+                    param.bandwidth,
+                    param.spurious_emissions,
+                )
 
-        imt_ue.spectral_mask.set_mask()
+            imt_ue.spectral_mask.set_mask()
 
         return imt_ue
 
@@ -530,27 +561,28 @@ class StationFactory(object):
             intersite_dist = parameters.imt.topology.hotspot.intersite_distance
 
         if parameters.general.system == "METSAT_SS":
-            return StationFactory.generate_metsat_ss(parameters.metsat_ss)
+            system = StationFactory.generate_metsat_ss(parameters.metsat_ss)
         elif parameters.general.system == "EESS_SS":
-            return StationFactory.generate_eess_space_station(parameters.eess_ss)
+            system = StationFactory.generate_eess_space_station(parameters.eess_ss)
         elif parameters.general.system == "FSS_ES":
-            return StationFactory.generate_fss_earth_station(parameters.fss_es, random_number_gen, topology)
+            system = StationFactory.generate_fss_earth_station(parameters.fss_es, random_number_gen, topology)
         elif parameters.general.system == "SINGLE_EARTH_STATION":
-            return StationFactory.generate_single_earth_station(parameters.single_earth_station, random_number_gen,
-                                                                StationType.SINGLE_EARTH_STATION, topology)
+            system = StationFactory.generate_single_earth_station(
+                parameters.single_earth_station, random_number_gen,
+                StationType.SINGLE_EARTH_STATION, topology,
+            )
         elif parameters.general.system == "RAS":
-            return StationFactory.generate_ras_station(
-                                                       parameters.ras, random_number_gen,
-                                                       topology
-                                                   )
+            system = StationFactory.generate_ras_station(
+                parameters.ras, random_number_gen, topology,
+            )
         elif parameters.general.system == "FSS_SS":
-            return StationFactory.generate_fss_space_station(parameters.fss_ss)
+            system = StationFactory.generate_fss_space_station(parameters.fss_ss)
         elif parameters.general.system == "FS":
-            return StationFactory.generate_fs_station(parameters.fs)
+            system = StationFactory.generate_fs_station(parameters.fs)
         elif parameters.general.system == "HAPS":
-            return StationFactory.generate_haps(parameters.haps, intersite_dist, random_number_gen)
+            system = StationFactory.generate_haps(parameters.haps, intersite_dist, random_number_gen)
         elif parameters.general.system == "RNS":
-            return StationFactory.generate_rns(parameters.rns, random_number_gen)
+            system = StationFactory.generate_rns(parameters.rns, random_number_gen)
         else:
             sys.stderr.write(
                 "ERROR\nInvalid system: " +
@@ -558,6 +590,15 @@ class StationFactory(object):
             )
             sys.exit(1)
 
+        if parameters.general.antenna_lut_resolution:
+            system.antenna = np.array([
+                AntennaLut.get_antenna(
+                    antenna, parameters.general.antenna_lut_resolution,
+                ) for antenna in system.antenna
+            ])
+
+        return system
+
     @staticmethod
     def generate_fss_space_station(param: ParametersFssSs):
         fss_space_station = StationManager(1)
@@ -50,6 +50,30 @@ class StationManager(object):
         self.station_type = StationType.NONE
         self.is_space_station = False
         self.intersite_dist = 0.0
+        # memory block of the buffers created by reset_buffers
+        self._buffers = None
+        # geometry calculated to other stations (see _get_geometry)
+        self._geometry_cache = dict()
+
+    def reset_buffers(self, names: list, size: int, value=-500.0):
+        """
+        Sets each of the given attributes to a dict {station: np.array} of
+        per-station buffers of the given size, filled with value. All buffers
+        are rows of a single memory block, which is reused by later calls
+        instead of allocating new arrays for every station.
+
+        Parameters
+        ----------
+            names (list): names of the attributes
+            size (int): number of values of each buffer
+            value (float): initial value of the buffers
+        """
+        shape = (len(names), self.num_stations, size)
+        if self._buffers is None or self._buffers.shape != shape:
+            self._buffers = np.empty(shape)
+        self._buffers.fill(value)
+        for name, block in zip(names, self._buffers):
+            setattr(self, name, dict(enumerate(block)))
 
     def get_station_list(self, id=None) -> list:
         if (id is None):
@@ -86,24 +110,64 @@ class StationManager(object):
         station.station_type = self.station_type
         return station
 
+    def clear_geometry_cache(self):
+        """
+        Removes the geometry calculated to other stations. Geometry is
+        recalculated anyway when the position of the stations changes, so
+        this only releases memory, e.g. when the stations are reused in a new
+        snapshot.
+        """
+        self._geometry_cache.clear()
+
+    def _get_geometry(self, station, name: str, calculate, orientation=False):
+        """
+        Returns the geometry quantity name between this station and the other
+        station, calculated with calculate() only if it is not cached or if
+        the position (or the orientation, if it is needed) of the stations
+        changed since it was calculated. Cached arrays are read-only, since
+        they are shared by all the callers.
+        """
+        state = [self.x, self.y, self.height, station.x, station.y, station.height]
+        if orientation:
+            state += [self.azimuth, self.elevation]
+        if name == "wrap_around":
+            state.append(self.intersite_dist)
+
+        key = (name, id(station))
+        if key in self._geometry_cache:
+            cached_station, cached_state, value = self._geometry_cache[key]
+            if cached_station is station and all(
+                np.array_equal(a, b) for a, b in zip(state, cached_state)
+            ):
+                return value
+
+        value = calculate()
+        for array in value if isinstance(value, tuple) else (value,):
+            array.setflags(write=False)
+        self._geometry_cache[key] = (
+            station, [np.array(a, copy=True) for a in state], value,
+        )
+
+        return value
+
     def get_distance_to(self, station) -> np.array:
-        distance = np.empty([self.num_stations, station.num_stations])
-        for i in range(self.num_stations):
-            distance[i] = np.sqrt(
-                np.power(self.x[i] - station.x, 2) +
-                np.power(self.y[i] - station.y, 2),
-            )
-        return distance
+        return self._get_geometry(
+            station, "distance_2d",
+            lambda: np.sqrt(
+                np.power(self.x[:, np.newaxis] - station.x, 2) +
+                np.power(self.y[:, np.newaxis] - station.y, 2),
+            ),
+        )
 
     def get_3d_distance_to(self, station) -> np.array:
-        distance = np.empty([self.num_stations, station.num_stations])
-        for i in range(self.num_stations):
-            distance[i] = np.sqrt(
-                np.power(self.x[i] - station.x, 2) +
-                np.power(self.y[i] - station.y, 2) +
-                np.power(self.height[i] - station.height, 2),
-            )
-        return distance
+        return self._get_geometry(
+            station, "distance_3d",
+            lambda: np.sqrt(
+                np.power(self.x[:, np.newaxis] - station.x, 2) +
+                np.power(self.y[:, np.newaxis] - station.y, 2) +
+                np.power(self.height[:, np.newaxis] - station.height, 2),
+            ),
+        )
 
     def get_dist_angles_wrap_around(self, station) -> np.array:
         """
@@ -117,6 +181,12 @@ class StationManager(object):
             phi (np.array): azimuth of pointing vector to other stations
             theta (np.array): elevation of pointing vector to other stations
         """
+        return self._get_geometry(
+            station, "wrap_around",
+            lambda: self._calculate_dist_angles_wrap_around(station),
+        )
+
+    def _calculate_dist_angles_wrap_around(self, station) -> tuple:
         # Initialize variables
         distance_3D = np.empty([self.num_stations, station.num_stations])
         distance_2D = np.inf * np.ones_like(distance_3D)
@@ -194,17 +264,15 @@ class StationManager(object):
               in order to reuse the source code
         """
 
-        elevation = np.empty([self.num_stations, station.num_stations])
-
-        for i in range(self.num_stations):
-            distance = np.sqrt(
-                np.power(self.x[i] - station.x, 2) +
-                np.power(self.y[i] - station.y, 2),
-            )
-            rel_z = station.height - self.height[i]
-            elevation[i] = np.degrees(np.arctan2(rel_z, distance))
-
-        return elevation
+        return self._get_geometry(
+            station, "elevation",
+            lambda: np.degrees(
+                np.arctan2(
+                    station.height - self.height[:, np.newaxis],
+                    self.get_distance_to(station),
+                ),
+            ),
+        )
 
     def get_pointing_vector_to(self, station) -> tuple:
         """calculate the pointing vector (angles) w.r.t. the other station
@@ -220,7 +288,12 @@ class StationManager(object):
             phi, theta (phi is calculated with respect to x counter-clock-wise and
             theta is calculated with respect to z counter-clock-wise)
         """
+        return self._get_geometry(
+            station, "pointing_vector",
+            lambda: self._calculate_pointing_vector_to(station),
+        )
 
+    def _calculate_pointing_vector_to(self, station) -> tuple:
         point_vec_x = station.x - self.x[:, np.newaxis]
         point_vec_y = station.y - self.y[:, np.newaxis]
         point_vec_z = station.height - self.height[:, np.newaxis]
@@ -242,6 +315,13 @@ class StationManager(object):
         """
         Calculates the off-axis angle between this station and the input station
         """
+        return self._get_geometry(
+            station, "off_axis_angle",
+            lambda: self._calculate_off_axis_angle(station),
+            orientation=True,
+        )
+
+    def _calculate_off_axis_angle(self, station) -> np.array:
         Az, b = self.get_pointing_vector_to(station)
         Az0 = self.azimuth
 
@@ -253,8 +333,6 @@ class StationManager(object):
             np.sin(np.radians(a)) * np.sin(np.radians(b)) * np.cos(np.radians(C)),
         )
         phi_deg = np.degrees(phi)
-        print('Resultado funcion get off axis angle:')
-        print(phi_deg)
         return phi_deg
 
     def is_imt_station(self) -> bool:
@@ -1,3 +1,6 @@
+import os
+
+
 def is_float(s: str) -> bool:
     """Check if string represents a float value
 
@@ -16,3 +19,28 @@ def is_float(s: str) -> bool:
         return True
     except ValueError:
         return False
+
+
+def get_cache_dir(name: str) -> str:
+    """Returns the directory where SHARC caches data of the given kind,
+    creating it if needed. The cache root is $SHARC_CACHE_DIR, or
+    ~/.cache/sharc if it is not set.
+
+    Parameters
+    ----------
+    name : str
+        name of the cache subdirectory
+
+    Returns
+    -------
+    str
+        absolute path of the cache directory
+    """
+    root = os.environ.get(
+        "SHARC_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "sharc"),
+    )
+    cache_dir = os.path.abspath(os.path.join(root, name))
+    os.makedirs(cache_dir, exist_ok=True)
+
+    return cache_dir
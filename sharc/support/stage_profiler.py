@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Measures where the time of the simulation snapshots goes.
+"""
+
+import contextlib
+import json
+import os
+import time
+import tracemalloc
+
+
+class StageProfiler(object):
+    """
+    Records the wall time (and optionally the memory allocations) of each
+    stage of the snapshots. Stages are measured with
+
+        with profiler.stage("name"):
+            ...
+
+    When the profiler is disabled, stage returns a shared no-op context
+    manager, so instrumented code runs at practically full speed.
+
+    Allocations are traced with tracemalloc, which slows down the measured
+    code, so they are only recorded if trace_allocations is True.
+
+    Attributes
+    ----------
+        enabled (bool): whether stages are measured
+        trace_allocations (bool): whether memory allocations are measured
+        num_snapshots (int): number of snapshots measured
+        stats (dict): statistics of each stage, in order of first use
+    """
+
+    json_file_name = "profile.json"
+    summary_file_name = "profile.txt"
+
+    _null_stage = contextlib.nullcontext()
+
+    def __init__(self, enabled=False, trace_allocations=False):
+        self.enabled = enabled
+        self.trace_allocations = enabled and trace_allocations
+        self.num_snapshots = 0
+        self.stats = dict()
+
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name: str):
+        """
+        Returns a context manager that measures the code it runs as the
+        stage name.
+        """
+        if not self.enabled:
+            return self._null_stage
+        return self._measure(name)
+
+    def end_snapshot(self):
+        """
+        Counts a measured snapshot.
+        """
+        if self.enabled:
+            self.num_snapshots += 1
+
+    @contextlib.contextmanager
+    def _measure(self, name: str):
+        if self.trace_allocations:
+            memory_before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            allocated = peak = 0
+            if self.trace_allocations:
+                memory_after, memory_peak = tracemalloc.get_traced_memory()
+                allocated = memory_after - memory_before
+                peak = memory_peak - memory_before
+            self._add(
+                name,
+                {
+                    "calls": 1,
+                    "total_time": elapsed,
+                    "min_time": elapsed,
+                    "max_time": elapsed,
+                    "allocated_bytes": allocated,
+                    "peak_bytes": peak,
+                },
+            )
+
+    def _add(self, name: str, stats: dict):
+        if name not in self.stats:
+            self.stats[name] = dict(stats)
+            return
+        total = self.stats[name]
+        total["calls"] += stats["calls"]
+        total["total_time"] += stats["total_time"]
+        total["min_time"] = min(total["min_time"], stats["min_time"])
+        total["max_time"] = max(total["max_time"], stats["max_time"])
+        total["allocated_bytes"] += stats["allocated_bytes"]
+        total["peak_bytes"] = max(total["peak_bytes"], stats["peak_bytes"])
+
+    def take_stats(self) -> dict:
+        """
+        Returns the statistics measured so far and resets them. Used to send
+        the statistics measured in a worker process to the main process.
+        """
+        stats = self.to_dict()
+        self.num_snapshots = 0
+        self.stats = dict()
+
+        return stats
+
+    def merge(self, stats: dict):
+        """
+        Adds statistics returned by take_stats (or to_dict) of another
+        profiler.
+        """
+        self.num_snapshots += stats["num_snapshots"]
+        for name, stage_stats in stats["stages"].items():
+            self._add(name, stage_stats)
+
+    def to_dict(self) -> dict:
+        """
+        Returns the measured statistics. Times are in seconds.
+        """
+        return {
+            "num_snapshots": self.num_snapshots,
+            "trace_allocations": self.trace_allocations,
+            "stages": {name: dict(stats) for name, stats in self.stats.items()},
+        }
+
+    def summary(self) -> str:
+        """
+        Returns a table with the statistics of each stage.
+        """
+        total_time = sum(stats["total_time"] for stats in self.stats.values())
+        snapshots = max(self.num_snapshots, 1)
+
+        header = f"{'stage':<24}{'calls':>8}{'total [s]':>12}{'mean [ms]':>12}" \
+            f"{'max [ms]':>12}{'share':>8}"
+        if self.trace_allocations:
+            header += f"{'alloc/snap [MB]':>17}{'peak [MB]':>11}"
+        lines = [
+            f"{self.num_snapshots} snapshots profiled",
+            header,
+            "-" * len(header),
+        ]
+        for name, stats in self.stats.items():
+            line = f"{name:<24}{stats['calls']:>8d}{stats['total_time']:>12.3f}" \
+                f"{1e3 * stats['total_time'] / stats['calls']:>12.3f}" \
+                f"{1e3 * stats['max_time']:>12.3f}" \
+                f"{stats['total_time'] / total_time if total_time else 0:>8.1%}"
+            if self.trace_allocations:
+                line += f"{stats['allocated_bytes'] / snapshots / 2**20:>17.3f}" \
+                    f"{stats['peak_bytes'] / 2**20:>11.3f}"
+            lines.append(line)
+        lines.append("-" * len(header))
+        lines.append(f"{'total':<24}{'':>8}{total_time:>12.3f}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, output_directory):
+        """
+        Writes the summary table and the statistics in JSON format to the
+        output directory. Nothing is written if the profiler is disabled.
+        """
+        if not self.enabled:
+            return
+        with open(os.path.join(output_directory, self.summary_file_name), "w") as f:
+            f.write(self.summary())
+        with open(os.path.join(output_directory, self.json_file_name), "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -52,8 +52,11 @@ class ThreadSimulation(Thread):
         start = time.perf_counter()
 
         self.model.initialize()
-        while not self.model.is_finished() and not self.is_stopped():
-            self.model.snapshot()
+        if self.model.num_workers > 1:
+            self.model.parallel_snapshots(self.is_stopped)
+        else:
+            while not self.model.is_finished() and not self.is_stopped():
+                self.model.snapshot()
         self.model.finalize()
         # calculates simulation time when it finishes and sets the elapsed time
         end = time.perf_counter()
@@ -19,8 +19,6 @@ import matplotlib.pyplot as plt
 import matplotlib.axes
 import matplotlib.patches as patches
 
-from shapely.geometry import Polygon
-
 from sharc.topology.topology import Topology
 from sharc.topology.topology_macrocell import TopologyMacrocell
 from sharc.parameters.imt.parameters_hotspot import ParametersHotspot
@@ -34,6 +32,11 @@ class TopologyHotspot(Topology):
 
     # Maximum number of tentatives when creating hotspots and checking if they overlap
     MAX_NUM_LOOPS = 2000
+    # Number of hotspot candidates checked at a time
+    CANDIDATE_BATCH_SIZE = 16
+    # Angles of the arc points of the hotspot coverage area polygons,
+    # relative to the hotspot azimuth [deg]
+    SECTOR_ANGLES = np.linspace(-60, 60, 25)
 
     def __init__(self, param: ParametersHotspot, intersite_distance: float, num_clusters: int):
         """
@@ -57,14 +60,10 @@ class TopologyHotspot(Topology):
         """
         Calculates coordinates of hotspots
         """
-
-        i = 0
-        x = np.empty(0)
-        y = np.empty(0)
-        azimuth = np.empty(0)
+        x = list()
+        y = list()
+        azimuth = list()
         for cell_x, cell_y, cell_azimuth in zip(self.macrocell.x, self.macrocell.y, self.macrocell.azimuth):
-            # print("base station #{}".format(i))
-            i += 1
             # find the center coordinates of the sector (hexagon)
             macro_cell_x = cell_x + self.macrocell.intersite_distance / \
                 3 * math.cos(math.radians(cell_azimuth))
@@ -77,79 +76,217 @@ class TopologyHotspot(Topology):
                 0, (self.macrocell.intersite_distance / 3) *
                 np.sqrt(3) / 2 - self.param.max_dist_hotspot_ue / 1.0,
             )
-            hotspot_x = np.array(0)
-            hotspot_y = np.array(0)
-            hotspot_azimuth = np.array(0)
 
+            # coordinates and coverage area vertices of the hotspots of the cell
+            hotspots = np.empty((0, 3))
+            vertices = np.empty((0, len(self.SECTOR_ANGLES) + 1, 2))
             for hs in range(self.param.num_hotspots_per_cell):
-                num_attempts = 0
-                while (True):
-                    # create one hotspot
-                    hotspot_radius = r * random_number_gen.rand(1)
-                    hotspot_angle = 2 * np.pi * random_number_gen.rand(1)
-                    candidate_x = hotspot_radius * \
-                        np.cos(hotspot_angle) + macro_cell_x
-                    candidate_y = hotspot_radius * \
-                        np.sin(hotspot_angle) + macro_cell_y
-                    candidate_azimuth = 360 * random_number_gen.rand(1)
-                    if hs == 0:
-                        # the candidate is valid if it is the first to be created
-                        hotspot_x = candidate_x
-                        hotspot_y = candidate_y
-                        hotspot_azimuth = candidate_azimuth
-                        break
-                    else:
-                        overlapping_hotspots = self.overlapping_hotspots(
-                            candidate_x,
-                            candidate_y,
-                            candidate_azimuth,
-                            hotspot_x,
-                            hotspot_y,
-                            hotspot_azimuth,
-                            self.cell_radius,
-                        )
-                        min_dist_validated = self.validade_min_dist_bs_hotspot(
-                            candidate_x,
-                            candidate_y,
-                            self.macrocell.x,
-                            self.macrocell.y,
-                            self.param.min_dist_bs_hotspot,
-                        )
-                        candidate_valid = (
-                            not overlapping_hotspots
-                        ) and min_dist_validated
-                        if candidate_valid:
-                            hotspot_x = np.concatenate(
-                                (hotspot_x, candidate_x),
-                            )
-                            hotspot_y = np.concatenate(
-                                (hotspot_y, candidate_y),
-                            )
-                            hotspot_azimuth = np.concatenate(
-                                (hotspot_azimuth, candidate_azimuth),
-                            )
-                            break
-                        else:
-                            num_attempts = num_attempts + 1
-
-                        if num_attempts > TopologyHotspot.MAX_NUM_LOOPS:
-                            sys.stderr.write(
-                                "ERROR\nInfinite loop while creating hotspots.\n \
-                                Try less hotspots per cell or greater macro cell intersite distance.\n",
-                            )
-                            sys.exit(1)
-                # if num_attempts > 1: print("number of attempts: {}".format(num_attempts))
-            x = np.concatenate([x, hotspot_x])
-            y = np.concatenate([y, hotspot_y])
-            azimuth = np.concatenate([azimuth, hotspot_azimuth])
-
-        self.x = x
-        self.y = y
-        self.azimuth = azimuth
+                if hs == 0:
+                    # the candidate is valid if it is the first to be created
+                    hotspot = self.generate_candidates(
+                        random_number_gen, 1, r, macro_cell_x, macro_cell_y,
+                    )
+                else:
+                    hotspot = self.place_hotspot(
+                        random_number_gen, r, macro_cell_x, macro_cell_y,
+                        vertices,
+                    )
+                hotspots = np.concatenate((hotspots, hotspot))
+                vertices = np.concatenate((
+                    vertices,
+                    self.sector_vertices(
+                        hotspot[:, 0], hotspot[:, 1], hotspot[:, 2], self.cell_radius,
+                    ),
+                ))
+            x.append(hotspots[:, 0])
+            y.append(hotspots[:, 1])
+            azimuth.append(hotspots[:, 2])
+
+        self.x = np.concatenate(x)
+        self.y = np.concatenate(y)
+        self.azimuth = np.concatenate(azimuth)
         # In the end, we have to update the number of base stations
         self.num_base_stations = len(self.x)
         self.indoor = np.zeros(self.num_base_stations, dtype=bool)
 
+    @staticmethod
+    def generate_candidates(
+        random_number_gen: np.random.RandomState,
+        num_candidates: int,
+        r: float,
+        macro_cell_x: float,
+        macro_cell_y: float,
+    ) -> np.array:
+        """
+        Draws hotspot candidates uniformly in angle and radius inside a circle.
+        Each candidate uses three consecutive random numbers (radius, angle and
+        azimuth), so drawing a batch gives the same candidates as drawing them
+        one at a time.
+
+        Returns
+        -------
+            array with the x, y and azimuth of each candidate in its rows
+        """
+        rand = random_number_gen.rand(num_candidates, 3)
+        hotspot_radius = r * rand[:, 0]
+        hotspot_angle = 2 * np.pi * rand[:, 1]
+        return np.stack((
+            hotspot_radius * np.cos(hotspot_angle) + macro_cell_x,
+            hotspot_radius * np.sin(hotspot_angle) + macro_cell_y,
+            360 * rand[:, 2],
+        ), axis=-1)
+
+    def place_hotspot(
+        self,
+        random_number_gen: np.random.RandomState,
+        r: float,
+        macro_cell_x: float,
+        macro_cell_y: float,
+        vertices: np.array,
+    ) -> np.array:
+        """
+        Draws candidates until one does not overlap the hotspots of the cell
+        and meets the minimum distance to the macro cell base stations.
+
+        Candidates are drawn and checked in batches. The random number
+        generator is then rewound to right after the accepted candidate, so
+        the hotspots are the same as if candidates were drawn one at a time.
+
+        Parameters
+        ----------
+            vertices: coverage area vertices of the hotspots of the cell, as
+                returned by sector_vertices
+
+        Returns
+        -------
+            array with the x, y and azimuth of the hotspot in its single row
+        """
+        num_attempts = 0
+        while num_attempts <= TopologyHotspot.MAX_NUM_LOOPS:
+            num_candidates = min(
+                self.CANDIDATE_BATCH_SIZE,
+                TopologyHotspot.MAX_NUM_LOOPS + 1 - num_attempts,
+            )
+            state = random_number_gen.get_state()
+            candidates = self.generate_candidates(
+                random_number_gen, num_candidates, r, macro_cell_x, macro_cell_y,
+            )
+
+            valid = ~np.any(
+                self.overlapping_sectors(
+                    self.sector_vertices(
+                        candidates[:, 0], candidates[:, 1], candidates[:, 2],
+                        self.cell_radius,
+                    ),
+                    vertices,
+                ),
+                axis=1,
+            )
+            valid[valid] = self.validate_min_dist_bs_hotspots(
+                candidates[valid, 0],
+                candidates[valid, 1],
+                self.macrocell.x,
+                self.macrocell.y,
+                self.param.min_dist_bs_hotspot,
+            )
+
+            accepted = np.nonzero(valid)[0]
+            if len(accepted):
+                # consume only the random numbers of the candidates up to the
+                # accepted one
+                random_number_gen.set_state(state)
+                random_number_gen.rand(accepted[0] + 1, 3)
+                return candidates[accepted[0]:accepted[0] + 1]
+            num_attempts += num_candidates
+
+        sys.stderr.write(
+            "ERROR\nInfinite loop while creating hotspots.\n \
+            Try less hotspots per cell or greater macro cell intersite distance.\n",
+        )
+        sys.exit(1)
+
+    @staticmethod
+    def sector_vertices(
+        x: np.array,
+        y: np.array,
+        azimuth: np.array,
+        radius: float,
+    ) -> np.array:
+        """
+        Returns the vertices of the polygons that approximate the coverage
+        area of hotspots: the hotspot position followed by the points of a
+        120 degrees arc centered on the azimuth.
+
+        Returns
+        -------
+            array with shape (num_hotspots, num_vertices, 2)
+        """
+        angles = np.radians(
+            np.asarray(azimuth, dtype=float).reshape((-1, 1)) +
+            TopologyHotspot.SECTOR_ANGLES,
+        )
+        x = np.asarray(x, dtype=float).reshape((-1, 1))
+        y = np.asarray(y, dtype=float).reshape((-1, 1))
+        return np.stack((
+            np.concatenate((x, x + radius * np.cos(angles)), axis=1),
+            np.concatenate((y, y + radius * np.sin(angles)), axis=1),
+        ), axis=-1)
+
+    @staticmethod
+    def overlapping_sectors(vertices_1: np.array, vertices_2: np.array) -> np.array:
+        """
+        Checks which of two sets of coverage area polygons overlap. The
+        polygons are convex, so two of them overlap unless the projections of
+        their vertices on the normal of one of their edges do not overlap
+        (separating axis theorem). Only pairs whose bounding circles overlap
+        can intersect, so only those are tested.
+
+        Parameters
+        ----------
+            vertices_1: vertices of the first set, as returned by sector_vertices
+            vertices_2: vertices of the second set
+
+        Returns
+        -------
+            array with shape (len(vertices_1), len(vertices_2)) which is True
+            where the polygons intersect
+        """
+        overlapping = np.zeros((len(vertices_1), len(vertices_2)), dtype=bool)
+        if not overlapping.size:
+            return overlapping
+
+        # polygons farther apart than the sum of the radii of their bounding
+        # circles do not overlap
+        center_1 = np.mean(vertices_1, axis=1)
+        center_2 = np.mean(vertices_2, axis=1)
+        radius_1 = np.max(np.linalg.norm(vertices_1 - center_1[:, np.newaxis], axis=-1), axis=1)
+        radius_2 = np.max(np.linalg.norm(vertices_2 - center_2[:, np.newaxis], axis=-1), axis=1)
+        distance = np.linalg.norm(
+            center_1[:, np.newaxis] - center_2[np.newaxis, :], axis=-1,
+        )
+        idx_1, idx_2 = np.nonzero(
+            distance <= radius_1[:, np.newaxis] + radius_2[np.newaxis, :],
+        )
+        if not len(idx_1):
+            return overlapping
+
+        poly_1 = vertices_1[idx_1]
+        poly_2 = vertices_2[idx_2]
+        # edge normals of both polygons of each pair
+        edges = np.concatenate((
+            np.roll(poly_1, -1, axis=1) - poly_1,
+            np.roll(poly_2, -1, axis=1) - poly_2,
+        ), axis=1)
+        normals = np.stack((-edges[..., 1], edges[..., 0]), axis=-1)
+        # projections with shape (pairs, axes, vertices)
+        proj_1 = normals @ np.swapaxes(poly_1, 1, 2)
+        proj_2 = normals @ np.swapaxes(poly_2, 1, 2)
+        separated = (np.max(proj_1, axis=-1) <= np.min(proj_2, axis=-1)) | \
+            (np.max(proj_2, axis=-1) <= np.min(proj_1, axis=-1))
+        overlapping[idx_1, idx_2] = ~np.any(separated, axis=-1)
+
+        return overlapping
+
     def overlapping_hotspots(
         self,
         candidate_x: np.array,
@@ -179,42 +316,12 @@ class TopologyHotspot(Topology):
         -------
             True if there is intersection between any two hotspots
         """
-        # Each hotspot coverage area corresponds to a Polygon object
-        # Creating the set of polygons
-        set_polygons = list()
-        azimuth_values = np.linspace(-60, 60, 25)
-        for x, y, azimuth in zip(set_x, set_y, set_azimuth):
-            set_points = list()
-            set_points.append((x, y))
-            for a in range(len(azimuth_values)):
-                set_points.append((
-                    x + radius * math.cos(np.radians(azimuth + azimuth_values[a])),
-                    y + radius * math.sin(np.radians(azimuth + azimuth_values[a])),
-                ))
-            set_polygons.append(Polygon(set_points))
-
-        # Creating the candidate polygon
-        points = list()
-        points.append((candidate_x, candidate_y))
-        for a in range(len(azimuth_values)):
-            points.append((
-                candidate_x + radius * math.cos(np.radians(candidate_azimuth + azimuth_values[a])),
-                candidate_y + radius * math.sin(np.radians(candidate_azimuth + azimuth_values[a])),
-            ))
-        polygon = Polygon(points)
-
-        # Check if there is overlapping between the candidate hotspot and
-        # any of the hotspots of the set. In other words, check if any polygons
-        # intersect
-        for p in range(len(set_polygons)):
-            overlapping = polygon.intersects(set_polygons[p])
-            if overlapping:
-                # An intersection was found! We stop here because we do not
-                # need to check other combinations
-                return True
-
-        # If this point is reached, then there is no intersection between polygons
-        return False
+        return bool(np.any(
+            self.overlapping_sectors(
+                self.sector_vertices(candidate_x, candidate_y, candidate_azimuth, radius),
+                self.sector_vertices(set_x, set_y, set_azimuth, radius),
+            ),
+        ))
 
     def validade_min_dist_bs_hotspot(
         self,
@@ -234,18 +341,38 @@ class TopologyHotspot(Topology):
             True if hotspots coordinates meets the minimum 2D distance between
             macro cell base stations and hotspots
         """
+        return bool(np.all(
+            self.validate_min_dist_bs_hotspots(
+                hotspot_x, hotspot_y, macrocell_x, macrocell_y, min_dist_bs_hotspot,
+            ),
+        ))
+
+    @staticmethod
+    def validate_min_dist_bs_hotspots(
+        hotspot_x: np.array,
+        hotspot_y: np.array,
+        macrocell_x: np.array,
+        macrocell_y: np.array,
+        min_dist_bs_hotspot: float,
+    ) -> np.array:
+        """
+        Checks minimum 2D distance between macro cell base stations and each
+        hotspot.
+
+        Returns
+        -------
+        out : np.array
+            True for each hotspot that meets the minimum 2D distance to all
+            macro cell base stations
+        """
         # Here we have a 2D matrix whose values indicates the distance between
         # base station and hotspots. In this matrix, each line corresponds to
         # a macro cell base station and each column corresponds to a hotspot
         distance = np.sqrt(
-            (hotspot_x - macrocell_x.reshape((-1, 1)))**2 +
-            (hotspot_y - macrocell_y.reshape((-1, 1)))**2,
+            (np.reshape(hotspot_x, (1, -1)) - macrocell_x.reshape((-1, 1)))**2 +
+            (np.reshape(hotspot_y, (1, -1)) - macrocell_y.reshape((-1, 1)))**2,
         )
-        # count the number of values that are less than the minimum distance and
-        # return true if any value is equal os less than minimum 2D distance
-        # between macro cell base stations and hotspot centers
-        occ = np.where(distance < min_dist_bs_hotspot)[0]
-        return len(occ) == 0
+        return ~np.any(distance < min_dist_bs_hotspot, axis=0)
 
     def plot(self, ax: matplotlib.axes.Axes):
         # plot macrocells
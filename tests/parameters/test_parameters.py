@@ -1,6 +1,13 @@
 from pathlib import Path
+import copy
+import os
+import tempfile
 import unittest
+from unittest import mock
 from sharc.parameters.parameters import Parameters
+from sharc.parameters import parameters_base
+from sharc.parameters.parameters_fss_ss import ParametersFssSs
+from sharc.parameters.parameters_p619 import ParametersP619
 import numpy as np
 
 
@@ -449,6 +456,58 @@ class ParametersTest(unittest.TestCase):
             'azimuth.uniform_dist.max' in str(
                 err_context.exception))
 
+    def test_read_config_file(self):
+        """The config file is parsed once for all sections
+        """
+        parameters_base._config_files.clear()
+        with mock.patch.object(
+            parameters_base.yaml, "load", wraps=parameters_base.yaml.load,
+        ) as load:
+            parameters = Parameters()
+            parameters.set_file_name(self.parameters.file_name)
+            parameters.read_params()
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(parameters.imt, self.parameters.imt)
+        self.assertEqual(parameters.fss_ss, self.parameters.fss_ss)
+
+        # the parsed configuration is not shared with the sections
+        config = parameters_base.read_config_file(self.parameters.file_name)
+        config["general"]["seed"] = -1
+        self.assertNotEqual(
+            parameters_base.read_config_file(self.parameters.file_name)["general"]["seed"],
+            -1,
+        )
+
+    def test_read_params_cache(self):
+        """Compiled parameters are saved to and loaded from the cache
+        """
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                mock.patch.dict(os.environ, {"SHARC_CACHE_DIR": cache_dir}):
+            parameters = Parameters()
+            parameters.set_file_name(self.parameters.file_name)
+            parameters.read_params(use_cache=True)
+            self.assertEqual(
+                len(os.listdir(os.path.join(cache_dir, "parameters"))), 1,
+            )
+
+            # parameters kept in class attributes are cached as well
+            param_p619 = copy.copy(self.parameters.fss_ss.param_p619)
+            cached = Parameters()
+            cached.set_file_name(self.parameters.file_name)
+            with mock.patch.object(
+                parameters_base, "read_config_file",
+            ) as read_config_file, mock.patch.object(
+                ParametersFssSs, "param_p619", ParametersP619(),
+            ):
+                cached.read_params(use_cache=True)
+                read_config_file.assert_not_called()
+                self.assertEqual(cached.fss_ss.param_p619, param_p619)
+
+        for section in ["general", "imt", "fss_ss", "fss_es", "single_earth_station"]:
+            self.assertEqual(
+                getattr(cached, section), getattr(self.parameters, section),
+            )
+
 
 if __name__ == '__main__':
     unittest.main()
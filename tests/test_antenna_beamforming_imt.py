@@ -300,6 +300,27 @@ class AntennaBeamformingImtTest(unittest.TestCase):
         beam_g = self.antenna2._beam_gain(phi, theta)
         self.assertAlmostEqual(beam_g, 11.9636, delta=eps)
 
+    def test_beam_gains(self):
+        # Error margin and antenna
+        eps = 1e-9
+        par = self.bs_param.get_antenna_parameters()
+        self.antenna1 = AntennaBeamformingImt(par, 0, 0)
+        self.antenna1.add_beam(45, 135)
+        self.antenna1.add_beam(-20, 95)
+
+        phi = np.array([45.0, 32.5, -100.3, 0.0, 170.1])
+        theta = np.array([45.0, 115.2, 90.0, 60.0, 10.4])
+        beams = np.array([0, 1, -1, 1, -1])
+
+        for station_type in [StationType.IMT_BS, StationType.IMT_UE]:
+            gains = self.antenna1._beam_gains(phi, theta, beams,
+                                              station_type=station_type)
+            expected = [
+                self.antenna1._beam_gain(p, t, b, station_type=station_type)
+                for p, t, b in zip(phi, theta, beams)
+            ]
+            npt.assert_allclose(gains, expected, atol=eps)
+
     def test_calculate_gain(self):
         # Error margin and antenna
         eps = 1e-4
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+
+from sharc.antenna.antenna_lut import AntennaLut
+from sharc.antenna.antenna_omni import AntennaOmni
+from sharc.antenna.antenna_s465 import AntennaS465
+from sharc.antenna.antenna_s672 import AntennaS672
+from sharc.antenna.antenna_sa509 import AntennaSA509
+from sharc.parameters.parameters_fss_es import ParametersFssEs
+from sharc.parameters.parameters_fss_ss import ParametersFssSs
+from sharc.parameters.parameters_ras import ParametersRas
+
+
+class AntennaLutTest(unittest.TestCase):
+
+    def setUp(self):
+        param = ParametersFssEs()
+        param.frequency = 27000
+        param.antenna_gain = 50
+        param.diameter = 0.45
+        self.antenna_s465 = AntennaS465(param)
+
+        param = ParametersFssSs()
+        param.antenna_gain = 50
+        param.antenna_3_dB = 2
+        param.antenna_l_s = -20
+        self.antenna_s672 = AntennaS672(param)
+
+        param = ParametersRas()
+        param.diameter = 10
+        param.antenna_efficiency = 1
+        param.frequency = 30000
+        self.antenna_sa509 = AntennaSA509(param)
+
+    def test_calculate_gain(self):
+        rng = np.random.RandomState(101)
+        phi = np.concatenate((rng.uniform(-180, 180, 20000), [0, 0.1, 48, 180]))
+        for antenna in [self.antenna_s465, self.antenna_s672, self.antenna_sa509]:
+            lut = AntennaLut(antenna, 0.1)
+            self.assertLessEqual(lut.max_error, AntennaLut.tolerance)
+            exact = antenna.calculate_gain(off_axis_angle_vec=phi)
+            gain = lut.calculate_gain(off_axis_angle_vec=phi)
+            self.assertLessEqual(np.max(np.abs(gain - exact)), AntennaLut.tolerance)
+            # exact at the samples of the table
+            angles = np.arange(len(lut.gains)) * lut.resolution
+            npt.assert_allclose(
+                lut.calculate_gain(off_axis_angle_vec=angles),
+                antenna.calculate_gain(off_axis_angle_vec=angles),
+            )
+        # the discontinuity of the S.465 pattern is calculated exactly
+        lut = AntennaLut(self.antenna_s465, 0.1)
+        phi_min = self.antenna_s465.phi_min
+        phi = np.array([phi_min - 1e-9, phi_min])
+        npt.assert_equal(
+            lut.calculate_gain(off_axis_angle_vec=phi),
+            self.antenna_s465.calculate_gain(off_axis_angle_vec=phi),
+        )
+        # including angles of arrays with more than one dimension
+        phi = np.array([[phi_min - 1e-9, 10], [phi_min, 47.99]])
+        npt.assert_equal(
+            lut.calculate_gain(off_axis_angle_vec=phi)[:, 0],
+            self.antenna_s465.calculate_gain(off_axis_angle_vec=phi[:, 0]),
+        )
+        npt.assert_allclose(
+            lut.calculate_gain(off_axis_angle_vec=phi),
+            self.antenna_s465.calculate_gain(off_axis_angle_vec=phi.ravel()).reshape(2, 2),
+            atol=AntennaLut.tolerance,
+        )
+
+    def test_tables(self):
+        lut = AntennaLut(self.antenna_s465, 0.5)
+        param = ParametersFssEs()
+        param.frequency = 27000
+        param.antenna_gain = 50
+        param.diameter = 0.45
+        # same pattern parameters: the table is reused
+        self.assertIs(AntennaLut(AntennaS465(param), 0.5).gains, lut.gains)
+        param.diameter = 1.8
+        self.assertIsNot(AntennaLut(AntennaS465(param), 0.5).gains, lut.gains)
+
+        # attributes of the exact pattern
+        self.assertEqual(lut.peak_gain, 50)
+        self.assertEqual(
+            AntennaLut(self.antenna_sa509, 0.5).effective_area,
+            self.antenna_sa509.effective_area,
+        )
+
+    def test_get_antenna(self):
+        self.assertIsInstance(AntennaLut.get_antenna(self.antenna_s465, 0.1), AntennaLut)
+        self.assertIs(AntennaLut.get_antenna(self.antenna_s465, 0), self.antenna_s465)
+        omni = AntennaOmni(10)
+        self.assertIs(AntennaLut.get_antenna(omni, 0.1), omni)
+        with self.assertRaises(ValueError):
+            AntennaLut(self.antenna_s465, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,11 +7,13 @@ Created on Tue Aug 15 17:07:07 2017
 
 import unittest
 
-from sharc.antenna.antenna_s1528 import AntennaS1528
+from sharc.antenna.antenna_s1528 import AntennaS1528, AntennaS1528Taylor
+from sharc.parameters.antenna.parameters_antenna_s1528 import ParametersAntennaS1528
 from sharc.parameters.parameters_fss_ss import ParametersFssSs
 
 import numpy as np
 import numpy.testing as npt
+from scipy.special import jn, jn_zeros
 
 
 class AntennaS1528Test(unittest.TestCase):
@@ -55,5 +57,56 @@ class AntennaS1528Test(unittest.TestCase):
         npt.assert_allclose(gain30, ref_gain30, atol=1e-2)
 
 
+class AntennaS1528TaylorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.param = ParametersAntennaS1528(
+            antenna_gain=30,
+            frequency=2200,
+            bandwidth=5,
+            slr=20,
+            n_side_lobes=4,
+            l_r=1.6,
+            l_t=1.2,
+            roll_off=7,
+        )
+        self.antenna = AntennaS1528Taylor(self.param)
+
+    def reference_gain(self, theta, phi):
+        """Section 1.4 of Recommendation ITU-R S.1528-0"""
+        p = self.param
+        lamb = 299792458 / 1e6 / (p.frequency - p.bandwidth / 2)
+        A = np.arccosh(10 ** (p.slr / 20)) / np.pi
+        sigma = jn_zeros(1, p.n_side_lobes)[-1] / np.pi / \
+            np.sqrt(A ** 2 + (p.n_side_lobes - 0.5) ** 2)
+        theta = np.radians(theta)
+        phi = np.radians(phi)
+        u = np.pi / lamb * np.sqrt(
+            (p.l_r * np.sin(theta) * np.cos(phi)) ** 2 +
+            (p.l_t * np.sin(theta) * np.sin(phi)) ** 2,
+        )
+        gain = 2 * jn(1, u) / u
+        for i, mu in enumerate(jn_zeros(1, p.n_side_lobes - 1) / np.pi):
+            gain *= (1 - u ** 2 / (np.pi ** 2 * sigma ** 2 * (A ** 2 + (i + 0.5) ** 2))) / \
+                (1 - (u / (np.pi * mu)) ** 2)
+        return p.antenna_gain + 20 * np.log10(np.abs(gain))
+
+    def test_calculate_gain(self):
+        rng = np.random.RandomState(101)
+        theta = rng.uniform(0.01, 90, 10000)
+        phi = rng.uniform(-180, 180, 10000)
+        gain = self.antenna.calculate_gain(theta=theta, phi=phi)
+        npt.assert_allclose(gain, self.reference_gain(theta, phi), atol=1e-6)
+
+        # main lobe and first side lobe, about slr dB below the peak gain
+        theta = np.linspace(0.01, 20, 20000)
+        gain = self.antenna.calculate_gain(theta=theta, phi=np.zeros_like(theta))
+        self.assertAlmostEqual(gain[0], self.param.antenna_gain, delta=1e-3)
+        first_null = np.argmax(np.diff(gain) > 0)
+        self.assertAlmostEqual(
+            np.max(gain[first_null:]), self.param.antenna_gain - self.param.slr, delta=1,
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -36,6 +36,31 @@ class TestAtmosphere(unittest.TestCase):
         npt.assert_array_less(specific_att_p676_lower, specific_att)
         npt.assert_array_less(specific_att, specific_att_p676_upper)
 
+        # layers are calculated together
+        npt.assert_allclose(
+            self.atmosphere._get_specific_attenuation(np.full(3, pressure_hPa),
+                                                      np.full(3, vapour_pressure_hPa),
+                                                      np.full(3, temperature),
+                                                      60000.),
+            specific_att[1],
+        )
+
+    def test_layer_table(self):
+        altitude_km = np.array([-.5, 0., 5., 11., 15., 25., 40., 50., 60., 80., 99.])
+        table = self.atmosphere.get_layer_table(altitude_km, 7.5, 27000.)
+        for index, altitude in enumerate(altitude_km):
+            npt.assert_allclose(
+                [param[index] for param in table],
+                self.atmosphere.get_atmospheric_params(altitude, 7.5, 27000.),
+                rtol=1e-14,
+            )
+
+        # reference dry atmosphere of ITU-R P.619, Table C.1
+        temperature, pressure, _, refractive_index, _ = table
+        npt.assert_allclose(temperature[[1, 3, 5]], [288.15, 216.65, 221.65])
+        npt.assert_allclose(pressure[[1, 3]], [1013.25, 226.323], rtol=1e-3)
+        self.assertTrue(np.all(np.diff(refractive_index[1:]) < 0))
+
 
 if __name__ == '__main__':
     unittest.main()
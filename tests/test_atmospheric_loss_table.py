@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+
+from sharc.parameters.constants import EARTH_RADIUS
+from sharc.propagation.atmosphere import ReferenceAtmosphere
+from sharc.propagation.atmospheric_loss_table import AtmosphericLossTable
+from sharc.propagation.propagation_p619 import PropagationP619
+
+
+def trace_layer_by_layer(frequency_MHz, earth_station_alt_m, surf_water_vapour_density, apparent_elevation):
+    """
+    Traces one ray through the atmosphere layers one at a time, as described
+    in ITU-R P.619, Attachment C.
+    """
+    atmosphere = ReferenceAtmosphere()
+    earth_radius_km = EARTH_RADIUS / 1000
+    a_acc = 0.
+    h = earth_station_alt_m / 1000
+    beta = (90 - abs(apparent_elevation)) * np.pi / 180.
+    rho_s = surf_water_vapour_density * np.exp(h / 2)
+
+    if apparent_elevation < 0:
+        _, _, _, n, gamma = atmosphere.get_atmospheric_params(h, rho_s, frequency_MHz)
+        delta = .0001 + .01 * max(h, 0)
+        r = earth_radius_km + h - delta
+        while True:
+            m = (r + delta) * np.sin(beta) - r
+            if m >= 0:
+                a_acc += 2 * np.sqrt(2 * r * (delta - m) + delta ** 2 - m ** 2) * gamma
+                break
+            a_acc += ((r + delta) * np.cos(beta) - np.sqrt(
+                (r + delta) ** 2 * np.cos(beta) ** 2 - (2 * r * delta + delta ** 2))) * gamma
+            alpha = np.arcsin((r + delta) / r * np.sin(beta))
+            h -= delta
+            r -= delta
+            _, _, _, n_new, gamma = atmosphere.get_atmospheric_params(h, rho_s, frequency_MHz)
+            delta = .0001 + .01 * max(h, 0)
+            beta = np.arcsin(n / n_new * np.sin(alpha))
+            n = n_new
+
+    _, _, _, n, gamma = atmosphere.get_atmospheric_params(h, rho_s, frequency_MHz)
+    delta = .0001 + .01 * max(h, 0)
+    r = earth_radius_km + h
+    while True:
+        a_acc += (np.sqrt(r ** 2 * np.cos(beta) ** 2 + 2 * r * delta + delta ** 2) -
+                  r * np.cos(beta)) * gamma
+        alpha = np.arcsin(r / (r + delta) * np.sin(beta))
+        h += delta
+        if h >= 100:
+            break
+        r += delta
+        delta = .0001 + .01 * max(h, 0)
+        _, _, _, n_new, gamma = atmosphere.get_atmospheric_params(h, rho_s, frequency_MHz)
+        beta = np.arcsin(n / n_new * np.sin(alpha))
+        n = n_new
+
+    return a_acc
+
+
+class TestAtmosphericLossTable(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.env = mock.patch.dict(
+            os.environ, {"SHARC_CACHE_DIR": self.cache_dir.name},
+        )
+        self.env.start()
+        AtmosphericLossTable._tables.clear()
+        self.p619 = PropagationP619(
+            random_number_gen=np.random.RandomState(101),
+            space_station_alt_m=35786000.,
+            earth_station_alt_m=1000.,
+            earth_station_lat_deg=-15.7801,
+            earth_station_long_diff_deg=0.,
+            season="SUMMER",
+        )
+
+    def tearDown(self):
+        AtmosphericLossTable._tables.clear()
+        self.env.stop()
+        self.cache_dir.cleanup()
+
+    def test_trace(self):
+        # rays traced together give the same loss as rays traced one by one
+        apparent_elevation = np.array([0., 2.5, 10., 45., 90.])
+        loss = AtmosphericLossTable.trace(2680., 1000., 7.5, apparent_elevation)
+        for elevation, expected in zip(apparent_elevation, loss):
+            self.assertAlmostEqual(
+                self.p619._get_atmospheric_gasses_loss(
+                    frequency_MHz=2680.,
+                    apparent_elevation=elevation,
+                    surf_water_vapour_density=7.5,
+                    lookupTable=False,
+                ),
+                expected,
+                places=12,
+            )
+
+    def test_trace_layer_by_layer(self):
+        # rays traced together, including rays that first go down, give the
+        # same loss as rays traced layer by layer
+        apparent_elevation = np.array([-1., -.2, 0., 1., 30., 90.])
+        loss = AtmosphericLossTable.trace(27000., 10000., 7.5, apparent_elevation)
+        npt.assert_allclose(
+            loss,
+            [trace_layer_by_layer(27000., 10000., 7.5, elevation) for elevation in apparent_elevation],
+            rtol=1e-9,
+        )
+
+    def test_get_loss(self):
+        table = AtmosphericLossTable(1., np.arange(91.))
+        npt.assert_allclose(
+            table.get_loss([0, .5, 45.25, 90, 100]),
+            [0, .5, 45.25, 90, 80],
+        )
+        npt.assert_equal(table.get_loss(np.ones((2, 3))).shape, (2, 3))
+        with self.assertRaises(ValueError):
+            table.get_loss([-1])
+
+    def test_get_table(self):
+        table = AtmosphericLossTable.get_table(
+            2680., 1000., -15.7801, "SUMMER", 7.5, elevation_step=1.,
+        )
+        npt.assert_equal(table.elevation, np.arange(91.))
+        npt.assert_allclose(
+            table.loss[[0, 10, 90]],
+            AtmosphericLossTable.trace(2680., 1000., 7.5, [0., 10., 90.]),
+        )
+        # tables are built once per process ...
+        self.assertIs(
+            AtmosphericLossTable.get_table(
+                2680., 1000., -15.7801, "SUMMER", 7.5, elevation_step=1.,
+            ),
+            table,
+        )
+        # ... and then loaded from the disk cache
+        AtmosphericLossTable._tables.clear()
+        with mock.patch.object(AtmosphericLossTable, "trace") as trace:
+            loaded = AtmosphericLossTable.get_table(
+                2680., 1000., -15.7801, "SUMMER", 7.5, elevation_step=1.,
+            )
+            trace.assert_not_called()
+        npt.assert_equal(loaded.loss, table.loss)
+        self.assertEqual(
+            len(os.listdir(os.path.join(self.cache_dir.name, "atmospheric_loss"))), 1,
+        )
+
+        # any change in the parameters gives another table
+        other = AtmosphericLossTable.get_table(
+            2680., 1000., -15.7801, "SUMMER", 12.5, elevation_step=1.,
+        )
+        self.assertTrue(np.all(other.loss > table.loss))
+
+    def test_p619_lookup_table(self):
+        with mock.patch.object(AtmosphericLossTable, "default_elevation_step", 1.):
+            apparent_elevation = np.array([[0., 10.], [20., 40.]])
+            loss = self.p619._get_atmospheric_gasses_loss(
+                frequency_MHz=2680.,
+                apparent_elevation=apparent_elevation,
+                surf_water_vapour_density=7.5,
+            )
+        npt.assert_allclose(
+            loss,
+            AtmosphericLossTable.trace(2680., 1000., 7.5, apparent_elevation),
+        )
+
+    def test_p619_negative_elevation(self):
+        apparent_elevation = np.array([[-.5, 10.], [-.5, -.1]])
+        loss = self.p619._get_atmospheric_gasses_loss(
+            frequency_MHz=2680.,
+            apparent_elevation=apparent_elevation,
+            surf_water_vapour_density=7.5,
+        )
+        npt.assert_allclose(
+            loss,
+            AtmosphericLossTable.trace(2680., 1000., 7.5, apparent_elevation),
+            rtol=1e-4,
+        )
+        npt.assert_equal(loss[0, 0], loss[1, 0])
+        # traced elevations are cached
+        self.assertEqual(sorted(self.p619.atmospheric_loss[(2680., 7.5)]), [-.5, -.1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+
+from sharc.antenna.antenna_beamforming_imt import AntennaBeamformingImt
+from sharc.antenna.beamforming_normalization.beamforming_normalizer import BeamformingNormalizer
+from sharc.support.named_tuples import AntennaPar
+
+
+class BeamformingNormalizerGenerationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.par = AntennaPar(
+            "SINGLE_ELEMENT",  # adjacent_antenna_model
+            False,  # normalization
+            None,  # normalization_data
+            "M2101",  # element_pattern
+            5,  # element_max_g
+            65,  # element_phi_3db
+            65,  # element_theta_3db
+            30,  # element_am
+            30,  # element_sla_v
+            4,  # n_rows
+            4,  # n_columns
+            0.5,  # element_horiz_spacing
+            0.5,  # element_vert_spacing
+            12,  # multiplication_factor
+            -200,  # minimum_array_gain
+            0,  # downtilt
+        )
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp_dir.name, "norm.npz")
+        self.checkpoint_dir = os.path.join(self.tmp_dir.name, "rows")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_invalid_method(self):
+        with self.assertRaises(ValueError):
+            BeamformingNormalizer(90, 1e-2, "TRAPEZOID")
+
+    def test_gauss_legendre(self):
+        dblquad = BeamformingNormalizer(90, 1e-2)
+        gauss_legendre = BeamformingNormalizer(
+            90, 1e-2, "GAUSS_LEGENDRE", (120, 60),
+        )
+        for norm in [dblquad, gauss_legendre]:
+            norm.antenna = AntennaBeamformingImt(self.par, 0, 0)
+
+        for phi, theta, c_chan in [(0, 0, False), (30, 60, True)]:
+            c_fac, err = gauss_legendre.calculate_correction_factor(
+                phi, theta, c_chan,
+            )
+            c_fac_ref, _ = dblquad.calculate_correction_factor(
+                phi, theta, c_chan,
+            )
+            self.assertAlmostEqual(c_fac, c_fac_ref, delta=1e-2)
+            self.assertLessEqual(err[0], c_fac)
+            self.assertGreaterEqual(err[1], c_fac)
+            self.assertLess(err[1] - err[0], 1e-2)
+
+    def test_generate_parallel(self):
+        norm = BeamformingNormalizer(60, 1e-2, "GAUSS_LEGENDRE", (60, 30))
+        norm.generate_correction_matrix(self.par, self.file_name, True)
+        with np.load(self.file_name, allow_pickle=True) as data:
+            serial = dict(data)
+
+        norm.generate_correction_matrix(
+            self.par, self.file_name, True, workers=2,
+            checkpoint_dir=self.checkpoint_dir,
+        )
+        with np.load(self.file_name, allow_pickle=True) as data:
+            parallel = dict(data)
+
+        self.assertEqual(set(parallel.keys()), set(serial.keys()))
+        self.assertEqual(parallel["correction_factor_co_channel"].shape, (6, 3))
+        npt.assert_equal(
+            parallel["correction_factor_co_channel"],
+            serial["correction_factor_co_channel"],
+        )
+        self.assertEqual(
+            parallel["error_co_channel"][2, 1], serial["error_co_channel"][2, 1],
+        )
+        self.assertEqual(parallel["resolution"], 60)
+        # checkpoints are removed once the file is saved
+        self.assertFalse(os.path.exists(self.checkpoint_dir))
+
+    def test_resume(self):
+        norm = BeamformingNormalizer(60, 1e-2, "GAUSS_LEGENDRE", (60, 30))
+        signature = norm._checkpoint_signature(self.par)
+        # rows finished by a previous run are loaded, not recalculated ...
+        norm._save_row(
+            self.checkpoint_dir, signature, 1, np.full(3, 123.0), np.zeros((3, 2)),
+        )
+        # ... unless they were calculated with other settings
+        norm._save_row(
+            self.checkpoint_dir, "other", 2, np.full(3, 123.0), np.zeros((3, 2)),
+        )
+
+        norm.generate_correction_matrix(
+            self.par, self.file_name, True, checkpoint_dir=self.checkpoint_dir,
+        )
+        with np.load(self.file_name, allow_pickle=True) as data:
+            correction_factor = data["correction_factor_co_channel"]
+            error = data["error_co_channel"]
+
+        npt.assert_equal(correction_factor[1], 123.0)
+        self.assertEqual(error[1, 0], (0.0, 0.0))
+        self.assertTrue(np.all(correction_factor[2] < 123.0))
+        self.assertFalse(os.path.exists(self.checkpoint_dir))
+
+    def test_concurrent_checkpoints(self):
+        norm = BeamformingNormalizer(60, 1e-2, "GAUSS_LEGENDRE", (60, 30))
+        signature = norm._checkpoint_signature(self.par)
+        # two runs saving the same row leave one complete checkpoint and no
+        # temporary files
+        for value in [1.0, 2.0]:
+            norm._save_row(
+                self.checkpoint_dir, signature, 1, np.full(3, value), np.zeros((3, 2)),
+            )
+        self.assertEqual(os.listdir(self.checkpoint_dir), ["row_00001.npz"])
+        cf, _ = norm._load_row(self.checkpoint_dir, signature, 1)
+        npt.assert_equal(cf, 2.0)
+
+        # the checkpoints removed by a run that finished first are not an
+        # error for the others
+        norm._remove_checkpoints(self.checkpoint_dir)
+        norm._remove_checkpoints(self.checkpoint_dir)
+        self.assertFalse(os.path.exists(self.checkpoint_dir))
+        # nor is a directory with files still being written by another run
+        os.makedirs(self.checkpoint_dir)
+        open(os.path.join(self.checkpoint_dir, "tmp123.npz"), "w").close()
+        norm._remove_checkpoints(self.checkpoint_dir)
+        self.assertTrue(os.path.exists(self.checkpoint_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from sharc import campaign_scheduler
+from sharc.campaign_scheduler import CampaignScheduler
+
+
+class CampaignSchedulerTest(unittest.TestCase):
+
+    def test_worker_simulations(self):
+        """Workers keep the simulations of the latest parameter files."""
+        self.addCleanup(campaign_scheduler._simulations.clear)
+        with mock.patch.object(campaign_scheduler, "build_simulation") as build, \
+                mock.patch.object(campaign_scheduler, "run_snapshots") as run:
+            build.side_effect = lambda param_file, overrides: param_file
+            run.side_effect = lambda simulation, snapshots: [simulation]
+            for param_file in ["a", "a", "b", "a", "c", "a", "b"]:
+                self.assertEqual(
+                    campaign_scheduler._run_campaign_snapshots(
+                        [param_file], {}, [(1, 1)],
+                    ),
+                    [([param_file], None)],
+                )
+
+        built = [call.args[0] for call in build.call_args_list]
+        self.assertEqual(built, ["a", "b", "c", "b"])
+        self.assertEqual(list(campaign_scheduler._simulations), ["a", "b"])
+
+    def test_worker_groups(self):
+        """Files of a group run each snapshot in turn and share topologies."""
+        self.addCleanup(campaign_scheduler._simulations.clear)
+
+        def build_simulation(param_file, overrides):
+            if param_file == "bad":
+                raise ValueError("bad parameters")
+            simulation = mock.Mock()
+            simulation.name = param_file
+            simulation.parameters.imt.topology = "HOTSPOT" if param_file != "c" else "MACROCELL"
+            return simulation
+
+        def run_snapshots(simulation, snapshots):
+            if simulation.name == "b" and snapshots[0][0] == 2:
+                raise RuntimeError("snapshot failed")
+            return [(snapshots[0][0], simulation.name, None)]
+
+        with mock.patch.object(campaign_scheduler, "build_simulation", build_simulation), \
+                mock.patch.object(campaign_scheduler, "run_snapshots", run_snapshots):
+            outcomes = campaign_scheduler._run_campaign_snapshots(
+                ["a", "b", "c", "bad"], {}, [(1, 11), (2, 12)],
+            )
+
+        self.assertEqual(outcomes[0], ([(1, "a", None), (2, "a", None)], None))
+        self.assertEqual(outcomes[1][0], [(1, "b", None)])
+        self.assertIn("snapshot failed", outcomes[1][1])
+        self.assertEqual(outcomes[2][1], None)
+        self.assertEqual(outcomes[3][0], [])
+        self.assertIn("bad parameters", outcomes[3][1])
+
+        simulations = campaign_scheduler._simulations
+        simulations["b"].share_topology.assert_called_once_with(simulations["a"])
+        simulations["a"].share_topology.assert_not_called()
+        simulations["c"].share_topology.assert_not_called()
+
+    def test_failed_runs(self):
+        """Files that fail are recorded and do not stop the campaign."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            param_files = []
+            for name in ["a.yaml", "b.yaml"]:
+                param_files.append(os.path.join(tmp_dir, name))
+                with open(param_files[-1], "w") as f:
+                    f.write("general:\n    num_snapshots: [1\n")
+
+            scheduler = CampaignScheduler(param_files, num_workers=1)
+            observer = mock.Mock()
+            scheduler.add_observer(observer)
+            runs = scheduler.run()
+
+            status_file = os.path.join(tmp_dir, "status.json")
+            scheduler.write_status(status_file)
+            with open(status_file) as f:
+                status = json.load(f)
+
+        self.assertEqual([run.status for run in runs], ["FAILED", "FAILED"])
+        self.assertEqual([s["status"] for s in status], ["FAILED", "FAILED"])
+        self.assertIn("yaml", runs[0].error.lower())
+        messages = [call.kwargs["message"] for call in observer.notify_observer.call_args_list]
+        self.assertTrue(messages[-1].startswith("status"))
+        self.assertIn("a.yaml: FAILED", "\n".join(messages))
+
+    def test_num_workers(self):
+        """Workers are limited to the number of cores."""
+        scheduler = CampaignScheduler([], num_workers=10**6)
+        self.assertEqual(scheduler.num_workers, os.cpu_count())
+        self.assertEqual(scheduler.run(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
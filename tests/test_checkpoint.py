@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+import numpy.testing as npt
+
+from sharc.checkpoint import Checkpoint
+from sharc.results import Results
+from sharc.support.stage_profiler import StageProfiler
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.param_file = os.path.join(self.tmp_dir.name, "parameters.yaml")
+        with open(self.param_file, "w") as f:
+            f.write("general:\n    num_snapshots: 100\n")
+        self.output_directory = os.path.join(self.tmp_dir.name, "output")
+        os.makedirs(self.output_directory)
+
+    def make_simulation(self, results_format="CSV", streaming_statistics=False):
+        results = Results().prepare_to_write(
+            None,
+            True,
+            results_format=results_format,
+            streaming_statistics=streaming_statistics,
+            output_directory=self.output_directory,
+        )
+        return SimpleNamespace(
+            results=results, profiler=StageProfiler(enabled=True),
+        )
+
+    def test_restore_sample_files(self):
+        for results_format in ["CSV", "NPY"]:
+            simulation = self.make_simulation(results_format)
+            results = simulation.results
+            results.imt_coupling_loss.extend([1., 2., 3.])
+            results.write_files(10)
+            checkpoint = Checkpoint.from_simulation(
+                self.param_file, 10, [5, 6], simulation,
+            )
+            expected = Results().load_from_dir(self.output_directory)
+
+            # samples written after the checkpoint ...
+            results.imt_coupling_loss.extend([4., 5.])
+            results.system_inr.extend([6.])
+            results.write_files(20)
+
+            # ... are discarded when the checkpoint is restored
+            resumed = self.make_simulation(results_format)
+            checkpoint.restore(resumed)
+            self.assertFalse(resumed.results.overwrite_sample_files)
+            restored = Results().load_from_dir(self.output_directory)
+            npt.assert_equal(
+                restored.imt_coupling_loss, expected.imt_coupling_loss,
+            )
+            self.assertEqual(len(restored.system_inr), 0)
+
+            # and the resumed simulation appends to the restored files
+            resumed.results.imt_coupling_loss.extend([7.])
+            resumed.results.write_files(20)
+            npt.assert_equal(
+                Results().load_from_dir(self.output_directory).imt_coupling_loss,
+                [1., 2., 3., 7.],
+            )
+            for file_name in os.listdir(self.output_directory):
+                os.remove(os.path.join(self.output_directory, file_name))
+
+    def test_restore_summaries(self):
+        simulation = self.make_simulation(streaming_statistics=True)
+        simulation.results.system_inr.extend(np.arange(10.))
+        simulation.results.write_files(10)
+        with simulation.profiler.stage("topology"):
+            pass
+        simulation.profiler.end_snapshot()
+        checkpoint = Checkpoint.from_simulation(
+            self.param_file, 10, [5, 6], simulation,
+        )
+
+        resumed = self.make_simulation(streaming_statistics=True)
+        checkpoint.restore(resumed)
+        summary = resumed.results.summaries["system_inr"]
+        self.assertEqual(summary.count, 10)
+        self.assertAlmostEqual(summary.mean, 4.5)
+        self.assertEqual(resumed.profiler.num_snapshots, 1)
+
+    def test_save_and_find(self):
+        simulation = self.make_simulation()
+        simulation.results.imt_coupling_loss.extend([1.])
+        simulation.results.write_files(10)
+        Checkpoint.from_simulation(
+            self.param_file, 10, [5, 6, 7], simulation,
+        ).save()
+        older = os.path.join(self.tmp_dir.name, "output_old")
+        os.makedirs(older)
+        Checkpoint.from_simulation(
+            self.param_file, 20, [5, 6, 7], SimpleNamespace(
+                results=SimpleNamespace(
+                    get_sample_files=lambda: {},
+                    output_directory=older,
+                    overwrite_sample_files=True,
+                    summaries={},
+                ),
+                profiler=StageProfiler(),
+            ),
+        ).save()
+        past = time.time() - 100
+        os.utime(os.path.join(older, Checkpoint.file_name), (past, past))
+
+        # the most recent checkpoint of the parameter file is found
+        checkpoint = Checkpoint.find(self.param_file, self.tmp_dir.name)
+        self.assertEqual(checkpoint.snapshot_number, 10)
+        self.assertEqual(checkpoint.seeds, [5, 6, 7])
+        self.assertEqual(checkpoint.output_directory, self.output_directory)
+
+        # checkpoints of other parameter files are ignored
+        with open(self.param_file, "a") as f:
+            f.write("    seed: 1\n")
+        self.assertIsNone(Checkpoint.find(self.param_file, self.tmp_dir.name))
+
+        Checkpoint.remove(self.output_directory)
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(self.output_directory, Checkpoint.file_name),
+            ),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+
+from sharc.antenna.beamforming_normalization import normalization_cache
+from sharc.antenna.beamforming_normalization.beamforming_normalizer import BeamformingNormalizer
+from sharc.support.named_tuples import AntennaPar
+
+
+class NormalizationCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.par = AntennaPar(
+            "SINGLE_ELEMENT",  # adjacent_antenna_model
+            True,  # normalization
+            None,  # normalization_data
+            "M2101",  # element_pattern
+            5,  # element_max_g
+            65,  # element_phi_3db
+            65,  # element_theta_3db
+            30,  # element_am
+            30,  # element_sla_v
+            2,  # n_rows
+            2,  # n_columns
+            0.5,  # element_horiz_spacing
+            0.5,  # element_vert_spacing
+            12,  # multiplication_factor
+            -200,  # minimum_array_gain
+            0,  # downtilt
+        )
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        env = mock.patch.dict(
+            os.environ, {"SHARC_CACHE_DIR": self.tmp_dir.name},
+        )
+        env.start()
+        self.addCleanup(env.stop)
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.addCleanup(normalization_cache._entries.clear)
+        normalization_cache._entries.clear()
+
+    def test_normalization_file(self):
+        file_name = os.path.join(
+            os.path.dirname(normalization_cache.__file__),
+            "bs_norm_8x16_050.npz",
+        )
+        data = normalization_cache.get_normalization_data(self.par, file_name)
+
+        with np.load(file_name, allow_pickle=True) as ref:
+            npt.assert_equal(
+                data["correction_factor_co_channel"],
+                ref["correction_factor_co_channel"],
+            )
+            npt.assert_equal(
+                data["error_co_channel"][3, 4], ref["error_co_channel"][3, 4],
+            )
+            self.assertEqual(
+                data["correction_factor_adj_channel"],
+                ref["correction_factor_adj_channel"],
+            )
+            self.assertEqual(data["resolution"], ref["resolution"])
+
+        # matrices are shared read-only mappings
+        self.assertIsInstance(data["correction_factor_co_channel"], np.memmap)
+        self.assertFalse(data["correction_factor_co_channel"].flags.writeable)
+        self.assertIs(
+            normalization_cache.get_normalization_data(self.par, file_name),
+            data,
+        )
+
+        # another process maps the saved entry instead of reading the file
+        normalization_cache._entries.clear()
+        with mock.patch.object(normalization_cache, "_read_file") as read_file:
+            mapped = normalization_cache.get_normalization_data(
+                self.par, file_name,
+            )
+        read_file.assert_not_called()
+        npt.assert_equal(
+            mapped["correction_factor_co_channel"],
+            data["correction_factor_co_channel"],
+        )
+
+    def test_generate(self):
+        file_name = os.path.join(self.tmp_dir.name, "missing.npz")
+        data = normalization_cache.get_normalization_data(
+            self.par, file_name, resolution=90, workers=1,
+        )
+        self.assertFalse(os.path.exists(file_name))
+        self.assertEqual(data["correction_factor_co_channel"].shape, (4, 2))
+        self.assertEqual(data["error_co_channel"].shape, (4, 2, 2))
+        self.assertEqual(data["resolution"], 90)
+
+        # same as generating the file with the normalizer
+        norm = BeamformingNormalizer(
+            90, 0, "GAUSS_LEGENDRE", normalization_cache.default_num_points,
+        )
+        norm.generate_correction_matrix(
+            self.par._replace(normalization=False), file_name, True,
+        )
+        with np.load(file_name, allow_pickle=True) as ref:
+            npt.assert_equal(
+                data["correction_factor_co_channel"],
+                ref["correction_factor_co_channel"],
+            )
+            self.assertEqual(
+                data["correction_factor_adj_channel"],
+                ref["correction_factor_adj_channel"],
+            )
+
+        # antennas with the same pattern share the generated normalization
+        other = self.par._replace(downtilt=10, minimum_array_gain=-100)
+        self.assertIs(
+            normalization_cache.get_normalization_data(
+                other, None, resolution=90,
+            ),
+            data,
+        )
+
+    def test_concurrent_generation(self):
+        # callers that need the same missing normalization at the same time
+        # generate it only once
+        generated = []
+
+        def generate(par, resolution, workers, normalization_file, key):
+            generated.append(key)
+            time.sleep(0.2)
+            return {
+                "resolution": resolution,
+                "correction_factor_co_channel": np.zeros((4, 2)),
+                "error_co_channel": np.zeros((4, 2, 2)),
+            }
+
+        def get_data(results):
+            results.append(
+                normalization_cache.get_normalization_data(
+                    self.par, None, resolution=90,
+                ),
+            )
+
+        results = []
+        with mock.patch.object(normalization_cache, "_generate", generate):
+            threads = [
+                threading.Thread(target=get_data, args=(results,))
+                for _ in range(2)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(generated), 1)
+        self.assertEqual(len(results), 2)
+        for data in results:
+            self.assertEqual(data["resolution"], 90)
+            self.assertEqual(data["correction_factor_co_channel"].shape, (4, 2))
+
+    def test_default_workers(self):
+        self.assertEqual(normalization_cache._default_workers(), os.cpu_count())
+        # a worker of a process pool does not start its own pool
+        with mock.patch.object(
+            normalization_cache.multiprocessing, "parent_process",
+            return_value=object(),
+        ):
+            self.assertEqual(normalization_cache._default_workers(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
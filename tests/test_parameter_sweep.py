@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import glob
+import os
+import tempfile
+import unittest
+
+import yaml
+
+from sharc.campaign_scheduler import CampaignScheduler
+from sharc.parameter_sweep import ParameterSweep
+from sharc.parameters.parameters import Parameters
+from sharc.parameters.parameters_base import read_config_file
+
+
+class ParameterSweepTest(unittest.TestCase):
+
+    def setUp(self):
+        self.base_file = os.path.join(
+            os.path.dirname(__file__), "parameters", "parameters_for_testing.yaml",
+        )
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_variants(self):
+        axes = {
+            "general.imt_link": ["DOWNLINK", "UPLINK"],
+            "imt.bs.antenna.n_rows": [4, 8],
+        }
+        sweep = ParameterSweep(self.base_file, axes, "GRID")
+        self.assertEqual(
+            [name for name, _ in sweep.get_variants()],
+            [
+                "imt_link_DOWNLINK_n_rows_4", "imt_link_DOWNLINK_n_rows_8",
+                "imt_link_UPLINK_n_rows_4", "imt_link_UPLINK_n_rows_8",
+            ],
+        )
+
+        sweep = ParameterSweep(self.base_file, axes, "LIST")
+        self.assertEqual(
+            sweep.get_variants(),
+            [
+                ("imt_link_DOWNLINK_n_rows_4", {"general.imt_link": "DOWNLINK", "imt.bs.antenna.n_rows": 4}),
+                ("imt_link_UPLINK_n_rows_8", {"general.imt_link": "UPLINK", "imt.bs.antenna.n_rows": 8}),
+            ],
+        )
+
+        with self.assertRaises(ValueError):
+            ParameterSweep(self.base_file, {"general.imt_link": ["DOWNLINK"], "imt.bs.height": [1, 2]}, "LIST")
+        with self.assertRaises(ValueError):
+            ParameterSweep(self.base_file, {"imt.not_a_section.height": [1, 2]})
+        with self.assertRaises(ValueError):
+            ParameterSweep(self.base_file, {"imt.bs.height": []})
+        with self.assertRaises(ValueError):
+            ParameterSweep(self.base_file, {"imt.bs.height": [1]}, "RANDOM")
+
+    def test_write_variants(self):
+        sweep_file = os.path.join(self.tmp_dir.name, "sweep.yaml")
+        with open(sweep_file, "w") as f:
+            yaml.safe_dump({
+                "sweep": {
+                    "base_file": os.path.relpath(self.base_file, self.tmp_dir.name),
+                    "output_dir": self.tmp_dir.name,
+                    "axes": {"imt.bs.height": [10.0, 20.0]},
+                },
+            }, f)
+        sweep = ParameterSweep.from_file(sweep_file)
+
+        param_files = sweep.write_variants(os.path.join(self.tmp_dir.name, "variants"))
+        self.assertEqual(len(param_files), 2)
+        for param_file, height in zip(param_files, [10.0, 20.0]):
+            parameters = Parameters()
+            parameters.set_file_name(param_file)
+            parameters.read_params()
+            self.assertEqual(parameters.imt.bs.height, height)
+            self.assertEqual(parameters.general.output_dir, self.tmp_dir.name)
+            self.assertEqual(parameters.general.output_dir_prefix, f"output_height_{height}")
+            self.assertFalse(parameters.general.overwrite_output)
+
+    def test_run(self):
+        """Variants that share the topology give the same results as
+        standalone runs."""
+        config = read_config_file(os.path.join(
+            os.path.dirname(__file__), "..", "sharc", "input", "parameters.yaml",
+        ))
+        config["general"]["num_snapshots"] = 3
+        config["general"]["imt_link"] = "UPLINK"
+        config["imt"]["bs"]["antenna"]["normalization"] = False
+        config["imt"]["ue"]["antenna"]["normalization"] = False
+        base_file = os.path.join(self.tmp_dir.name, "parameters_base.yaml")
+        with open(base_file, "w") as f:
+            yaml.safe_dump(config, f, sort_keys=False)
+
+        sweep_dir = os.path.join(self.tmp_dir.name, "sweep")
+        sweep = ParameterSweep(
+            base_file, {"imt.ue.p_o_pusch": [-95.0, -90.0]}, output_dir=sweep_dir,
+        )
+        runs = sweep.run(num_workers=1)
+        self.assertEqual([run.status for run in runs], ["FINISHED"] * 2)
+
+        standalone_dir = os.path.join(self.tmp_dir.name, "standalone")
+        runs = CampaignScheduler(
+            [run.param_file for run in runs],
+            num_workers=1,
+            general_overrides={"output_dir": standalone_dir},
+        ).run()
+        self.assertEqual([run.status for run in runs], ["FINISHED"] * 2)
+
+        for name, _ in sweep.get_variants():
+            output_dirs = [
+                glob.glob(os.path.join(parent, f"output_{name}_*"))
+                for parent in [sweep_dir, standalone_dir]
+            ]
+            self.assertEqual([len(dirs) for dirs in output_dirs], [1, 1])
+            files = sorted(os.listdir(output_dirs[0][0]))
+            self.assertEqual(files, sorted(os.listdir(output_dirs[1][0])))
+            self.assertIn("imt_ul_sinr.csv", files)
+            for file_name in files:
+                with open(os.path.join(output_dirs[0][0], file_name), "rb") as f:
+                    shared = f.read()
+                with open(os.path.join(output_dirs[1][0], file_name), "rb") as f:
+                    standalone = f.read()
+                self.assertEqual(shared, standalone, f"{name}: {file_name}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,11 @@
 
 import unittest
 
+import numpy as np
+
 from sharc.results import Results
 from sharc.post_processor import PostProcessor
+from sharc.sample_summary import SampleSummary
 
 
 class StationTest(unittest.TestCase):
@@ -31,6 +34,21 @@ class StationTest(unittest.TestCase):
         self.assertEqual(len(self.post_processor.plots), 2)
         self.assertEqual(self.post_processor.plots[0].data[0].name, trace_legend)
 
+    def test_plots_and_statistics_from_summaries(self):
+        self.results.summaries["imt_coupling_loss"] = SampleSummary().add(np.linspace(0, 5, 5001))
+
+        self.post_processor.add_plots(
+            self.post_processor.generate_cdf_plots_from_results(
+                [self.results]
+            )
+        )
+        self.assertEqual(len(self.post_processor.plots), 1)
+
+        stats = PostProcessor.generate_statistics(self.results)
+        self.assertEqual(len(stats.fields_statistics), 1)
+        self.assertAlmostEqual(stats.fields_statistics[0].mean, 2.5)
+        self.assertAlmostEqual(stats.fields_statistics[0].median, 2.5, delta=0.01)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -49,6 +49,71 @@ class PropagationClearAirTest(unittest.TestCase):
             rx_gain)
         # npt.assert_allclose(158.491, loss, atol=1e-3)
 
+    def test_loss_batch(self):
+        # reference values computed link by link with the scalar implementation
+        distances = np.array([[0.1, 0.5, 1., 5., 10., 30., 60., 100., 200., 500.]])
+        num_links = distances.size
+        frequencies = np.ones(distances.shape) * 27000 * 1e-3
+        indoor_stations = np.zeros(distances.shape, dtype=bool)
+        elevations = np.zeros(distances.T.shape)
+        tx_gain = np.linspace(0, 30, num_links).reshape(distances.shape)
+        rx_gain = np.linspace(10, -10, num_links).reshape(distances.shape)
+
+        cases = [
+            (
+                "horizontal", 0.2, 20., 3.,
+                [
+                    101.074908, 114.850957, 120.63067, 133.137039, 138.15324,
+                    150.953812, 159.558651, 170.584219, 199.206343, 258.63739,
+                ],
+            ),
+            (
+                "horizontal", 50., 20., 3.,
+                [
+                    101.136945, 115.155026, 121.223976, 135.590181, 142.094287,
+                    179.0066, 210.316089, 219.173197, 236.231047, 277.26719,
+                ],
+            ),
+            (
+                "vertical", 10., 3., 1.5,
+                [
+                    101.118863, 115.066394, 121.051035, 135.635827, 150.285497,
+                    174.861114, 193.589695, 209.704898, 229.253978, 270.298109,
+                ],
+            ),
+        ]
+        for polarization, percentage_p, hte, hre, expected in cases:
+            param_p452 = ParametersP452()
+            param_p452.clutter_loss = False
+            param_p452.polarization = polarization
+            param_p452.percentage_p = percentage_p
+            param_p452.Hte = hte
+            param_p452.Hre = hre
+            prop = PropagationClearAir(np.random.RandomState(), param_p452)
+
+            loss = prop.get_loss(
+                distances,
+                frequencies,
+                indoor_stations,
+                elevations,
+                tx_gain,
+                rx_gain,
+            )
+            npt.assert_equal(loss.shape, distances.shape)
+            npt.assert_allclose(loss[0], expected, atol=1e-6)
+
+            # each link gives the same loss on its own
+            for i in [0, 4, 9]:
+                single = prop.get_loss(
+                    distances[:, i:i + 1],
+                    frequencies[:, i:i + 1],
+                    indoor_stations[:, i:i + 1],
+                    elevations[i:i + 1, :],
+                    tx_gain[:, i:i + 1],
+                    rx_gain[:, i:i + 1],
+                )
+                npt.assert_allclose(single[0, 0], loss[0, i], rtol=1e-12)
+
     #    Ld50, Ldbeta, Ldb = self.__Diffraction.get_loss(beta = Beta, distance=d, frequency=f, atmospheric_pressure=Ph,
     # air_temperature=T, water_vapour=ro, delta_N=deltaN, Hrs=hrs, Hts=hts, Hte=hte, Hre=hre, Hsr=hsr, Hst=hst, H0=h0,
     # Hn=hn, dist_di=di, hight_hi=hi, omega=omega, Dlt=dlt ,Dlr=dlr, percentage_p=p)
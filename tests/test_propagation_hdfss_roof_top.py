@@ -252,6 +252,20 @@ class PropagationHDFSSRoofTopTest(unittest.TestCase):
                               np.array([19.3, 25.9, 56.3, 31.8, 30.6]))
         npt.assert_allclose(distances, expected_distances, atol=1e-1)
 
+        # paths parallel to the building walls and stations inside the building
+        imt_x = np.array([10.0, 10.0, -100.0, 30.0, 10.0])
+        imt_y = np.array([100.0, -5.0, 15.0, 20.0, 15.0])
+        imt_z = np.ones_like(imt_x)
+        d1_2D, d2_2D = self.propagation.get_diff_distances(imt_x,
+                                                           imt_y,
+                                                           imt_z,
+                                                           es_x,
+                                                           es_y,
+                                                           es_z,
+                                                           dist_2D=True)
+        npt.assert_allclose(d1_2D, [25.0, 20.0, 60.0, np.sqrt(425.0), 0.0])
+        npt.assert_allclose(d2_2D, [60.0, 0.0, 50.0, 0.0, 0.0], atol=1e-12)
+
     def test_diffration_loss(self):
         # Test diffraction loss
         h = np.array([7.64, -0.56, -1.2, -0.1])
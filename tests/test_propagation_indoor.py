@@ -6,10 +6,12 @@ Created on Mon Dec 18 20:10:14 2017
 """
 
 import unittest
-# import numpy as np
+import numpy as np
+import numpy.testing as npt
 
-# from sharc.propagation.propagation_indoor import PropagationIndoor
-# from sharc.parameters.parameters_indoor import ParametersIndoor
+from sharc.propagation.propagation_indoor import PropagationIndoor
+from sharc.propagation.propagation_inh_office import PropagationInhOffice
+from sharc.parameters.imt.parameters_indoor import ParametersIndoor
 
 
 class PropagationIndoorTest(unittest.TestCase):
@@ -17,37 +19,97 @@ class PropagationIndoorTest(unittest.TestCase):
     """
 
     def setUp(self):
-        pass
+        self.params = ParametersIndoor()
+        self.params.basic_path_loss = "INH_OFFICE"
+        self.params.n_rows = 3
+        self.params.n_colums = 2
+        self.params.building_class = "TRADITIONAL"
+        self.params.num_cells = 3
+
+        self.bs_per_building = 3
+        self.ue_per_bs = 2
+        num_buildings = self.params.n_rows * self.params.n_colums
+
+        rng = np.random.RandomState(0)
+        self.num_bs = self.bs_per_building * num_buildings
+        self.num_ue = self.num_bs * self.ue_per_bs
+        # indoor UE's are in LOS at these distances
+        self.distance_2D = rng.uniform(0.1, 1.2, (self.num_bs, self.num_ue))
+        self.distance_3D = np.sqrt(self.distance_2D**2 + 1.5**2)
+        self.frequency = 27000 * np.ones(self.distance_2D.shape)
+        self.elevation = rng.uniform(-10, 10, self.distance_2D.shape)
 
     def test_loss(self):
         """Tests the get_loss method
         """
-        pass
-    #     params = ParametersIndoor()
-    #     params.basic_path_loss = "INH_OFFICE"
-    #     params.n_rows = 3
-    #     params.n_colums = 1
-    # #    params.street_width = 30
-    #     params.ue_indoor_percent = .95
-    #     params.building_class = "TRADITIONAL"
-    #     params.num_cells = 3
-
-    #     bs_per_building = 3
-    #     ue_per_bs = 3
-
-    #     num_bs = bs_per_building * params.n_rows * params.n_colums
-    #     num_ue = num_bs * ue_per_bs
-    #     distance_2D = 150 * np.random.random((num_bs, num_ue))
-    #     frequency = 27000 * np.ones(distance_2D.shape)
-    #     indoor = np.random.rand(num_bs) < params.ue_indoor_percent
-    #     h_bs = 3 * np.ones(num_bs)
-    #     h_ue = 1.5 * np.ones(num_ue)
-    #     distance_3D = np.sqrt(distance_2D**2 + (h_bs[:, np.newaxis] - h_ue)**2)
-    #     height_diff = np.tile(h_bs, (num_bs, 3)) - np.tile(h_ue, (num_bs, 1))
-    #     elevation = np.degrees(np.arctan(height_diff / distance_2D))
-
-    #     propagation_indoor = PropagationIndoor(
-    #         np.random.RandomState(), params, ue_per_bs)
+        propagation = PropagationIndoor(
+            np.random.RandomState(), self.params, self.ue_per_bs,
+        )
+        indoor = np.ones((self.num_bs, self.num_ue), dtype=bool)
+        loss = propagation.get_loss(
+            self.distance_3D, self.distance_2D, self.frequency,
+            self.elevation, indoor, False,
+        )
+        self.assertEqual(loss.shape, (self.num_bs, self.num_ue))
+
+        inh = PropagationInhOffice(np.random.RandomState())
+        ue_per_building = self.bs_per_building * self.ue_per_bs
+        expected = PropagationIndoor.HIGH_PATH_LOSS * np.ones(loss.shape)
+        for b in range(self.num_bs // self.bs_per_building):
+            bs = slice(b * self.bs_per_building, (b + 1) * self.bs_per_building)
+            ue = slice(b * ue_per_building, (b + 1) * ue_per_building)
+            expected[bs, ue] = inh.get_loss_los(
+                self.distance_3D[bs, ue], self.frequency[bs, ue], 0,
+            )
+        npt.assert_allclose(loss, expected)
+
+    def test_loss_blocks(self):
+        """Tests the intra-building blocks of the loss
+        """
+        propagation = PropagationIndoor(
+            np.random.RandomState(11), self.params, self.ue_per_bs,
+        )
+        indoor = np.tile(
+            np.arange(self.num_ue) % 2 == 0, (self.num_bs, 1),
+        )
+        blocks = propagation.get_loss_blocks(
+            self.distance_3D, self.distance_2D, self.frequency,
+            self.elevation, indoor, False,
+        )
+        self.assertEqual(
+            blocks.shape,
+            (self.num_bs // self.bs_per_building, self.bs_per_building,
+             self.bs_per_building * self.ue_per_bs),
+        )
+
+        # same random numbers give the same dense matrix
+        propagation = PropagationIndoor(
+            np.random.RandomState(11), self.params, self.ue_per_bs,
+        )
+        loss = propagation.get_loss(
+            self.distance_3D, self.distance_2D, self.frequency,
+            self.elevation, indoor, False,
+        )
+        npt.assert_equal(
+            propagation.blocks_to_dense(blocks, loss.shape), loss,
+        )
+        bs_idx, ue_idx = propagation.get_block_indices(loss.shape)
+        npt.assert_equal(loss[bs_idx, ue_idx], blocks)
+        outside = np.ones(loss.shape, dtype=bool)
+        outside[bs_idx, ue_idx] = False
+        self.assertTrue(np.all(loss[outside] == PropagationIndoor.HIGH_PATH_LOSS))
+
+        # outdoor UE's have building entry loss
+        ue_indoor = indoor[0, ue_idx[:, 0, :]]
+        loss_los = PropagationInhOffice(np.random.RandomState()).get_loss_los(
+            self.distance_3D[bs_idx, ue_idx], self.frequency[bs_idx, ue_idx], 0,
+        )
+        npt.assert_allclose(
+            blocks[:, :, ue_indoor[0]], loss_los[:, :, ue_indoor[0]],
+        )
+        self.assertTrue(np.all(
+            blocks[:, :, ~ue_indoor[0]] > loss_los[:, :, ~ue_indoor[0]],
+        ))
 
 
 if __name__ == '__main__':
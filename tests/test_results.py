@@ -1,4 +1,8 @@
 import unittest
+import tempfile
+
+import numpy as np
+import numpy.testing as npt
 
 from sharc.results import Results
 
@@ -35,6 +39,82 @@ class StationTest(unittest.TestCase):
 
         self.assertEqual(results_recuperated_from_file.imt_coupling_loss, results_arr)
 
+    def test_flush_to_and_load_from_npy_file(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = Results().prepare_to_write(
+                None,
+                True,
+                output_dir=output_dir,
+                results_format="NPY",
+            )
+            arr1 = [1., 2., 3., 4., 5.]
+            arr2 = [101., 102., 103.]
+            results.imt_coupling_loss.extend(arr1)
+            results.write_files(1)
+            results.imt_coupling_loss.extend(arr2)
+            results.write_files(2)
+            self.assertEqual(len(results.imt_coupling_loss), 0)
+
+            loaded = Results().load_from_dir(output_dir)
+            self.assertEqual(loaded.imt_coupling_loss, arr1 + arr2)
+
+            loaded = Results().load_from_dir(output_dir, mmap=True)
+            self.assertIsInstance(loaded.imt_coupling_loss, np.memmap)
+            npt.assert_equal(loaded.imt_coupling_loss, arr1 + arr2)
+            self.assertIn("imt_coupling_loss", loaded.get_relevant_attributes())
+
+    def test_convert_dir(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = Results().prepare_to_write(
+                None,
+                True,
+                output_dir=output_dir,
+                results_format="NPY",
+            )
+            arr = [0.1, -2.5, 1e-3]
+            results.system_inr.extend(arr)
+            results.write_files(1)
+
+            Results.convert_dir(output_dir, "CSV")
+            npt.assert_allclose(
+                Results().store.read(f"{output_dir}/system_inr.csv"), arr,
+            )
+
+    def test_streaming_statistics(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = Results().prepare_to_write(
+                None,
+                True,
+                output_dir=output_dir,
+                streaming_statistics=True,
+            )
+            results.system_inr.extend([-10., -5.])
+            results.write_files(1)
+            results.system_inr.extend([0.])
+            results.write_files(2)
+            self.assertEqual(len(results.system_inr), 0)
+            self.assertEqual(results.summaries["system_inr"].count, 3)
+
+            loaded = Results().load_from_dir(output_dir)
+            self.assertEqual(len(loaded.system_inr), 0)
+            self.assertEqual(loaded.summaries["system_inr"].count, 3)
+            self.assertAlmostEqual(loaded.summaries["system_inr"].mean, -5.)
+
+    def test_take_and_add_samples(self):
+        self.results.imt_coupling_loss.extend([1., 2., 3.])
+        self.results.system_inr.extend([-10.])
+
+        samples = self.results.take_samples()
+        self.assertEqual(set(samples.keys()), {"imt_coupling_loss", "system_inr"})
+        self.assertEqual(len(self.results.imt_coupling_loss), 0)
+        self.assertEqual(len(self.results.system_inr), 0)
+
+        other = Results()
+        other.imt_coupling_loss.extend([0.])
+        other.add_samples(samples)
+        self.assertEqual(other.imt_coupling_loss, [0., 1., 2., 3.])
+        self.assertEqual(other.system_inr, [-10.])
+
     def test_get_most_recent_dirs(self):
         dir_2024_01_01_04 = "caminho_abs/prefixo_2024-01-01_04"
         dir_2024_01_01_10 = "caminho_abs/prefixo_2024-01-01_10"
@@ -0,0 +1,119 @@
+import unittest
+import numpy as np
+import numpy.testing as npt
+
+from sharc.sample_summary import SampleSummary
+
+
+class SampleSummaryTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(101)
+        self.samples = np.concatenate((
+            rng.normal(-10, 5, 20000),
+            rng.normal(30, 2, 5000),
+        ))
+
+    def test_moments(self):
+        summary = SampleSummary()
+        for chunk in np.array_split(self.samples, 7):
+            summary.add(chunk)
+
+        self.assertEqual(summary.count, len(self.samples))
+        self.assertAlmostEqual(summary.mean, np.mean(self.samples), places=9)
+        self.assertAlmostEqual(summary.variance, np.var(self.samples), places=7)
+        self.assertEqual(summary.min, np.min(self.samples))
+        self.assertEqual(summary.max, np.max(self.samples))
+
+    def test_quantile_and_cdf(self):
+        summary = SampleSummary(bin_width=0.01).add(self.samples)
+
+        q = np.array([0.01, 0.25, 0.5, 0.9, 0.99])
+        npt.assert_allclose(
+            summary.quantile(q), np.quantile(self.samples, q), atol=0.01,
+        )
+
+        values = np.array([-20., 0., 29.])
+        npt.assert_allclose(
+            summary.cdf_at(values),
+            np.mean(self.samples[:, np.newaxis] <= values, axis=0),
+            atol=1e-3,
+        )
+
+        x, y = summary.cdf(n_bins=100)
+        self.assertEqual(len(x), 100)
+        self.assertEqual(len(y), 100)
+        self.assertEqual(y[-1], 1)
+        self.assertTrue(np.all(np.diff(y) >= 0))
+
+    def test_merge(self):
+        full = SampleSummary().add(self.samples)
+        part_1 = SampleSummary().add(self.samples[:12345])
+        part_2 = SampleSummary().add(self.samples[12345:])
+        part_1.merge(part_2)
+
+        self.assertEqual(part_1.count, full.count)
+        self.assertAlmostEqual(part_1.mean, full.mean, places=9)
+        self.assertAlmostEqual(part_1.m2, full.m2, places=4)
+        self.assertEqual(part_1.offset, full.offset)
+        npt.assert_equal(part_1.counts, full.counts)
+
+    def test_bounded_memory(self):
+        summary = SampleSummary(bin_width=0.01, max_bins=1000)
+        summary.add(self.samples)
+
+        self.assertLessEqual(len(summary.counts), 1000)
+        self.assertEqual(np.sum(summary.counts), len(self.samples))
+        npt.assert_allclose(
+            summary.quantile(0.5), np.median(self.samples),
+            atol=summary.bin_width,
+        )
+
+        # merge summaries with different bin widths
+        fine = SampleSummary(bin_width=0.01).add([0.015, 100.])
+        summary.merge(fine)
+        self.assertEqual(np.sum(summary.counts), len(self.samples) + 2)
+
+    def test_wide_range(self):
+        # the histogram of a batch is never wider than max_bins
+        summary = SampleSummary(bin_width=0.01, max_bins=1000)
+        summary.add([0., 1e9])
+        self.assertLessEqual(len(summary.counts), 1000)
+        self.assertEqual(np.sum(summary.counts), 2)
+        self.assertLessEqual(1e9 / summary.bin_width, 1000)
+        npt.assert_allclose(summary.quantile([0, 1]), [0, 1e9])
+
+        summary.add(np.linspace(-1e12, 0, 101))
+        self.assertLessEqual(len(summary.counts), 1000)
+        self.assertEqual(np.sum(summary.counts), 103)
+
+        # summaries far apart are merged within max_bins
+        low = SampleSummary(bin_width=0.01, max_bins=1000).add([0., 1.])
+        high = SampleSummary(bin_width=0.01, max_bins=1000).add([1e8])
+        low.merge(high)
+        self.assertLessEqual(len(low.counts), 1000)
+        self.assertEqual(np.sum(low.counts), 3)
+        npt.assert_allclose(low.quantile(1), 1e8)
+
+    def test_infinite_samples(self):
+        summary = SampleSummary().add([-np.inf, 1., 2., np.nan, np.inf, 3.])
+
+        self.assertEqual(summary.count, 3)
+        self.assertEqual(summary.neg_inf, 1)
+        self.assertEqual(summary.pos_inf, 1)
+        self.assertEqual(summary.mean, 2.)
+        self.assertEqual(summary.quantile(0.), -np.inf)
+        self.assertEqual(summary.quantile(1.), np.inf)
+
+    def test_to_and_from_dict(self):
+        summary = SampleSummary().add(self.samples)
+        restored = SampleSummary.from_dict(summary.to_dict())
+
+        self.assertEqual(restored.count, summary.count)
+        self.assertEqual(restored.mean, summary.mean)
+        self.assertEqual(restored.bin_width, summary.bin_width)
+        npt.assert_equal(restored.counts, summary.counts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -40,6 +40,44 @@ class TestScintillation(unittest.TestCase):
 
         npt.assert_array_equal(np.sign(attenuation), sign)
 
+        # the same links in a 2D array
+        attenuation_2d = self.scintillation.get_tropospheric_attenuation(
+            elevation=elevation_vec.reshape((2, 5)),
+            frequency_MHz=frequency_MHz,
+            antenna_gain_dB=antenna_gain,
+            time_ratio=percentage_gain_exceeded.reshape((2, 5)) / 100,
+            wet_refractivity=wet_refractivity,
+        )
+        npt.assert_allclose(attenuation_2d.ravel(), attenuation)
+
+    def test_random_time_ratio(self):
+        elevation = np.array([[10., 20., 30.], [40., 50., 60.]])
+        gain = np.array([[30., 40., 50.], [30., 40., 50.]])
+        params = dict(elevation=elevation,
+                      frequency_MHz=np.array([27000.]),
+                      antenna_gain_dB=gain,
+                      earth_station_alt_m=1000.,
+                      earth_station_lat_deg=-15.,
+                      season="SUMMER")
+
+        attenuation = self.scintillation.get_tropospheric_attenuation(
+            random_number_gen=np.random.RandomState(5), **params)
+        self.assertEqual(attenuation.shape, elevation.shape)
+
+        time_ratio = np.random.RandomState(5).rand(elevation.size).reshape(elevation.shape)
+        npt.assert_allclose(
+            self.scintillation.get_tropospheric_attenuation(time_ratio=time_ratio, **params),
+            attenuation,
+        )
+
+        # the wet refractivity of the site is calculated once
+        self.assertEqual(len(self.scintillation._wet_refractivity), 1)
+        self.scintillation.get_tropospheric_attenuation(
+            time_ratio=time_ratio, **dict(params, earth_station_alt_m=0.))
+        self.assertEqual(len(self.scintillation._wet_refractivity), 2)
+        self.assertGreater(self.scintillation.get_wet_refractivity(-15., 0., "SUMMER"),
+                           self.scintillation.get_wet_refractivity(-15., 1000., "SUMMER"))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+import yaml
+
+from sharc.model import Model
+from sharc.parameters.parameters_base import read_config_file
+
+
+class SnapshotPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        base_file = os.path.join(
+            os.path.dirname(__file__), "..", "sharc", "input", "parameters.yaml",
+        )
+        config = read_config_file(base_file)
+        config["general"]["num_snapshots"] = 4
+        config["general"]["overwrite_output"] = True
+        # the normalization is not needed to compare serial and parallel runs
+        config["imt"]["bs"]["antenna"]["normalization"] = False
+        config["imt"]["ue"]["antenna"]["normalization"] = False
+        self.param_file = os.path.join(self.tmp_dir.name, "parameters.yaml")
+        with open(self.param_file, "w") as f:
+            yaml.safe_dump(config, f, sort_keys=False)
+
+    def run_model(self, num_workers: int) -> Model:
+        model = Model()
+        model.param_file = self.param_file
+        model.general_overrides["output_dir"] = os.path.join(
+            self.tmp_dir.name, f"output_{num_workers}",
+        )
+        model.set_num_workers(num_workers)
+        model.initialize()
+        if num_workers > 1:
+            model.parallel_snapshots()
+        else:
+            while not model.is_finished():
+                model.snapshot()
+        model.finalize()
+
+        return model
+
+    def test_parallel_snapshots(self):
+        """Snapshots run by a pool give the same samples as a serial run."""
+        serial = self.run_model(1)
+        parallel = self.run_model(2)
+
+        self.assertEqual(parallel.current_snapshot, 4)
+        serial_results = serial.simulation.results
+        parallel_results = parallel.simulation.results
+        attributes = serial_results.get_relevant_attributes()
+        self.assertTrue(
+            any(len(getattr(serial_results, name)) for name in attributes),
+        )
+        for name in attributes:
+            self.assertEqual(
+                getattr(parallel_results, name),
+                getattr(serial_results, name),
+                name,
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
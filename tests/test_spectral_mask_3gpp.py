@@ -184,6 +184,16 @@ class SpectalMask3GppTest(unittest.TestCase):
                                -30 + 10 * np.log10(50),
                                delta=1e-2)
 
+    def test_frequency_limits_ue(self):
+        for bandwidth, limits in [(5, [6, 10]), (10, [10, 15]), (15, [15, 20]), (20, [20, 25])]:
+            mask = SpectralMask3Gpp(StationType.IMT_UE, 3490, bandwidth, -30)
+            mask.set_mask(22)
+            np.testing.assert_equal(
+                mask.get_frequency_limits(StationType.IMT_UE, bandwidth),
+                [0, 1, 5] + limits,
+            )
+            self.assertEqual(len(mask.mask_dbm), len(mask.freq_lim) + 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -7,6 +7,7 @@ Created on Tue Dec  5 11:56:10 2017
 
 import unittest
 import numpy as np
+import numpy.testing as npt
 
 from sharc.mask.spectral_mask_imt import SpectralMaskImt
 from sharc.support.enumerations import StationType
@@ -180,6 +181,39 @@ class SpectalMaskImtTest(unittest.TestCase):
         poob = self.mask_bs_9GHz_30_spurious.power_calc(fc, band)
         self.assertAlmostEqual(poob, 8.14, delta=1e-2)
 
+    def test_power_calc_many(self):
+        fc = np.array([43300, 43500, 44000])
+        band = np.array([600, 200, 400])
+        poob = self.mask_bs_40GHz.power_calc_many(fc, band)
+        npt.assert_allclose(
+            poob,
+            [self.mask_bs_40GHz.power_calc(f, b) for f, b in zip(fc, band)],
+        )
+
+        # Many transmit powers: the 40 GHz mask depends on the transmit power
+        # below 32.5 dBm
+        p_tx = np.array([25.1, 28.1, 35.0])
+        poob = self.mask_bs_40GHz.power_calc_many(43300, 600, p_tx)
+        for p, expected in zip(p_tx, poob):
+            mask = SpectralMaskImt(StationType.IMT_BS, 43000, 200, -13)
+            mask.set_mask(p)
+            self.assertAlmostEqual(mask.power_calc(43300, 600), expected)
+        self.assertGreater(poob[2], poob[0])
+
+        # The mask set by set_mask is not changed
+        npt.assert_equal(
+            self.mask_bs_40GHz.mask_dbm[1], np.max((25.1 - 45.5, -20)),
+        )
+
+    def test_set_mask(self):
+        mask_dbm = self.mask_bs_9GHz.mask_dbm
+        p_tx = self.mask_bs_9GHz.p_tx
+        self.mask_bs_9GHz.set_mask(40)
+        self.assertNotEqual(self.mask_bs_9GHz.p_tx, p_tx)
+        self.mask_bs_9GHz.set_mask(28.1)
+        self.assertIs(self.mask_bs_9GHz.mask_dbm, mask_dbm)
+        self.assertEqual(self.mask_bs_9GHz.p_tx, p_tx)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+import unittest
+
+from sharc.support.stage_profiler import StageProfiler
+
+
+class TestStageProfiler(unittest.TestCase):
+
+    def test_disabled(self):
+        profiler = StageProfiler()
+        with profiler.stage("a"):
+            pass
+        profiler.end_snapshot()
+        self.assertEqual(profiler.num_snapshots, 0)
+        self.assertEqual(profiler.stats, {})
+        # a disabled profiler always returns the same no-op context manager
+        self.assertIs(profiler.stage("a"), profiler.stage("b"))
+
+        with tempfile.TemporaryDirectory() as output_directory:
+            profiler.write(output_directory)
+            self.assertEqual(os.listdir(output_directory), [])
+
+    def test_stages(self):
+        profiler = StageProfiler(enabled=True)
+        for _ in range(3):
+            with profiler.stage("a"):
+                pass
+            with profiler.stage("b"):
+                pass
+            profiler.end_snapshot()
+        # stages that raise are measured as well
+        with self.assertRaises(ValueError):
+            with profiler.stage("c"):
+                raise ValueError()
+
+        self.assertEqual(profiler.num_snapshots, 3)
+        self.assertEqual(list(profiler.stats.keys()), ["a", "b", "c"])
+        self.assertEqual(profiler.stats["a"]["calls"], 3)
+        self.assertEqual(profiler.stats["c"]["calls"], 1)
+        stats = profiler.stats["a"]
+        self.assertLessEqual(stats["min_time"], stats["max_time"])
+        self.assertLessEqual(stats["max_time"], stats["total_time"])
+
+    def test_allocations(self):
+        profiler = StageProfiler(enabled=True, trace_allocations=True)
+        with profiler.stage("a"):
+            data = bytearray(2**20)
+        self.assertGreaterEqual(profiler.stats["a"]["allocated_bytes"], 2**20)
+        self.assertGreaterEqual(profiler.stats["a"]["peak_bytes"], 2**20)
+        del data
+        self.assertIn("peak [MB]", profiler.summary())
+
+    def test_merge(self):
+        profiler = StageProfiler(enabled=True)
+        worker = StageProfiler(enabled=True)
+        for p in [profiler, worker, worker]:
+            with p.stage("a"):
+                pass
+            p.end_snapshot()
+
+        profiler.merge(worker.take_stats())
+        self.assertEqual(worker.num_snapshots, 0)
+        self.assertEqual(worker.stats, {})
+        self.assertEqual(profiler.num_snapshots, 3)
+        self.assertEqual(profiler.stats["a"]["calls"], 3)
+
+    def test_write(self):
+        profiler = StageProfiler(enabled=True)
+        with profiler.stage("topology"):
+            pass
+        profiler.end_snapshot()
+
+        with tempfile.TemporaryDirectory() as output_directory:
+            profiler.write(output_directory)
+            with open(os.path.join(output_directory, "profile.json")) as f:
+                profile = json.load(f)
+            with open(os.path.join(output_directory, "profile.txt")) as f:
+                summary = f.read()
+
+        self.assertEqual(profile["num_snapshots"], 1)
+        self.assertEqual(profile["stages"]["topology"]["calls"], 1)
+        self.assertIn("topology", summary)
+        self.assertIn("1 snapshots profiled", summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
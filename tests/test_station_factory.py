@@ -92,6 +92,64 @@ class StationFactoryTest(unittest.TestCase):
         # test if the maximum distance is close to the cell radius within a 100km range
         npt.assert_almost_equal(dist.max(), param_imt.topology.ntn.cell_radius, -2)
 
+    def test_reuse_imt_stations(self):
+        """Stations reused from a previous snapshot equal new stations."""
+        param_imt = ParametersImt()
+        param_imt.topology.type = "NTN"
+        param_imt.ue.azimuth_range = (-180, 180)
+        param_imt.ue.distribution_type = "ANGLE_AND_DISTANCE"
+        param_imt.ue.distribution_azimuth = "UNIFORM"
+        param_imt.ue.distribution_distance = "UNIFORM"
+        param_imt.ue.k = 10
+        param_imt.topology.ntn.bs_height = 1200000
+        param_imt.topology.ntn.cell_radius = 45000
+        param_imt.topology.ntn.bs_azimuth = 60
+        param_imt.topology.ntn.bs_elevation = 45
+        param_imt.topology.ntn.num_sectors = 1
+
+        ntn_topology = TopologyNTN(
+            param_imt.topology.ntn.intersite_distance,
+            param_imt.topology.ntn.cell_radius,
+            param_imt.topology.ntn.bs_height,
+            param_imt.topology.ntn.bs_azimuth,
+            param_imt.topology.ntn.bs_elevation,
+            param_imt.topology.ntn.num_sectors)
+        ntn_topology.calculate_coordinates()
+
+        def generate(seed, bs=None, ue=None):
+            rng = np.random.RandomState(seed)
+            bs = StationFactory.generate_imt_base_stations(
+                param_imt, param_imt.bs.antenna, ntn_topology, rng, bs,
+            )
+            ue = StationFactory.generate_imt_ue(
+                param_imt, param_imt.ue.antenna, ntn_topology, rng, ue,
+            )
+            return bs, ue
+
+        old_bs, old_ue = generate(1)
+        old_bs.sinr[0][:] = 10
+        old_ue.antenna[0].add_beam(0, 90)
+        bs_antennas = list(old_bs.antenna)
+        ue_antennas = list(old_ue.antenna)
+
+        bs, ue = generate(2, old_bs, old_ue)
+        new_bs, new_ue = generate(2)
+
+        # stations and antennas are reused ...
+        self.assertIs(bs, old_bs)
+        self.assertIs(ue, old_ue)
+        self.assertEqual(list(bs.antenna), bs_antennas)
+        self.assertEqual(list(ue.antenna), ue_antennas)
+        self.assertEqual(ue.antenna[0].beams_list, [])
+        npt.assert_equal(bs.sinr[0], -500)
+
+        # ... and equal new stations generated with the same seed
+        for attr in ["x", "y", "height", "azimuth", "elevation", "active", "indoor"]:
+            npt.assert_equal(getattr(bs, attr), getattr(new_bs, attr))
+            npt.assert_equal(getattr(ue, attr), getattr(new_ue, attr))
+        for reused, new in zip(ue.antenna, new_ue.antenna):
+            npt.assert_equal(reused.rotation_mtx, new.rotation_mtx)
+
 
 if __name__ == '__main__':
     unittest.main()
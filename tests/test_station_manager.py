@@ -467,6 +467,37 @@ class StationManagerTest(unittest.TestCase):
         elevation_ref = np.array([[0, 45], [0, 26.56]])
         npt.assert_allclose(elevation_ref, sm3.get_elevation(sm4), atol=1e-2)
 
+    def test_geometry_cache(self):
+        sm = self.station_manager
+        sm2 = self.station_manager2
+
+        # geometry is calculated once ...
+        distance = sm.get_3d_distance_to(sm2)
+        self.assertIs(sm.get_3d_distance_to(sm2), distance)
+        phi, theta = sm.get_pointing_vector_to(sm2)
+        self.assertIs(sm.get_pointing_vector_to(sm2)[0], phi)
+        # ... and shared, so it cannot be modified
+        with self.assertRaises(ValueError):
+            distance[0, 0] = 0
+
+        # it is calculated again if the stations move ...
+        sm2.x[0] += 10
+        moved = sm.get_3d_distance_to(sm2)
+        self.assertIsNot(moved, distance)
+        npt.assert_equal(moved[:, 1], distance[:, 1])
+        self.assertFalse(np.any(moved[:, 0] == distance[:, 0]))
+
+        # ... or if the cache is cleared
+        sm.clear_geometry_cache()
+        self.assertIsNot(sm.get_3d_distance_to(sm2), moved)
+        npt.assert_equal(sm.get_3d_distance_to(sm2), moved)
+
+        # the off-axis angle also depends on the antenna orientation
+        sm3 = self.station_manager3
+        off_axis = sm3.get_off_axis_angle(sm2)
+        sm3.azimuth = sm3.azimuth + 10
+        self.assertFalse(np.any(sm3.get_off_axis_angle(sm2) == off_axis))
+
 
 if __name__ == '__main__':
     unittest.main()
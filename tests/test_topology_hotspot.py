@@ -8,6 +8,7 @@ Created on Tue May 23 16:43:09 2017
 import unittest
 import numpy as np
 # import numpy.testing as npt
+from shapely.geometry import Polygon
 
 from sharc.parameters.imt.parameters_hotspot import ParametersHotspot
 from sharc.topology.topology_hotspot import TopologyHotspot
@@ -90,6 +91,59 @@ class TopologyHotspotTest(unittest.TestCase):
                                                            set_azimuth,
                                                            radius))
 
+    def test_overlapping_sectors(self):
+        rng = np.random.RandomState(0)
+        num_hotspots = 200
+        vertices_1 = self.topology.sector_vertices(
+            rng.uniform(0, 300, num_hotspots), rng.uniform(0, 300, num_hotspots),
+            rng.uniform(0, 360, num_hotspots), 100,
+        )
+        vertices_2 = self.topology.sector_vertices(
+            rng.uniform(0, 300, 5), rng.uniform(0, 300, 5),
+            rng.uniform(0, 360, 5), 100,
+        )
+        overlapping = self.topology.overlapping_sectors(vertices_1, vertices_2)
+        self.assertEqual(overlapping.shape, (num_hotspots, 5))
+        self.assertTrue(np.any(overlapping))
+        self.assertFalse(np.all(overlapping))
+        for i in range(num_hotspots):
+            for j in range(5):
+                self.assertEqual(
+                    overlapping[i, j],
+                    Polygon(vertices_1[i]).intersects(Polygon(vertices_2[j])),
+                )
+
+    def test_calculate_coordinates(self):
+        param = ParametersHotspot()
+        param.num_hotspots_per_cell = 3
+        param.max_dist_hotspot_ue = 60
+        param.min_dist_bs_hotspot = 20
+        topology = TopologyHotspot(param, 520, 1)
+        topology.calculate_coordinates(np.random.RandomState(7))
+        self.assertEqual(topology.num_base_stations, 3 * len(topology.macrocell.x))
+
+        # hotspots of the same macro cell do not overlap and are far enough
+        # from the macro cell base stations
+        self.assertTrue(np.all(
+            topology.validate_min_dist_bs_hotspots(
+                topology.x, topology.y, topology.macrocell.x,
+                topology.macrocell.y, param.min_dist_bs_hotspot,
+            ),
+        ))
+        vertices = topology.sector_vertices(
+            topology.x, topology.y, topology.azimuth, topology.cell_radius,
+        ).reshape((-1, 3, len(topology.SECTOR_ANGLES) + 1, 2))
+        for cell_vertices in vertices:
+            overlapping = topology.overlapping_sectors(cell_vertices, cell_vertices)
+            self.assertFalse(np.any(overlapping[~np.eye(3, dtype=bool)]))
+
+        # the same seed gives the same hotspots
+        x, y, azimuth = topology.x, topology.y, topology.azimuth
+        topology.calculate_coordinates(np.random.RandomState(7))
+        np.testing.assert_equal(topology.x, x)
+        np.testing.assert_equal(topology.y, y)
+        np.testing.assert_equal(topology.azimuth, azimuth)
+
 
 if __name__ == '__main__':
     unittest.main()